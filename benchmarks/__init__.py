@@ -0,0 +1,15 @@
+""" Offline benchmark suite for django-gtin-fields.
+
+Run everything from the repository root and save the results:
+
+    $ python -m benchmarks.run --output before.json
+
+Compare two runs for regressions:
+
+    $ python -m benchmarks.compare before.json after.json
+
+Benchmarks live in the bench_*.py modules and register themselves with
+benchmarks.harness.benchmark.  Corpora of valid and invalid codes are
+generated deterministically by benchmarks.corpora, so no network or data
+files are needed.
+"""
@@ -0,0 +1,26 @@
+""" Compares the table-driven checksum path with the stdnum one. """
+from gtin_fields import gtin
+from stdnum import ean
+
+from .harness import benchmark
+
+KINDS = ('UPCA', 'EAN13', 'GTIN14')
+
+
+def _codes(corpus):
+    return [code for kind in KINDS for code in corpus.mixed(kind)]
+
+
+@benchmark('checksum.stdnum_ean_is_valid')
+def stdnum_is_valid(corpus):
+    # what the validators called before the table-driven fast path
+    codes = _codes(corpus)
+    is_valid = ean.is_valid
+    return lambda: [is_valid(code) for code in codes], len(codes)
+
+
+@benchmark('checksum.has_valid_check_digit')
+def has_valid_check_digit(corpus):
+    codes = [code for code in _codes(corpus) if code.isdigit()]
+    check = gtin.has_valid_check_digit
+    return lambda: [check(code) for code in codes], len(codes)
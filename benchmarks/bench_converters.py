@@ -0,0 +1,77 @@
+""" Converters. """
+from gtin_fields import converters
+
+from .harness import benchmark, quiet
+from .legacy import legacy_upce_to_upca
+
+
+@benchmark('converters.upce_to_upca.6_digits')
+def upce6_to_upca(corpus):
+    codes = [code[1:7] for code in corpus.valid('UPCE')]
+    convert = converters.upce_to_upca
+    return lambda: [convert(code) for code in codes], len(codes)
+
+
+@benchmark('converters.upce_to_upca.8_digits')
+def upce8_to_upca(corpus):
+    codes = corpus.mixed('UPCE')
+    convert = quiet(converters.upce_to_upca, ValueError)
+    return lambda: [convert(code) for code in codes], len(codes)
+
+
+@benchmark('converters.upce_to_upca.legacy')
+def legacy_upce_to_upca_(corpus):
+    codes = [code[1:7] for code in corpus.valid('UPCE')] + corpus.valid('UPCE')
+    return lambda: [legacy_upce_to_upca(code) for code in codes], len(codes)
+
+
+@benchmark('converters.upce_to_upca.templates')
+def templates_upce_to_upca(corpus):
+    codes = [code[1:7] for code in corpus.valid('UPCE')] + corpus.valid('UPCE')
+    convert = converters.upce_to_upca
+    return lambda: [convert(code) for code in codes], len(codes)
+
+
+@benchmark('converters.upca_to_upce')
+def upca_to_upce(corpus):
+    codes = corpus.valid('UPCA')
+    convert = converters.upca_to_upce
+    return lambda: [convert(code) for code in codes], len(codes)
+
+
+@benchmark('converters.upca_to_upce_many')
+def upca_to_upce_many(corpus):
+    codes = corpus.valid('UPCA')
+    return lambda: converters.upca_to_upce_many(codes), len(codes)
+
+
+@benchmark('converters.to_gtin14')
+def to_gtin14(corpus):
+    codes = corpus.valid('UPCA') + corpus.valid('EAN13')
+    convert = converters.to_gtin14
+    return lambda: [convert(code) for code in codes], len(codes)
+
+
+@benchmark('converters.to_ean')
+def to_ean(corpus):
+    codes = corpus.valid('UPCA')
+    convert = converters.to_ean
+    return lambda: [convert(code) for code in codes], len(codes)
+
+
+def _isbn10_codes(corpus):
+    return [code for code in corpus.valid('ISBN') if len(code) == 10]
+
+
+@benchmark('converters.isbn10_to_isbn13')
+def isbn10_to_isbn13(corpus):
+    codes = _isbn10_codes(corpus)
+    convert = converters.isbn10_to_isbn13
+    return lambda: [convert(code) for code in codes], len(codes)
+
+
+@benchmark('converters.isbn10_to_isbn13.stdnum')
+def stdnum_isbn10_to_isbn13(corpus):
+    from stdnum import isbn
+    codes = _isbn10_codes(corpus)
+    return lambda: [isbn.to_isbn13(code) for code in codes], len(codes)
@@ -0,0 +1,49 @@
+""" Import time of gtin_fields.fields in a fresh interpreter.
+
+The timed run is a whole `python -c "import gtin_fields.fields"` process
+(Django included).  The info reports what gtin_fields itself adds: the time
+to import gtin_fields.fields once Django's models and forms are imported,
+and whether that pulled in stdnum or numpy (see gtin_fields.lazy).
+Run `python -X importtime -c "import gtin_fields.fields"` for the details.
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from .harness import benchmark
+
+# Number of fresh interpreters the import time is measured in
+SAMPLES = 5
+
+MEASURE = '''
+import json, sys, time
+import django.db.models, django.forms
+start = time.perf_counter()
+import gtin_fields.fields
+elapsed = time.perf_counter() - start
+print(json.dumps(dict(
+    import_ms=elapsed * 1000,
+    stdnum_imported='stdnum' in sys.modules,
+    numpy_imported='numpy' in sys.modules,
+)))
+'''
+
+
+def _python(code):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=root)
+    return subprocess.run(
+        [sys.executable, '-c', code], env=env, check=True,
+        stdout=subprocess.PIPE, universal_newlines=True,
+    ).stdout
+
+
+@benchmark('import.gtin_fields.fields')
+def import_fields(corpus):
+    samples = [json.loads(_python(MEASURE)) for _ in range(SAMPLES)]
+    info = dict(samples[-1], import_ms=statistics.median(
+        sample['import_ms'] for sample in samples
+    ))
+    return lambda: _python('import gtin_fields.fields'), 1, info
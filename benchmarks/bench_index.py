@@ -0,0 +1,110 @@
+""" GTINSet against a plain set of GTIN-14 strings: memory and lookups. """
+import atexit
+import os
+import sys
+import tempfile
+
+from gtin_fields import converters, index
+from gtin_fields.index import GTINIndex, GTINSet
+
+from .harness import benchmark
+
+
+def _catalog(corpus):
+    """ Returns the GTIN-14 codes of the catalog and the codes to look up
+    (about half of them members, in other forms). """
+    catalog = [
+        converters.normalize_gtin14(code)
+        for kind in ('UPCA', 'EAN13', 'GTIN14') for code in corpus.valid(kind)
+    ]
+    queries = [code[2:] for code in catalog[::2]] + [
+        converters.normalize_gtin14(code) for code in corpus.invalid('UPCA')
+        if code.isdigit() and len(code) == 12
+    ]
+    return catalog, queries
+
+
+def _set_nbytes(strings):
+    """ The memory a set of strings holds: the table and the strings. """
+    return sys.getsizeof(strings) + sum(map(sys.getsizeof, strings))
+
+
+@benchmark('index.set.contains')
+def set_contains(corpus):
+    catalog, queries = _catalog(corpus)
+    codes = set(catalog)
+    normalize = converters.normalize_gtin14
+    info = dict(bytes_per_code=_set_nbytes(codes) / len(codes))
+    return (
+        lambda: [normalize(query) in codes for query in queries],
+        len(queries), info,
+    )
+
+
+@benchmark('index.gtinset.contains')
+def gtinset_contains(corpus):
+    catalog, queries = _catalog(corpus)
+    codes = GTINSet(catalog)
+    info = dict(bytes_per_code=codes.nbytes / len(codes))
+    return lambda: [query in codes for query in queries], len(queries), info
+
+
+@benchmark('index.gtinset.contains_many')
+def gtinset_contains_many(corpus):
+    catalog, queries = _catalog(corpus)
+    codes = GTINSet(catalog)
+    return lambda: codes.contains_many(queries), len(queries)
+
+
+@benchmark('index.set.build')
+def set_build(corpus):
+    catalog, _ = _catalog(corpus)
+    return lambda: set(catalog), len(catalog)
+
+
+@benchmark('index.gtinset.build')
+def gtinset_build(corpus):
+    catalog, _ = _catalog(corpus)
+    return lambda: GTINSet(catalog), len(catalog)
+
+
+def _index_file(catalog):
+    """ Writes the catalog to an index file, removed at exit. """
+    handle, path = tempfile.mkstemp(suffix='.idx')
+    os.close(handle)
+    index.write_index(path, catalog)
+    _cleanup.append(path)
+    return path
+
+
+@benchmark('index.file.open')
+def index_open(corpus):
+    """ Opening is constant time: ops is 1 whatever the corpus size. """
+    path = _index_file(_catalog(corpus)[0])
+
+    def run():
+        GTINIndex(path).close()
+    return run, 1, dict(file_bytes=os.path.getsize(path))
+
+
+@benchmark('index.file.contains')
+def index_contains(corpus):
+    catalog, queries = _catalog(corpus)
+    codes = GTINIndex(_index_file(catalog))
+    return lambda: [query in codes for query in queries], len(queries)
+
+
+@benchmark('index.file.write')
+def index_write(corpus):
+    catalog, _ = _catalog(corpus)
+    path = _index_file([])
+    return lambda: index.write_index(path, catalog), len(catalog)
+
+
+_cleanup = []
+
+
+@atexit.register
+def _remove_index_files():
+    for path in _cleanup:
+        os.remove(path)
@@ -0,0 +1,50 @@
+""" Streaming ingestion of a CSV file, and async validation. """
+import asyncio
+import io
+import time
+
+from gtin_fields import aio, ingest
+
+from .harness import benchmark
+
+
+@benchmark('ingest.csv')
+def ingest_csv(corpus):
+    codes = corpus.mixed('UPCA') + corpus.mixed('GTIN14')
+    text = ''.join(
+        'sku{},{}\n'.format(index, code) for index, code in enumerate(codes)
+    )
+
+    def run():
+        reader = ingest.read_rows(io.StringIO(text), header=False)
+        for _ in ingest.ingest(reader.rows, 1):
+            pass
+    return run, len(codes)
+
+
+@benchmark('aio.avalidate_many')
+def avalidate_many(corpus):
+    """ Also reports the longest the event loop went without running a
+    heartbeat task while validating (the stall other requests would see).
+    """
+    codes = corpus.mixed('UPCA') + corpus.mixed('GTIN14')
+    info = dict(max_loop_stall_ms=0.0)
+
+    async def heartbeat(done):
+        last = time.perf_counter()
+        while not done.is_set():
+            await asyncio.sleep(0.001)
+            now = time.perf_counter()
+            info['max_loop_stall_ms'] = max(
+                info['max_loop_stall_ms'], (now - last) * 1000
+            )
+            last = now
+
+    async def validate():
+        done = asyncio.Event()
+        beat = asyncio.ensure_future(heartbeat(done))
+        await aio.avalidate_many(codes, chunk_size=2000)
+        done.set()
+        await beat
+
+    return lambda: asyncio.run(validate()), len(codes), info
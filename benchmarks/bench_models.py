@@ -0,0 +1,86 @@
+""" Model full_clean(), ModelForm.is_valid() and bulk field cleaning. """
+from django.core.exceptions import ValidationError
+from django.forms import ModelForm
+from gtin_fields.bulk import clean_instances
+
+from tests.app.models import MockProduct
+
+from .harness import benchmark
+
+# MockProduct attribute -> corpus kind
+FIELDS = dict(
+    isbn='ISBN',
+    upca='UPCA',
+    ean13='EAN13',
+    gtin14='GTIN14',
+    asin='ASIN',
+)
+
+
+class ProductForm(ModelForm):
+    class Meta:
+        model = MockProduct
+        exclude = []
+
+
+def _columns(corpus, invalid_share):
+    return {
+        key: corpus.mixed(kind, invalid_share) for key, kind in FIELDS.items()
+    }
+
+
+def _rows(corpus, invalid_share=0.3):
+    """ One dict of field values per product. """
+    columns = _columns(corpus, invalid_share)
+    return [
+        dict(zip(columns, values)) for values in zip(*columns.values())
+    ]
+
+
+def _full_clean(invalid_share):
+    def setup(corpus):
+        rows = _rows(corpus, invalid_share)
+
+        def run():
+            for row in rows:
+                try:
+                    MockProduct(**row).full_clean()
+                except ValidationError:
+                    pass
+        return run, len(rows)
+    return setup
+
+
+def _clean_many(invalid_share):
+    def setup(corpus):
+        columns = [
+            (MockProduct._meta.get_field(key), values)
+            for key, values in _columns(corpus, invalid_share).items()
+        ]
+
+        def run():
+            for field, values in columns:
+                field.clean_many(values)
+        return run, corpus.size
+    return setup
+
+
+benchmark('models.full_clean')(_full_clean(0.3))
+benchmark('models.full_clean.all_valid')(_full_clean(0))
+benchmark('fields.clean_many')(_clean_many(0.3))
+benchmark('fields.clean_many.all_valid')(_clean_many(0))
+
+
+@benchmark('forms.is_valid')
+def form_is_valid(corpus):
+    rows = _rows(corpus)
+    return lambda: [ProductForm(row).is_valid() for row in rows], len(rows)
+
+
+@benchmark('bulk.clean_instances')
+def bulk_clean_instances(corpus):
+    rows = _rows(corpus)
+
+    def run():
+        clean_instances([MockProduct(**row) for row in rows])
+    return run, len(rows)
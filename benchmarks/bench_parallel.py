@@ -0,0 +1,31 @@
+""" Scaling of converters.convert_many across worker processes.
+
+Each run starts its own process pool, so the timings include the pool
+start-up cost a caller of convert_many pays.
+"""
+import functools
+import os
+
+from gtin_fields import converters
+
+from .harness import benchmark
+
+WORKERS = (1, 2, 4, 8)
+
+
+def convert_many(workers, corpus):
+    codes = (
+        [code[1:7] for code in corpus.valid('UPCE')]
+        + corpus.mixed('UPCA') + corpus.mixed('EAN13')
+    )
+    chunksize = max(1000, len(codes) // (workers * 4))
+    run = functools.partial(
+        converters.convert_many, codes, workers=workers, chunksize=chunksize
+    )
+    return run, len(codes), dict(cpus=os.cpu_count(), chunksize=chunksize)
+
+
+for _workers in WORKERS:
+    benchmark('converters.convert_many.workers_{}'.format(_workers))(
+        functools.partial(convert_many, _workers)
+    )
@@ -0,0 +1,102 @@
+""" Index size and lookup speed of char vs integer backed GTIN-14 columns.
+
+Each variant gets its own SQLite database with the column type and values
+that the field produces (field.db_type and field.get_prep_value).
+"""
+import sqlite3
+
+from django.db import connection
+from gtin_fields import fields, functions, gtin
+
+from .harness import benchmark
+
+VARIANTS = dict(
+    char=fields.GTIN14Field(),
+    integer=fields.GTIN14IntegerField(),
+)
+
+# Number of lookups timed per run
+LOOKUPS = 2000
+
+
+def _build(field, codes):
+    """ Returns a connection to an in-memory database holding codes in an
+    indexed column of the field's type, and the index size in bytes. """
+    db = sqlite3.connect(':memory:')
+    db.execute('CREATE TABLE product (id INTEGER PRIMARY KEY, code {})'.format(
+        field.db_type(connection)
+    ))
+    db.executemany(
+        'INSERT INTO product (code) VALUES (?)',
+        ((field.get_prep_value(code),) for code in codes),
+    )
+    db.execute('CREATE INDEX product_code ON product (code)')
+    db.commit()
+    try:
+        index_bytes = db.execute(
+            "SELECT SUM(pgsize) FROM dbstat WHERE name = 'product_code'"
+        ).fetchone()[0]
+    except sqlite3.OperationalError:  # sqlite built without dbstat
+        index_bytes = None
+    return db, index_bytes
+
+
+def _lookup_benchmark(variant):
+    def setup(corpus):
+        field = VARIANTS[variant]
+        codes = corpus.valid('GTIN14')
+        db, index_bytes = _build(field, codes)
+        wanted = [field.get_prep_value(code) for code in codes[:LOOKUPS]]
+        query = 'SELECT id FROM product WHERE code = ?'
+
+        def run():
+            for value in wanted:
+                db.execute(query, (value,)).fetchall()
+        return run, len(wanted), dict(
+            rows=len(codes),
+            index_bytes=index_bytes,
+            index_bytes_per_row=index_bytes / len(codes)
+            if index_bytes else None,
+        )
+    return setup
+
+
+for _variant in VARIANTS:
+    benchmark('storage.gtin14_{}.lookup'.format(_variant))(
+        _lookup_benchmark(_variant)
+    )
+
+
+def _check_digits_benchmark(where):
+    """ Counting the rows with bad check digits in SQL (the SQLite function
+    of functions.GTINCheckDigit) or by fetching them into Python. """
+    def setup(corpus):
+        codes = corpus.mixed('GTIN14')
+        codes = [code for code in codes if gtin.is_ascii_digits(code)]
+        db, _ = _build(VARIANTS['char'], codes)
+        db.create_function(
+            functions.SQLITE_FUNCTION, 1, functions.sqlite_check_digit,
+            deterministic=True,
+        )
+        if where == 'sql':
+            query = (
+                'SELECT COUNT(*) FROM product WHERE {}(code) != '
+                'substr(code, -1)'.format(functions.SQLITE_FUNCTION)
+            )
+
+            def run():
+                return db.execute(query).fetchone()[0]
+        else:
+            def run():
+                values = [
+                    row[0] for row in db.execute('SELECT code FROM product')
+                ]
+                return len(values) - sum(gtin.is_valid_many(values))
+        return run, len(codes)
+    return setup
+
+
+for _where in ('sql', 'python'):
+    benchmark('storage.check_digits.' + _where)(
+        _check_digits_benchmark(_where)
+    )
@@ -0,0 +1,254 @@
+""" Scalar and batch validation. """
+import random
+
+from django.core.exceptions import ValidationError
+from gtin_fields import (cache, detect, gtin, instrumentation, isbn, prefixes,
+                         validators)
+
+from .harness import benchmark, quiet
+
+# (benchmark name, corpus kind, validator)
+VALIDATORS = (
+    ('isbn', 'ISBN', validators.ISBNValidator),
+    ('upca', 'UPCA', validators.UPCAValidator),
+    ('ean13', 'EAN13', validators.EAN13Validator),
+    ('gtin14', 'GTIN14', validators.GTIN14Validator),
+    ('asin', 'ASIN', validators.ASINValidator),
+    ('asin_strict', 'ASIN', validators.ASINStrictValidator),
+)
+
+GTIN_KINDS = ('UPCA', 'EAN13', 'GTIN14')
+
+
+def _validator_benchmark(kind, validator):
+    def setup(corpus):
+        codes = corpus.mixed(kind)
+        validate = quiet(validator, ValidationError)
+        return lambda: [validate(code) for code in codes], len(codes)
+    return setup
+
+
+for _name, _kind, _validator in VALIDATORS:
+    benchmark('validators.' + _name)(_validator_benchmark(_kind, _validator))
+
+
+def _junk_benchmark(kind, validator, path):
+    def setup(corpus):
+        codes = corpus.mixed(kind, invalid_share=0.7)
+        if path == 'raise':
+            validate = quiet(validator, ValidationError)
+        else:
+            validate = getattr(validator, path)
+        return lambda: [validate(code) for code in codes], len(codes)
+    return setup
+
+
+# mostly invalid input: raising ValidationErrors vs is_valid / check
+for _name, _kind, _validator in VALIDATORS:
+    for _path in ('raise', 'is_valid', 'check'):
+        benchmark('validators.{}.junk.{}'.format(_name, _path))(
+            _junk_benchmark(_kind, _validator, _path)
+        )
+
+
+def _popular_codes(corpus, kind):
+    """ Draws codes with repeats: a few popular codes make up most of the
+    traffic. """
+    codes = corpus.mixed(kind)[:1000]
+    rng = random.Random(corpus.seed)
+    weights = [1 / (rank + 1) for rank in range(len(codes))]
+    return rng.choices(codes, weights, k=corpus.size)
+
+
+def _cached_validator_benchmark(kind, validator, maxsize):
+    def setup(corpus):
+        codes = _popular_codes(corpus, kind)
+        cached = validator
+        if maxsize:
+            cached = cache.CachedValidator(validator, maxsize)
+        validate = quiet(cached, ValidationError)
+
+        def run():
+            if maxsize:
+                cached.clear()
+            return [validate(code) for code in codes]
+        return run, len(codes)
+    return setup
+
+
+for _name, _kind, _validator in VALIDATORS[1:4] + VALIDATORS[-1:]:
+    for _maxsize in (0, 256):
+        benchmark('validators.{}.popular.cache_{}'.format(_name, _maxsize))(
+            _cached_validator_benchmark(_kind, _validator, _maxsize)
+        )
+
+
+class _UninstrumentedUPCAValidator(validators._UPCAValidator):
+    """ A UPCAValidator without the instrumentation hook (the baseline of
+    the validators.upca.instrumentation benchmarks). """
+
+    def __call__(self, value):
+        reason = self.check(value)
+        if reason is not None:
+            self.invalid(value, reason)
+
+
+def _instrumentation_benchmark(mode):
+    def setup(corpus):
+        codes = corpus.mixed('UPCA')
+        if mode == 'baseline':
+            validator = _UninstrumentedUPCAValidator()
+        else:
+            validator = validators.UPCAValidator
+        validate = quiet(validator, ValidationError)
+
+        def run():
+            if mode == 'on':
+                instrumentation.enable()
+            try:
+                return [validate(code) for code in codes]
+            finally:
+                instrumentation.disable()
+                instrumentation.reset()
+        return run, len(codes)
+    return setup
+
+
+# the cost of the instrumentation hook, off (the default) and on
+for _mode in ('baseline', 'off', 'on'):
+    benchmark('validators.upca.instrumentation.' + _mode)(
+        _instrumentation_benchmark(_mode)
+    )
+
+
+def _gtin_codes(corpus):
+    return [code for kind in GTIN_KINDS for code in corpus.mixed(kind)]
+
+
+@benchmark('gtin.is_valid')
+def gtin_is_valid(corpus):
+    codes = _gtin_codes(corpus)
+    return lambda: [gtin.is_valid(code) for code in codes], len(codes)
+
+
+@benchmark('gtin.validate_many')
+def gtin_validate_many(corpus):
+    codes = _gtin_codes(corpus)
+    return lambda: gtin.validate_many(codes), len(codes)
+
+
+def _gtin_lines(corpus):
+    """ The GTIN corpus as a file would hold it: one GTIN-14 per line. """
+    return b''.join(
+        code.encode()[:14].rjust(14) + b'\n' for code in _gtin_codes(corpus)
+    )
+
+
+@benchmark('gtin.validate_many.decoded_lines')
+def gtin_validate_decoded_lines(corpus):
+    data = _gtin_lines(corpus)
+
+    def run():
+        return gtin.validate_many(data.decode().split())
+    return run, data.count(b'\n')
+
+
+@benchmark('gtin.validate_many.bytes_lines')
+def gtin_validate_bytes_lines(corpus):
+    data = _gtin_lines(corpus)
+    return lambda: gtin.validate_many(data.split()), data.count(b'\n')
+
+
+@benchmark('gtin.validate_records')
+def gtin_validate_records(corpus):
+    data = _gtin_lines(corpus)
+    return (
+        lambda: gtin.validate_records(data, 14, stride=15),
+        data.count(b'\n'),
+    )
+
+
+@benchmark('isbn.is_valid')
+def isbn_is_valid(corpus):
+    codes = corpus.mixed('ISBN')
+    return lambda: [isbn.is_valid(code) for code in codes], len(codes)
+
+
+@benchmark('isbn.is_valid.stdnum')
+def stdnum_isbn_is_valid(corpus):
+    from stdnum import isbn as stdnum_isbn
+    codes = corpus.mixed('ISBN')
+    return lambda: [stdnum_isbn.is_valid(code) for code in codes], len(codes)
+
+
+@benchmark('isbn.is_valid_many')
+def isbn_is_valid_many(corpus):
+    codes = corpus.mixed('ISBN')
+    return lambda: isbn.is_valid_many(codes), len(codes)
+
+
+def _valid_gtin_codes(corpus):
+    return [code for kind in GTIN_KINDS for code in corpus.valid(kind)]
+
+
+@benchmark('prefixes.classify')
+def prefixes_classify(corpus):
+    codes = _valid_gtin_codes(corpus)
+    prefixes._tables()  # compile the tables
+    return lambda: [prefixes.classify(code) for code in codes], len(codes)
+
+
+@benchmark('prefixes.classify_many')
+def prefixes_classify_many(corpus):
+    codes = _valid_gtin_codes(corpus)
+    prefixes._tables()
+    return lambda: prefixes.classify_many(codes), len(codes)
+
+
+@benchmark('validators.upca.allow_restricted_false')
+def upca_not_restricted(corpus):
+    codes = corpus.mixed('UPCA')
+    validate = quiet(
+        validators._UPCAValidator(allow_restricted=False), ValidationError
+    )
+    prefixes._tables()
+    return lambda: [validate(code) for code in codes], len(codes)
+
+
+def _mixed_product_codes(corpus):
+    codes = [
+        code for kind in ('UPCA', 'EAN13', 'GTIN14', 'ISBN', 'ASIN', 'UPCE')
+        for code in corpus.mixed(kind)
+    ]
+    random.Random(corpus.seed).shuffle(codes)
+    return codes
+
+
+def _try_validators(code):
+    """ Identifies a code the slow way: each validator in turn. """
+    types = []
+    for kind, validator in validators.KINDS.items():
+        try:
+            validator(code)
+        except ValidationError:
+            continue
+        types.append(kind)
+    return types
+
+
+@benchmark('detect.identify.validators')
+def identify_by_validators(corpus):
+    codes = _mixed_product_codes(corpus)
+    return lambda: [_try_validators(code) for code in codes], len(codes)
+
+
+@benchmark('detect.identify')
+def identify(corpus):
+    codes = _mixed_product_codes(corpus)
+    return lambda: [detect.identify(code) for code in codes], len(codes)
+
+
+@benchmark('detect.identify_many')
+def identify_many(corpus):
+    codes = _mixed_product_codes(corpus)
+    return lambda: detect.identify_many(codes), len(codes)
@@ -0,0 +1,50 @@
+""" Compares two benchmark result files and flags regressions.
+
+    $ python -m benchmarks.compare before.json after.json --threshold 0.1
+
+Exits with status 1 if any benchmark got slower by more than the threshold.
+"""
+import argparse
+import json
+import sys
+
+
+def compare(before, after, threshold):
+    """ Yields (name, before ns/op, after ns/op, ratio, regressed). """
+    old, new = before['results'], after['results']
+    for name in sorted(set(old) & set(new)):
+        old_ns, new_ns = old[name]['ns_per_op'], new[name]['ns_per_op']
+        if not old_ns or new_ns is None:
+            continue
+        ratio = new_ns / old_ns
+        yield name, old_ns, new_ns, ratio, ratio > 1 + threshold
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('before')
+    parser.add_argument('after')
+    parser.add_argument(
+        '--threshold', type=float, default=0.1,
+        help="Allowed slowdown as a fraction (default: 0.1 == 10%%)"
+    )
+    args = parser.parse_args(argv)
+
+    with open(args.before) as handle:
+        before = json.load(handle)
+    with open(args.after) as handle:
+        after = json.load(handle)
+
+    regressions = 0
+    for name, old_ns, new_ns, ratio, regressed in compare(
+        before, after, args.threshold
+    ):
+        regressions += regressed
+        print('{:<45} {:>10.0f} {:>10.0f} {:>7.2f}x{}'.format(
+            name, old_ns, new_ns, ratio, '  REGRESSION' if regressed else ''
+        ))
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
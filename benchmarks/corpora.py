@@ -0,0 +1,137 @@
+""" Deterministic corpora of realistic valid and invalid product codes. """
+import random
+import string
+
+from stdnum.ean import calc_check_digit
+
+KINDS = ('UPCA', 'EAN13', 'GTIN14', 'ISBN', 'ASIN', 'UPCE')
+
+# A sample of assigned GS1 prefixes to draw EAN-13 codes from
+EAN_PREFIXES = (
+    '300', '400', '450', '460', '500', '540', '590', '690', '729', '750',
+    '760', '800', '840', '870', '880', '890', '930', '978',
+)
+
+# Share of invalid codes that have a checksum error (others have a wrong
+# length or a bad character)
+CHECKSUM_ERROR_SHARE = 0.6
+
+
+class Corpus:
+    """ Generates and caches lists of codes.
+
+    Args:
+      size (int): The number of codes in each generated list.
+      seed (int): Seed so every run benchmarks the same codes.
+    """
+    def __init__(self, size=10000, seed=0):
+        self.size = size
+        self.seed = seed
+        self._cache = {}
+
+    def valid(self, kind):
+        """ Returns a list of valid codes of the given kind. """
+        return self._get(kind, True)
+
+    def invalid(self, kind):
+        """ Returns a list of invalid codes of the given kind. """
+        return self._get(kind, False)
+
+    def mixed(self, kind, invalid_share=0.3):
+        """ Returns a shuffled list mostly made of valid codes. """
+        key = (kind, 'mixed', invalid_share)
+        if key not in self._cache:
+            count = int(self.size * invalid_share)
+            codes = self.valid(kind)[count:] + self.invalid(kind)[:count]
+            random.Random(self.seed).shuffle(codes)
+            self._cache[key] = codes
+        return list(self._cache[key])
+
+    def _get(self, kind, valid):
+        key = (kind, valid)
+        if key not in self._cache:
+            rng = random.Random('{}-{}-{}'.format(self.seed, kind, valid))
+            make = globals()['make_' + kind.lower()]
+            if valid:
+                codes = [make(rng) for _ in range(self.size)]
+            else:
+                checksum = kind != 'ASIN'
+                codes = [
+                    corrupt(make(rng), rng, checksum)
+                    for _ in range(self.size)
+                ]
+            self._cache[key] = codes
+        return list(self._cache[key])
+
+
+def digits(rng, count):
+    return ''.join(rng.choice(string.digits) for _ in range(count))
+
+
+def with_check_digit(body):
+    return body + calc_check_digit(body)
+
+
+def make_upca(rng):
+    # mostly number system 0 (regular UPC), some 1 and 7
+    return with_check_digit(rng.choice('00000017') + digits(rng, 10))
+
+
+def make_ean13(rng):
+    return with_check_digit(rng.choice(EAN_PREFIXES) + digits(rng, 9))
+
+
+def make_gtin14(rng):
+    # indicator digit (packaging level) + EAN-13 or zero padded UPC-A body
+    if rng.random() < 0.5:
+        body = make_ean13(rng)[:-1]
+    else:
+        body = '0' + make_upca(rng)[:-1]
+    return with_check_digit(rng.choice('012345678') + body)
+
+
+def make_isbn(rng):
+    if rng.random() < 0.5:
+        body = rng.choice(('978', '979')) + digits(rng, 9)
+        return with_check_digit(body)
+    while True:
+        body = digits(rng, 9)
+        check = -sum((10 - i) * int(d) for i, d in enumerate(body)) % 11
+        if check != 10:  # would be an 'X' but the validators want digits
+            return body + str(check)
+
+
+def make_asin(rng):
+    if rng.random() < 0.2:
+        return make_isbn10(rng)
+    alphabet = string.digits + string.ascii_uppercase
+    return 'B0' + ''.join(rng.choice(alphabet) for _ in range(8))
+
+
+def make_isbn10(rng):
+    while True:
+        code = make_isbn(rng)
+        if len(code) == 10:
+            return code
+
+
+def make_upce(rng):
+    """ An 8 digit UPC-E (leader, 6 digits, check digit). """
+    from gtin_fields import converters
+    upce6 = digits(rng, 6)
+    upca = converters.upce_to_upca(upce6)
+    return upca[0] + upce6 + upca[-1]
+
+
+def corrupt(code, rng, checksum=True):
+    """ Breaks a valid code: usually its checksum, else length or chars. """
+    roll = rng.random()
+    if checksum and roll < CHECKSUM_ERROR_SHARE:
+        wrong = rng.choice([d for d in string.digits if d != code[-1]])
+        return code[:-1] + wrong
+    if roll < (1 + CHECKSUM_ERROR_SHARE) / 2:
+        if rng.random() < 0.5:
+            return code[:-1]
+        return code + rng.choice(string.digits)
+    position = rng.randrange(len(code))
+    return code[:position] + rng.choice('-_ #') + code[position + 1:]
@@ -0,0 +1,59 @@
+""" Registry and timing helpers for the benchmark suite. """
+import statistics
+import time
+
+BENCHMARKS = []
+
+
+def benchmark(name):
+    """ Registers a benchmark under the given dotted name.
+
+    The decorated function is given a benchmarks.corpora.Corpus and returns
+    (run, ops) or (run, ops, info): run is the callable that gets timed, ops
+    the number of operations one call of run performs and info an optional
+    dict of extra (JSON serializable) measurements to report.
+    """
+    def register(func):
+        BENCHMARKS.append((name, func))
+        return func
+    return register
+
+
+def measure(func, corpus, repeat=5):
+    """ Sets up and times one benchmark.
+
+    Returns:
+      (dict): The timings (seconds per run and nanoseconds per op).
+    """
+    setup = func(corpus)
+    run, ops = setup[:2]
+    info = setup[2] if len(setup) > 2 else {}
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+
+    best = min(timings)
+    result = dict(
+        ops=ops,
+        repeat=repeat,
+        best=best,
+        median=statistics.median(timings),
+        ns_per_op=best / ops * 1e9 if ops else None,
+        ops_per_sec=ops / best if best else None,
+    )
+    if info:
+        result['info'] = info
+    return result
+
+
+def quiet(callable_, exceptions):
+    """ Returns a function calling callable_ that swallows exceptions. """
+    def call(*args):
+        try:
+            return callable_(*args)
+        except exceptions:
+            return None
+    return call
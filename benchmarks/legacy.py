@@ -0,0 +1,60 @@
+""" The previous implementations of converters, as the baseline of the
+converters benchmarks. """
+from stdnum import ean
+
+
+def legacy_upce_to_upca(upce, validate=True):
+    """ upce_to_upca as it was before the template based expansion. """
+    given_upce = str(upce)
+
+    # can safely zero pad left a seven digit upce (is missing its left zero)
+    if (len(given_upce) == 7) and (given_upce[0] != '0'):
+        pad = '0'
+    else:
+        pad = ''
+
+    padded_upce = pad + given_upce
+
+    if validate:
+        if len(padded_upce) not in (6, 8):
+            raise ValueError(
+                "Provided UPC-E {} must be 6 or 8 digits!".format(
+                    repr(given_upce)
+                )
+            )
+
+        if (len(padded_upce) == 8 and padded_upce[0] not in ('0', '1')):
+            raise ValueError("8 digit UPC-E must begin with 0 or 1")
+
+    given_6_digit_upce = (len(padded_upce) == 6)
+    upce6 = padded_upce if given_6_digit_upce else padded_upce[1:7]
+
+    # upce6 digit names: abcdeN
+    map_id = int(upce6[-1])  # N
+    ab_prefix = upce6[0:2]  # ab
+
+    if map_id >= 5:
+        core = upce6[2:5], '0' * 4, map_id   # cde0000N
+    elif map_id <= 2:
+        core = map_id, '0' * 4, upce6[2:5]  # N0000cde
+    elif map_id == 3:
+        core = upce6[2], '0' * 5, upce6[3:5]   # c00000de
+    elif map_id == 4:
+        core = upce6[2:4], '0' * 5, upce6[4]  # cd00000e
+
+    # ab + core
+    no_leader_no_checksum = ab_prefix + ''.join(map(str, core))
+
+    # add leader, also called 'S' digit
+    leader = '0' if given_6_digit_upce else padded_upce[0]
+    with_leader_no_checksum = leader + no_leader_no_checksum
+
+    if given_6_digit_upce:
+        with_checksum = with_leader_no_checksum\
+            + ean.calc_check_digit(with_leader_no_checksum)
+    else:
+        with_checksum = with_leader_no_checksum + given_upce[-1]
+        if validate:
+            ean.validate(with_checksum)
+
+    return with_checksum
@@ -0,0 +1,117 @@
+""" Runs the benchmark suite and writes the results as JSON.
+
+    $ python -m benchmarks.run --output results.json --filter validators
+"""
+import argparse
+import datetime
+import importlib
+import json
+import os
+import platform
+import subprocess
+import sys
+
+import django
+
+MODULES = (
+    'benchmarks.bench_checksum',
+    'benchmarks.bench_validators',
+    'benchmarks.bench_converters',
+    'benchmarks.bench_models',
+    'benchmarks.bench_storage',
+    'benchmarks.bench_ingest',
+    'benchmarks.bench_parallel',
+    'benchmarks.bench_index',
+    'benchmarks.bench_import',
+)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument(
+        '--output', '-o', help="JSON file to write (default: stdout only)"
+    )
+    parser.add_argument(
+        '--size', type=int, default=10000,
+        help="Number of codes in each generated corpus"
+    )
+    parser.add_argument(
+        '--repeat', type=int, default=5,
+        help="Times each benchmark is run (the best run is reported)"
+    )
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument(
+        '--filter', '-k', action='append', default=[],
+        help="Only run benchmarks whose name contains this (repeatable)"
+    )
+    return parser.parse_args(argv)
+
+
+def setup_django():
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'tests.app.settings')
+    django.setup()
+
+
+def load_benchmarks():
+    from .harness import BENCHMARKS
+    for module in MODULES:
+        importlib.import_module(module)
+    return BENCHMARKS
+
+
+def metadata(args):
+    try:
+        commit = subprocess.check_output(
+            ['git', 'rev-parse', 'HEAD'], stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    try:
+        import numpy
+        numpy_version = numpy.__version__
+    except ImportError:
+        numpy_version = None
+    return dict(
+        timestamp=datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        commit=commit,
+        python=platform.python_version(),
+        implementation=platform.python_implementation(),
+        platform=platform.platform(),
+        django=django.get_version(),
+        numpy=numpy_version,
+        size=args.size,
+        repeat=args.repeat,
+        seed=args.seed,
+    )
+
+
+def run(args):
+    from .corpora import Corpus
+    from .harness import measure
+
+    setup_django()
+    corpus = Corpus(size=args.size, seed=args.seed)
+    results = {}
+    for name, func in load_benchmarks():
+        if args.filter and not any(part in name for part in args.filter):
+            continue
+        results[name] = measure(func, corpus, repeat=args.repeat)
+        print(
+            '{:<45} {:>12.0f} ns/op'.format(name, results[name]['ns_per_op']),
+            file=sys.stderr,
+        )
+    return dict(meta=metadata(args), results=results)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    report = run(args)
+    if args.output:
+        with open(args.output, 'w') as handle:
+            json.dump(report, handle, indent=2, sort_keys=True)
+    else:
+        json.dump(report, sys.stdout, indent=2, sort_keys=True)
+
+
+if __name__ == '__main__':
+    main()
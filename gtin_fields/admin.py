@@ -0,0 +1,166 @@
+""" Admin search by product code.
+
+Product code columns in a ModelAdmin's search_fields are searched with
+icontains, which no index can serve: on a big catalog every search is a
+full table scan.  GTINSearchAdminMixin recognizes the search terms that are
+product codes and looks them up exactly, in the form each product code
+field of the model stores them, so the indexes on those columns are used:
+
+    from django.contrib import admin
+    from gtin_fields.admin import GTINSearchAdminMixin
+
+    @admin.register(Product)
+    class ProductAdmin(GTINSearchAdminMixin, admin.ModelAdmin):
+        search_fields = ['name']
+
+Searching for '04252614' (a UPC-E), '042100005264' (its UPC-A) or
+'0042100005264' (its EAN-13) finds the product whether it is stored in a
+UPCAField, EAN13Field, GTIN14Field, GTINField or their integer variants.
+The rest of the search (the free text) goes through the default search, as
+do the terms that may as well be other numbers (see is_ambiguous): those
+find the rows with the code or the text.
+"""
+from django.db.models import Q
+from django.utils.text import smart_split
+from gtin_fields import converters, detect, gtin, isbn
+from gtin_fields.fields import (ISBNField, ProductCodeField,
+                                ProductCodeFieldMixin)
+
+# Lengths of the all digit terms that may be other numbers (a date, a phone
+# or order number) with a check digit valid by chance, one in 10 or 11
+AMBIGUOUS_LENGTHS = (8, 10)
+
+
+def search_code(term):
+    """ Recognizes a search term that is a product code.
+
+    Hyphens are ignored.  Terms of 8, 12, 13 or 14 ASCII digits are taken
+    as GTINs (8 digit ones may be UPC-E, see converters.normalize_gtin14) if
+    their check digit is valid, 10 character terms as ISBN-10s (if valid)
+    and ASINs (if they have a digit, so words are not).  6 and 7 digit
+    UPC-E codes have no check digit to tell them from any other number (a
+    price, a date, a SKU), so they are left to the text search.
+
+    Returns:
+      (gtin14, asin): The GTIN-14 form of the code (None if it is not a GTIN
+          or ISBN) and the code as an ASIN (None if it is not one); None if
+          the term is not a product code.
+    """
+    code = term.replace('-', '').upper()
+    if len(code) == 10:
+        gtin14 = asin = None
+        if isbn.has_valid_check_digit(code):
+            gtin14 = detect.normalize(code)[0]
+        if 'asin' in detect.identify(code) and not code.isalpha():
+            asin = code
+        return (gtin14, asin) if gtin14 or asin else None
+    if len(code) not in gtin.VALID_LENGTHS:
+        return None
+    try:
+        gtin14 = converters.normalize_gtin14(code)
+    except ValueError:
+        return None
+    if not gtin.has_valid_check_digit(gtin14):
+        return None
+    return gtin14, None
+
+
+def is_ambiguous(term):
+    """ Returns whether a term search_code takes for a product code may as
+    well be another number, e.g., the date 20240101 (a GTIN-8) or
+    2024-01-01 (hyphens are ignored). """
+    code = term.replace('-', '')
+    return len(code) in AMBIGUOUS_LENGTHS and gtin.is_ascii_digits(code)
+
+
+class GTINSearchAdminMixin:
+    """ ModelAdmin mixin searching product codes with exact lookups.
+
+    Each search term that is a product code (see search_code) is looked up
+    in every field of gtin_search_fields, in the form stored in the field
+    (see ProductCodeFieldMixin.from_gtin14): one indexable IN predicate per
+    field for all the codes searched.  A row matches if it has any of the
+    codes, or matches the default search (search_fields) for the ambiguous
+    ones (see is_ambiguous).  The other terms are left to the default
+    search, on the rows matching the codes if there are any.
+
+    Attributes:
+      gtin_search_fields (list): The names of the product code fields to
+          look codes up in; None (the default) for every product code field
+          of the model.
+    """
+    gtin_search_fields = None
+
+    def get_gtin_search_fields(self, request):
+        """ Returns the product code fields (not names) to look codes up
+        in. """
+        opts = self.model._meta
+        if self.gtin_search_fields is None:
+            return [
+                field for field in opts.concrete_fields
+                if isinstance(field, ProductCodeFieldMixin)
+            ]
+        return [opts.get_field(name) for name in self.gtin_search_fields]
+
+    def get_search_results(self, request, queryset, search_term):
+        fields = self.get_gtin_search_fields(request)
+        codes = []
+        ambiguous = []
+        free_text = []
+        for term in smart_split(search_term):
+            code = None
+            if fields and term[0] not in '"\'':  # quoted terms are text
+                code = search_code(term)
+            if code is None:
+                free_text.append(term)
+            else:
+                codes.append(code)
+                if is_ambiguous(term):
+                    ambiguous.append(term)
+        if not codes:
+            return super().get_search_results(request, queryset, search_term)
+
+        predicates = Q()
+        for field in fields:
+            values = _stored_forms(field, codes)
+            if values:
+                predicates |= Q(**{field.name + '__in': sorted(values)})
+        matches = queryset.filter(predicates) if predicates else (
+            queryset.none()
+        )
+        may_have_duplicates = False
+        if ambiguous:
+            text_matches, may_have_duplicates = super().get_search_results(
+                request, queryset, ' '.join(ambiguous)
+            )
+            matches = matches | text_matches
+
+        if not free_text:
+            return matches, may_have_duplicates
+        matches, text_duplicates = super().get_search_results(
+            request, matches, ' '.join(free_text)
+        )
+        return matches, may_have_duplicates or text_duplicates
+
+
+def _stored_forms(field, codes):
+    """ The forms a field stores the searched codes in. """
+    values = set()
+    for gtin14, asin in codes:
+        if field.gtin_width is None:  # an ASIN field
+            if asin is not None:
+                values.add(asin)
+            continue
+        if gtin14 is None:
+            if isinstance(field, ProductCodeField):
+                values.add(asin)  # ASINs are stored as they are
+            continue
+        code = field.from_gtin14(gtin14)
+        if code is None:
+            continue
+        values.add(code)
+        if isinstance(field, ISBNField):  # either form of an ISBN
+            isbn10 = converters.isbn13_to_isbn10(code, validate=False)
+            if isbn10 is not None:
+                values.add(isbn10)
+    return values
@@ -0,0 +1,124 @@
+""" Async batch validation for ASGI views and async ingestion.
+
+The codes are validated in chunks (see ingest.clean_codes) on an executor,
+so a large upload does not block the event loop:
+
+    cleaned, errors = await avalidate_many(codes, kind='gtin14')
+
+    async for chunk in avalidate_chunks(lines, kind='gtin'):
+        ...  # chunk.start, chunk.cleaned, chunk.errors
+
+Only a bounded number of chunks are in flight at a time: avalidate_chunks
+stops reading its input until one of them is done (backpressure).
+"""
+import asyncio
+from collections import namedtuple
+
+from gtin_fields import ingest
+
+# Values validated per chunk
+CHUNK_SIZE = 10000
+
+# Chunks submitted to the executor and not yet yielded
+MAX_PENDING = 4
+
+# A validated chunk: start is the index of its first value in the input,
+# cleaned its cleaned values and errors maps the (input) index of each
+# invalid value to its error message
+Chunk = namedtuple('Chunk', 'start cleaned errors')
+
+
+async def avalidate_many(values, kind='gtin', chunk_size=CHUNK_SIZE,
+                         executor=None, max_pending=MAX_PENDING):
+    """ Validates (and for kind 'gtin' normalizes) many codes.
+
+    Args:
+      values (iterable or async iterable): The codes.
+      kind (str): The kind of code (see ingest.KINDS).
+      chunk_size (int): Values validated per chunk.
+      executor (Executor): Where the chunks run (a ThreadPoolExecutor or
+          ProcessPoolExecutor); the loop's default executor if None.
+      max_pending (int): The most chunks in flight at a time.
+
+    Returns:
+      (cleaned, errors): As ingest.clean_codes, for all the values.
+    """
+    chunks = []
+    errors = {}
+    async for chunk in avalidate_chunks(
+        values, kind, chunk_size, executor, max_pending
+    ):
+        chunks.append(chunk)
+        errors.update(chunk.errors)
+    chunks.sort(key=lambda chunk: chunk.start)
+    cleaned = [value for chunk in chunks for value in chunk.cleaned]
+    return cleaned, errors
+
+
+async def avalidate_chunks(values, kind='gtin', chunk_size=CHUNK_SIZE,
+                           executor=None, max_pending=MAX_PENDING):
+    """ Validates codes in chunks, yielding each as it completes.
+
+    Takes the same arguments as avalidate_many.
+
+    Yields:
+      (Chunk): The validated chunks, in the order they complete (which may
+          not be the input order, see Chunk.start).
+    """
+    if kind not in ingest.KINDS:
+        raise ValueError("Unknown kind {}, use one of {}".format(
+            repr(kind), ', '.join(ingest.KINDS)
+        ))
+    loop = asyncio.get_running_loop()
+    pending = set()
+    start = 0
+    try:
+        async for chunk in _chunks(values, chunk_size):
+            if len(pending) >= max_pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for future in done:
+                    yield future.result()
+            pending.add(loop.run_in_executor(
+                executor, _validate_chunk, kind, start, chunk
+            ))
+            start += len(chunk)
+
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for future in done:
+                yield future.result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+async def _chunks(values, chunk_size):
+    """ Yields lists of up to chunk_size values of an iterable or async
+    iterable. """
+    chunk = []
+    if hasattr(values, '__aiter__'):
+        async for value in values:
+            chunk.append(value)
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+    else:
+        for value in values:
+            chunk.append(value)
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+def _validate_chunk(kind, start, values):
+    """ Validates one chunk (in the executor). """
+    cleaned, errors = ingest.clean_codes(values, kind)
+    return Chunk(start, cleaned, {
+        start + index: error for index, error in errors.items()
+    })
@@ -0,0 +1,258 @@
+""" Audit of the product codes already stored in the database.
+
+Rows saved before validation was added (or through bulk_create) may hold
+codes that fail their field's validators.  audit_model streams the product
+code columns of a table in primary key order, one chunk (a keyset page,
+WHERE pk > last ORDER BY pk LIMIT chunk_size) at a time, and validates each
+chunk with ProductCodeFieldMixin.clean_many, in worker processes if given
+an executor:
+
+    for model, fields in audited_models(['shop']):
+        for chunk in audit_model(model, fields):
+            chunk.invalid  # => [(field name, pk, value, error), ...]
+
+Only one chunk per worker (and as many waiting) is in memory at a time.
+The results come in primary key order, so chunk.last_pk is where a run can
+resume (see Checkpoint).
+"""
+import collections
+import json
+import os
+from collections import namedtuple
+
+from django.apps import apps
+from django.core.exceptions import ValidationError
+from gtin_fields.bulk import product_code_fields
+
+# Rows fetched and validated per chunk
+CHUNK_SIZE = 10000
+
+# The columns of the report of invalid rows
+REPORT_HEADER = ('model', 'field', 'pk', 'value', 'error')
+
+# The result of auditing a chunk of rows: the primary key of its last row,
+# the number of rows and the invalid values, as (field name, pk, value,
+# error message) tuples
+ChunkResult = namedtuple('ChunkResult', 'last_pk rows invalid')
+
+
+def audited_models(labels=None, unmanaged=False):
+    """ Returns the models with product code fields (see
+    bulk.product_code_fields).
+
+    Args:
+      labels (iterable): Only these apps ('app_label') and models
+          ('app_label.ModelName'); all installed ones if None.
+      unmanaged (bool): Include the models whose tables Django does not
+          manage (Meta.managed = False).
+
+    Raises:
+      LookupError: If an app or model is not installed.
+
+    Returns:
+      (list): (model, fields) tuples, ordered by model label.
+    """
+    if not labels:
+        candidates = apps.get_models()
+    else:
+        candidates = []
+        for label in labels:
+            if '.' in label:
+                candidates.append(apps.get_model(label))
+            else:
+                candidates.extend(apps.get_app_config(label).get_models())
+
+    audited = {}
+    for model in candidates:
+        if model._meta.proxy or not (model._meta.managed or unmanaged):
+            continue
+        fields = product_code_fields(model)
+        if fields:
+            audited[model._meta.label] = (model, fields)
+    return [audited[label] for label in sorted(audited)]
+
+
+def iter_chunks(model, fields, after=None, chunk_size=CHUNK_SIZE,
+                using=None):
+    """ Yields the rows of a table in chunks, in primary key order.
+
+    Each chunk is its own query (a keyset page after the last primary key
+    of the previous one), streamed with iterator(), so no query holds a
+    cursor over the whole table.
+
+    Yields:
+      (list): (pk, value of each field) tuples.
+    """
+    names = [field.attname for field in fields]
+    queryset = model._base_manager.using(using).order_by('pk')
+    while True:
+        page = queryset if after is None else queryset.filter(pk__gt=after)
+        rows = list(
+            page.values_list('pk', *names)[:chunk_size].iterator(chunk_size)
+        )
+        if not rows:
+            return
+        yield rows
+        after = rows[-1][0]
+
+
+def audit_chunk(label, names, rows):
+    """ Validates a chunk of rows (see iter_chunks) of the model with the
+    given label, in a worker process or not.
+
+    The values are validated as they are stored: a value the field would
+    store in another form (e.g., a UPC-A in a GTINField, which stores
+    GTIN-14s) is invalid too, since exact lookups never match it.
+
+    Returns:
+      (ChunkResult)
+    """
+    if not apps.ready:  # a spawned worker process
+        import django
+        django.setup()
+    opts = apps.get_model(label)._meta
+    invalid = []
+    for column, name in enumerate(names, 1):
+        field = opts.get_field(name)
+        values = [row[column] for row in rows]
+        cleaned, errors = field.clean_many(values)
+        for index, value in enumerate(values):
+            message = _stored_form_error(field, value, cleaned[index])
+            if message is None and index in errors:
+                message = ' '.join(errors[index].messages)
+            if message is not None:
+                invalid.append((name, rows[index][0], value, message))
+    return ChunkResult(rows[-1][0], len(rows), invalid)
+
+
+def _stored_form_error(field, value, cleaned):
+    """ The error of a stored value that is not in the form the field
+    stores (None if it is): that of validating it as it is, or else that it
+    is not normalized. """
+    if value in field.empty_values or cleaned == value:
+        return None
+    try:
+        field.run_validators(value)
+    except ValidationError as error:
+        return ' '.join(error.messages)
+    return "Not stored in its normalized form {}".format(cleaned)
+
+
+def audit_model(model, fields, after=None, chunk_size=CHUNK_SIZE,
+                executor=None, prefetch=2, using=None):
+    """ Audits the product code fields of a table, chunk by chunk.
+
+    Args:
+      model: The model class.
+      fields (list): Its fields to validate.
+      after: Start after the row with this primary key (resume a run).
+      chunk_size (int): Rows fetched and validated at a time.
+      executor (Executor): Validate the chunks in this executor (e.g., a
+          ProcessPoolExecutor) instead of the current process.
+      prefetch (int): The number of chunks sent to the executor ahead of the
+          one being waited for.
+      using (str): The database alias.
+
+    Yields:
+      (ChunkResult): In primary key order.  Closing the generator (e.g.,
+          when the audit is interrupted) cancels the chunks still waiting in
+          the executor.
+    """
+    label = model._meta.label
+    names = [field.name for field in fields]
+    chunks = iter_chunks(model, fields, after, chunk_size, using)
+    if executor is None:
+        for rows in chunks:
+            yield audit_chunk(label, names, rows)
+        return
+
+    pending = collections.deque()
+    try:
+        for rows in chunks:
+            pending.append(executor.submit(audit_chunk, label, names, rows))
+            if len(pending) > prefetch:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+class Checkpoint:
+    """ The progress of an audit, saved to a JSON file after each chunk so
+    an interrupted run can resume where it stopped.
+
+    For each model it keeps the fields audited, the primary key of the last
+    row audited, the counts of rows and of invalid values of each field and
+    whether it is done; and the size of the report written so far (anything
+    written after the last save is dropped on resume).
+
+    Args:
+      path (str): The checkpoint file.
+    """
+    VERSION = 1
+
+    def __init__(self, path):
+        self.path = path
+        self.report_size = 0
+        self.models = {}
+
+    @classmethod
+    def load(cls, path):
+        """ Reads a checkpoint file (an empty checkpoint if there is none).
+
+        Raises:
+          ValueError: If the file is not a checkpoint (of a known version).
+        """
+        checkpoint = cls(path)
+        if not os.path.exists(path):
+            return checkpoint
+        with open(path, encoding='utf-8') as handle:
+            data = json.load(handle)
+        if not isinstance(data, dict) or data.get('version') != cls.VERSION:
+            raise ValueError("{} is not an audit checkpoint".format(path))
+        checkpoint.report_size = data['report_size']
+        checkpoint.models = data['models']
+        return checkpoint
+
+    def state(self, label, names):
+        """ Returns the state of a model (started if new).
+
+        Raises:
+          ValueError: If the model was audited with other fields.
+        """
+        state = self.models.setdefault(label, dict(
+            fields=list(names), after=None, rows=0,
+            invalid={name: 0 for name in names}, done=False,
+        ))
+        if state['fields'] != list(names):
+            raise ValueError(
+                "The fields of {} changed since the checkpoint".format(label)
+            )
+        return state
+
+    def advance(self, label, chunk, report_size):
+        """ Records a chunk of a model as audited. """
+        state = self.models[label]
+        state['after'] = _json_pk(chunk.last_pk)
+        state['rows'] += chunk.rows
+        for name, *_rest in chunk.invalid:
+            state['invalid'][name] += 1
+        self.report_size = report_size
+
+    def save(self):
+        """ Writes the file next to path and moves it in place, so a crash
+        never leaves half a checkpoint. """
+        temporary = '{}.{}.tmp'.format(self.path, os.getpid())
+        with open(temporary, 'w', encoding='utf-8') as handle:
+            json.dump(dict(
+                version=self.VERSION, report_size=self.report_size,
+                models=self.models,
+            ), handle, indent=1)
+        os.replace(temporary, self.path)
+
+
+def _json_pk(pk):
+    """ A primary key as JSON can hold it (UUIDs and such as strings). """
+    return pk if isinstance(pk, (int, str)) else str(pk)
@@ -0,0 +1,83 @@
+""" Bulk validation of product code fields for bulk_create / bulk_update.
+
+Validates whole columns of values at once with
+ProductCodeFieldMixin.clean_many instead of one full_clean() per instance.
+"""
+from django.db.models import QuerySet
+from gtin_fields.fields import ProductCodeFieldMixin
+
+
+def product_code_fields(model, names=None):
+    """ Returns the product code fields of a model.
+
+    Args:
+      model: The model class (or instance).
+      names (iterable): Only return fields with these names.
+    """
+    return [
+        field for field in model._meta.concrete_fields
+        if isinstance(field, ProductCodeFieldMixin) and
+        (names is None or field.name in names)
+    ]
+
+
+def clean_instances(instances, fields=None):
+    """ Cleans the product code fields of many instances of one model.
+
+    Cleaned values are set on the instances like full_clean() does.  Other
+    fields are not validated.
+
+    Args:
+      instances (list): Model instances, all of the same model.
+      fields (iterable): Only clean the fields with these names.
+
+    Returns:
+      (dict): Maps the index of each instance with an invalid value to a
+          dict of {field name: ValidationError}.
+    """
+    errors = {}
+    if not instances:
+        return errors
+
+    for field in product_code_fields(instances[0], fields):
+        cleaned, field_errors = field.clean_many(
+            [getattr(instance, field.attname) for instance in instances]
+        )
+        for instance, value in zip(instances, cleaned):
+            setattr(instance, field.attname, value)
+        for index, error in field_errors.items():
+            errors.setdefault(index, {})[field.name] = error
+    return errors
+
+
+class ProductCodeQuerySet(QuerySet):
+    """ QuerySet with bulk operations that skip invalid product codes.
+
+    Use as a manager with:
+
+        objects = ProductCodeQuerySet.as_manager()
+    """
+    def bulk_create_valid(self, objs, **kwargs):
+        """ Bulk creates the objects whose product codes are valid.
+
+        Returns:
+          (created, errors): The created objects (see bulk_create) and the
+              errors of the skipped objects (see clean_instances).
+        """
+        objs = list(objs)
+        errors = clean_instances(objs)
+        valid = [obj for index, obj in enumerate(objs) if index not in errors]
+        return self.bulk_create(valid, **kwargs), errors
+
+    def bulk_update_valid(self, objs, fields, **kwargs):
+        """ Bulk updates the given fields of the objects whose product codes
+        (among those fields) are valid.
+
+        Returns:
+          (errors): The errors of the skipped objects (see clean_instances).
+        """
+        objs = list(objs)
+        errors = clean_instances(objs, fields)
+        valid = [obj for index, obj in enumerate(objs) if index not in errors]
+        self.bulk_update(valid, fields, **kwargs)
+        return errors
@@ -0,0 +1,175 @@
+""" Memoization of the product code validators.
+
+The same popular codes tend to be validated over and over.  A
+CachedValidator remembers the outcome (pass, or the message, code and params
+of the ValidationError raised) of the most recently used values in a bounded
+LRU:
+
+    from gtin_fields import cache, validators
+
+    upca = cache.CachedValidator(validators.UPCAValidator, maxsize=4096)
+    upca('042100005264')
+    upca.stats()  # => {'hits': 0, 'misses': 1, 'evictions': 0, ...}
+
+The product code fields wrap their validator when the setting
+GTIN_FIELDS_VALIDATOR_CACHE_SIZE is a positive number of entries (see
+cached).
+"""
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from gtin_fields.validators import KINDS
+
+# Name of the setting enabling the caching in the fields (0 is off)
+SETTING = 'GTIN_FIELDS_VALIDATOR_CACHE_SIZE'
+
+# Default number of entries of a CachedValidator
+MAXSIZE = 1024
+
+# Outcome stored for the values that pass validation
+_PASSED = object()
+
+# The shared CachedValidator of each (validator, maxsize), see cached()
+_instances = {}
+_instances_lock = threading.Lock()
+
+
+class CachedValidator:
+    """ Wraps a validator (e.g., validators.UPCAValidator) with an LRU cache.
+
+    Any other attribute (valid_lengths, validate_many, ...) is that of the
+    wrapped validator, which is also what the CachedValidator deconstructs
+    to, so migrations do not tell them apart.
+
+    Args:
+      validator (AlphaNumCodeValidatorBase): The validator to wrap.
+      maxsize (int): The number of values to remember.
+    """
+    def __init__(self, validator, maxsize=MAXSIZE):
+        self.validator = validator
+        self.maxsize = maxsize
+        self.hits = self.misses = self.evictions = 0
+        self._outcomes = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __call__(self, value):
+        """ Validates the given value. """
+        try:
+            # keyed by type too: True == 1 but only '1' could be valid
+            key = (type(value), value)
+            hash(key)
+        except TypeError:
+            return self.validator(value)  # unhashable, let it fail
+
+        with self._lock:
+            outcome = self._outcomes.get(key)
+            if outcome is not None:
+                self._outcomes.move_to_end(key)
+                self.hits += 1
+        if outcome is None:
+            outcome = self._validate(key, value)
+        if outcome is not _PASSED:
+            # a new error each time: callers may add to or chain the one
+            # they get (e.g., full_clean sets it per field)
+            raise _error(outcome)
+
+    def _validate(self, key, value):
+        """ Validates a value missing from the cache and stores the
+        outcome. """
+        try:
+            self.validator(value)
+        except ValidationError as error:
+            outcome = tuple(
+                (entry.message, entry.code, entry.params)
+                for entry in error.error_list
+            )
+        else:
+            outcome = _PASSED
+
+        with self._lock:
+            self.misses += 1
+            self._outcomes[key] = outcome
+            if len(self._outcomes) > self.maxsize:
+                self._outcomes.popitem(last=False)
+                self.evictions += 1
+        return outcome
+
+    def __getattr__(self, name):
+        if name == 'validator':  # not set yet (e.g., when unpickling)
+            raise AttributeError(name)
+        return getattr(self.validator, name)
+
+    def __eq__(self, other):
+        if isinstance(other, CachedValidator):
+            other = other.validator
+        return self.validator == other
+
+    def __hash__(self):
+        return hash(self.validator)
+
+    def deconstruct(self):
+        return self.validator.deconstruct()
+
+    def stats(self):
+        """ Returns the hit, miss and eviction counts and the size. """
+        return dict(
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            size=len(self._outcomes),
+            maxsize=self.maxsize,
+        )
+
+    def clear(self):
+        """ Empties the cache and resets the counts. """
+        with self._lock:
+            self._outcomes.clear()
+            self.hits = self.misses = self.evictions = 0
+
+
+def _error(outcome):
+    """ Returns a new ValidationError from the (message, code, params) of
+    each error of a stored outcome. """
+    errors = [
+        ValidationError(message, code=code, params=params and dict(params))
+        for message, code, params in outcome
+    ]
+    return errors[0] if len(errors) == 1 else ValidationError(errors)
+
+
+def cached(validator, maxsize=None):
+    """ Returns the validator wrapped in its shared CachedValidator.
+
+    Args:
+      validator (callable): The validator to wrap.
+      maxsize (int): The size of the cache, defaults to the
+          GTIN_FIELDS_VALIDATOR_CACHE_SIZE setting.
+
+    Returns:
+      (callable): The validator itself if the size is 0 (the default) or it
+          already is a CachedValidator.
+    """
+    if maxsize is None:
+        maxsize = getattr(settings, SETTING, 0)
+    if not maxsize or isinstance(validator, CachedValidator):
+        return validator
+
+    key = (id(validator), maxsize)
+    with _instances_lock:
+        if key not in _instances:
+            _instances[key] = CachedValidator(validator, maxsize)
+        return _instances[key]
+
+
+def stats():
+    """ Returns the stats of the shared CachedValidators (see cached) by the
+    kind of code they validate (see validators.KINDS). """
+    kinds = {id(validator): kind for kind, validator in KINDS.items()}
+    return {
+        kinds.get(id(instance.validator), instance.verbose_object_name): (
+            instance.stats()
+        )
+        for instance in list(_instances.values())
+    }
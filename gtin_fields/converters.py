@@ -1,5 +1,11 @@
 """ Converters related to GTIN fields. """
-from stdnum import ean
+import itertools
+
+from gtin_fields import gtin, isbn
+from gtin_fields.lazy import LazyModule
+
+ean = LazyModule('stdnum.ean')
+exceptions = LazyModule('stdnum.exceptions')
 
 
 def upce_to_upca(upce, validate=True):
@@ -26,11 +32,9 @@ def upce_to_upca(upce, validate=True):
 
     # can safely zero pad left a seven digit upce (is missing its left zero)
     if (len(given_upce) == 7) and (given_upce[0] != '0'):
-        pad = '0'
+        padded_upce = '0' + given_upce
     else:
-        pad = ''
-
-    padded_upce = pad + given_upce
+        padded_upce = given_upce
 
     if validate:
         if len(padded_upce) not in (6, 8):
@@ -43,38 +47,106 @@ def upce_to_upca(upce, validate=True):
         if (len(padded_upce) == 8 and padded_upce[0] not in ('0', '1')):
             raise ValueError("8 digit UPC-E must begin with 0 or 1")
 
-    given_6_digit_upce = (len(padded_upce) == 6)
-    upce6 = padded_upce if given_6_digit_upce else padded_upce[1:7]
+    if len(padded_upce) == 6:
+        leader, upce6, checksum = '0', padded_upce, None
+    else:
+        leader, upce6, checksum = (
+            padded_upce[0], padded_upce[1:7], padded_upce[7:]
+        )
+
+    template = _UPCE_TEMPLATES.get(upce6[-1:])
+    if template is None or not gtin.is_ascii_digits(upce6):
+        raise ValueError("UPC-E {} must be all digits".format(
+            repr(given_upce)
+        ))
+    body = leader + template.format(*upce6)
 
-    # upce6 digit names: abcdeN
-    map_id = int(upce6[-1])  # N
-    ab_prefix = upce6[0:2]  # ab
+    if checksum is None:
+        return body + gtin.check_digit(body)
+    upca = body + checksum
+    if validate and not gtin.has_valid_check_digit(upca):
+        ean.validate(upca)  # raises the reason
+    return upca
 
-    if map_id >= 5:
-        core = upce6[2:5], '0' * 4, map_id   # cde0000N
-    elif map_id <= 2:
-        core = map_id, '0' * 4, upce6[2:5]  # N0000cde
-    elif map_id == 3:
-        core = upce6[2], '0' * 5, upce6[3:5]   # c00000de
-    elif map_id == 4:
-        core = upce6[2:4], '0' * 5, upce6[4]  # cd00000e
 
-    # ab + core
-    no_leader_no_checksum = ab_prefix + ''.join(map(str, core))
+# How each UPC-E mapping digit N (the last of the 6 digits abcdeN) expands
+# into the 10 digits between the leader and the check digit of the UPC-A
+_UPCE_TEMPLATES = {
+    '0': '{0}{1}00000{2}{3}{4}',  # ab N 0000 cde
+    '1': '{0}{1}10000{2}{3}{4}',
+    '2': '{0}{1}20000{2}{3}{4}',
+    '3': '{0}{1}{2}00000{3}{4}',  # abc 00000 de
+    '4': '{0}{1}{2}{3}00000{4}',  # abcd 00000 e
+    '5': '{0}{1}{2}{3}{4}00005',  # abcde 0000 N
+    '6': '{0}{1}{2}{3}{4}00006',
+    '7': '{0}{1}{2}{3}{4}00007',
+    '8': '{0}{1}{2}{3}{4}00008',
+    '9': '{0}{1}{2}{3}{4}00009',
+}
+
+
+def upca_to_upce(upca, validate=True):
+    """ Compresses a UPC-A code into an 8 digit UPC-E code (the reverse of
+    upce_to_upca).
+
+    Only UPC-A codes with a leader of 0 or 1 and enough zeros in the right
+    places (see _UPCE_TEMPLATES) can be zero suppressed.
+
+    Args:
+      upca (str or int): The 12 digit UPC-A code (an int is zero padded).
+      validate: Will validate the checksum.
 
-    # add leader, also called 'S' digit
-    leader = '0' if given_6_digit_upce else padded_upce[0]
-    with_leader_no_checksum = leader + no_leader_no_checksum
+    Raises:
+      ValueError: If the code is not 12 digits.
 
-    if given_6_digit_upce:
-        with_checksum = with_leader_no_checksum\
-            + ean.calc_check_digit(with_leader_no_checksum)
+    Returns:
+      (str): The UPC-E code (leader, 6 digits and the UPC-A check digit), or
+          None if the UPC-A cannot be compressed.
+    """
+    code = str(upca).zfill(12) if isinstance(upca, int) else str(upca)
+    if len(code) != 12 or not gtin.is_ascii_digits(code):
+        raise ValueError("Provided UPC-A {} must be 12 digits!".format(
+            repr(code)
+        ))
+    if validate and not gtin.has_valid_check_digit(code):
+        ean.validate(code)  # raises the reason
+
+    leader, body, checksum = code[0], code[1:11], code[11]
+    if leader not in '01':
+        return None
+    if body[2] in '012' and body[3:7] == '0000':
+        upce6 = body[0:2] + body[7:10] + body[2]
+    elif body[3:8] == '00000':
+        upce6 = body[0:3] + body[8:10] + '3'
+    elif body[4:9] == '00000':
+        upce6 = body[0:4] + body[9] + '4'
+    elif body[5:9] == '0000' and body[9] >= '5':
+        upce6 = body[0:5] + body[9]
     else:
-        with_checksum = with_leader_no_checksum + given_upce[-1]
-        if validate:
-            ean.validate(with_checksum)
+        return None
+    return leader + upce6 + checksum
+
+
+def upce_to_upca_many(values, validate=True):
+    """ Converts many UPC-E codes to UPC-A (see upce_to_upca).
+
+    Returns:
+      (converted, errors): The UPC-A codes in input order (None for those
+          that failed) and a dict mapping the index of each value that
+          failed to its exception.
+    """
+    return _convert_chunk('upca', values, validate=validate)
+
 
-    return with_checksum
+def upca_to_upce_many(values, validate=True):
+    """ Compresses many UPC-A codes to UPC-E (see upca_to_upce).
+
+    Returns:
+      (converted, errors): The UPC-E codes in input order (None for those
+          that cannot be compressed or failed) and a dict mapping the index
+          of each value that failed to its exception.
+    """
+    return _convert_chunk('upce', values, validate=validate)
 
 
 def to_gtin14(value):
@@ -91,6 +163,46 @@ def to_gtin14(value):
     return str(value).zfill(14)
 
 
+def normalize_gtin14(value):
+    """ Convert any GTIN or UPC-E code to its canonical GTIN-14 form.
+
+    GTIN-8, UPC-A (GTIN-12), EAN-13 (GTIN-13) and GTIN-14 codes are zero
+    padded (see to_gtin14) and UPC-E codes are expanded first (see
+    upce_to_upca).  6 and 7 digit codes are taken as UPC-E and 8 digit codes
+    as GTIN-8, unless their check digit is only valid for a UPC-E.
+
+    The checksums of GTIN-8/12/13/14 codes are not checked (zero padding
+    keeps them valid or invalid).
+
+    Raises:
+      ValueError: If the value is not all digits, has the wrong length or is
+          a 6 or 7 digit code that is not a UPC-E.
+
+    Returns:
+      (str): The GTIN-14 code.
+    """
+    code = str(value)
+    if not gtin.is_ascii_digits(code):
+        raise ValueError("GTIN {} must be all digits".format(repr(code)))
+
+    length = len(code)
+    if length == 8 and code[0] in '01' and not gtin.has_valid_check_digit(
+        code
+    ):
+        try:
+            return to_gtin14(upce_to_upca(code))
+        except exceptions.ValidationError:
+            pass  # neither a valid GTIN-8 nor UPC-E, leave to validation
+    elif length in (6, 7):
+        return to_gtin14(upce_to_upca(code))
+
+    if length not in gtin.VALID_LENGTHS:
+        raise ValueError(
+            "GTIN {} must be 6, 7, 8, 12, 13 or 14 digits".format(repr(code))
+        )
+    return to_gtin14(code)
+
+
 upca_to_gtin14 = to_gtin14
 ean_to_gtin14 = to_gtin14
 gtin8_to_gtin14 = to_gtin14
@@ -112,3 +224,172 @@ def to_ean(value):
 upca_to_ean = to_ean
 upca_to_ean13 = to_ean
 upca_to_gtin13 = to_ean
+
+
+def isbn10_to_isbn13(isbn10, validate=True):
+    """ Converts an ISBN-10 to its ISBN-13 (the 978 Bookland EAN-13).
+
+    Args:
+      isbn10 (str or int): The 10 character ISBN-10 (an int is zero padded).
+      validate: Will validate the check digit of the ISBN-10 (which is
+          replaced, so an invalid ISBN-10 would otherwise become a valid
+          ISBN-13).
+
+    Raises:
+      ValueError: If the code is not 9 digits followed by a digit or X.
+
+    Returns:
+      (str): The ISBN-13 code.
+    """
+    code = str(isbn10).zfill(10) if isinstance(isbn10, int) else str(isbn10)
+    body, checksum = code[:-1], code[-1:].upper()
+    if len(code) != 10 or not gtin.is_ascii_digits(body) or (
+        checksum not in '0123456789X'
+    ):
+        raise ValueError(
+            "Provided ISBN-10 {} must be 9 digits and a digit or X!".format(
+                repr(code)
+            )
+        )
+    if validate and isbn.check_digit10(body) != checksum:
+        raise exceptions.InvalidChecksum()
+    body = '978' + body
+    return body + gtin.check_digit(body)
+
+
+def isbn13_to_isbn10(isbn13, validate=True):
+    """ Converts an ISBN-13 to an ISBN-10 (the reverse of isbn10_to_isbn13).
+
+    Only ISBN-13 codes with the 978 prefix have an ISBN-10 form.
+
+    Args:
+      isbn13 (str or int): The 13 digit ISBN-13.
+      validate: Will validate the prefix (978 or 979) and checksum.
+
+    Raises:
+      ValueError: If the code is not 13 digits.
+
+    Returns:
+      (str): The ISBN-10 code, or None if the ISBN-13 has no ISBN-10 form.
+    """
+    code = str(isbn13)
+    if len(code) != 13 or not gtin.is_ascii_digits(code):
+        raise ValueError("Provided ISBN-13 {} must be 13 digits!".format(
+            repr(code)
+        ))
+    if validate:
+        if code[:3] not in isbn.ISBN13_PREFIXES:
+            raise exceptions.InvalidComponent()
+        if not gtin.has_valid_check_digit(code):
+            raise exceptions.InvalidChecksum()
+
+    if code[:3] != '978':
+        return None
+    body = code[3:12]
+    return body + isbn.check_digit10(body)
+
+
+def normalize_isbn13(value):
+    """ Converts an ISBN-10 or ISBN-13 to its canonical ISBN-13 form.
+
+    An ISBN-10 is converted (see isbn10_to_isbn13) after validating its
+    check digit; an ISBN-13 is returned as is (its checksum is not checked).
+
+    Raises:
+      ValueError: If the value is not 10 or 13 characters (see
+          isbn10_to_isbn13 and isbn13_to_isbn10 for the formats).
+      stdnum.exceptions.InvalidChecksum: If an ISBN-10 has a bad check
+          digit.
+
+    Returns:
+      (str): The ISBN-13 code.
+    """
+    code = str(value)
+    if len(code) == 10:
+        return isbn10_to_isbn13(code)
+    if len(code) != 13 or not gtin.is_ascii_digits(code):
+        raise ValueError(
+            "ISBN {} must be 10 or 13 characters".format(repr(code))
+        )
+    return code
+
+
+# convert_many targets: the converter producing each
+TARGETS = dict(
+    upca=upce_to_upca,
+    upce=upca_to_upce,
+    gtin14=normalize_gtin14,
+    ean13=to_ean,
+    isbn13=normalize_isbn13,
+    isbn10=isbn13_to_isbn10,
+)
+
+# Values converted per task by convert_many
+CHUNK_SIZE = 10000
+
+
+def convert_many(values, target='gtin14', workers=1, chunksize=CHUNK_SIZE,
+                 executor=None):
+    """ Converts many values, in parallel over worker processes.
+
+    The values are split into chunks that are converted by a
+    ProcessPoolExecutor (unless workers is 1).  A value that fails to
+    convert does not stop the others.
+
+    Args:
+      values (iterable): The values to convert.
+      target (str): What to convert to (see TARGETS): 'upca' (from UPC-E),
+          'upce' (from UPC-A), 'gtin14' (from any GTIN or UPC-E), 'ean13'
+          (from UPC-A), 'isbn13' (from ISBN-10 or ISBN-13) or 'isbn10' (from
+          ISBN-13).
+      workers (int): The number of worker processes.
+      chunksize (int): The number of values sent to a worker at a time.
+      executor (Executor): Use this executor instead of starting one.
+
+    Returns:
+      (converted, errors): The converted values in input order (None for
+          those that failed) and a dict mapping the index of each value that
+          failed to its exception.
+    """
+    if target not in TARGETS:
+        raise ValueError("Unknown target {}, use one of {}".format(
+            repr(target), ', '.join(TARGETS)
+        ))
+    values = list(values)
+    chunks = [
+        values[start:start + chunksize]
+        for start in range(0, len(values), chunksize)
+    ]
+
+    targets = itertools.repeat(target)
+    if executor is not None:
+        results = executor.map(_convert_chunk, targets, chunks)
+    elif workers > 1 and len(chunks) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(workers) as pool:
+            results = list(pool.map(_convert_chunk, targets, chunks))
+    else:
+        results = map(_convert_chunk, targets, chunks)
+
+    converted = []
+    errors = {}
+    for chunk_converted, chunk_errors in results:
+        offset = len(converted)
+        converted.extend(chunk_converted)
+        for index, error in chunk_errors.items():
+            errors[offset + index] = error
+    return converted, errors
+
+
+def _convert_chunk(target, values, **kwargs):
+    """ Converts a chunk of values (see convert_many). """
+    convert = TARGETS[target]
+    converted = []
+    errors = {}
+    for index, value in enumerate(values):
+        try:
+            converted.append(convert(value, **kwargs))
+        except (ValueError, exceptions.ValidationError) as error:
+            converted.append(None)
+            errors[index] = error
+    return converted, errors
@@ -0,0 +1,141 @@
+""" Detection of the type of a product code.
+
+A column of mixed product codes (ASINs, ISBNs, UPC-Es, UPC-As, EANs and
+GTIN-14s) is sorted out by looking at each code once: its length and
+characters narrow it down to the few types it could be, and each checksum
+those call for is computed once (instead of running every validator and
+catching its ValidationError):
+
+    from gtin_fields import detect
+
+    detect.identify('0765348276')  # => ('isbn10', 'asin')
+    detect.identify('04252614')  # => ('upce',)
+    detect.identify('042100005265')  # => () (bad check digit)
+    detect.normalize('04252614')  # => ('00042100005264', 'upce')
+
+Codes must be plain ASCII digits (an ISBN-10 may end with X), without
+separators or whitespace.  6 and 7 digit UPC-E codes (which have no check
+digit to tell them from any other number) are not detected.
+"""
+from gtin_fields import converters, gtin, isbn
+
+# The types of codes, most specific first (the order of identify's result)
+TYPES = (
+    'gtin14', 'isbn13', 'ean13', 'upca', 'gtin8', 'upce', 'isbn10', 'asin',
+)
+
+# The lengths of the codes of each type
+LENGTHS = dict(
+    gtin14=14, isbn13=13, ean13=13, upca=12, gtin8=8, upce=8, isbn10=10,
+    asin=10,
+)
+
+# The GS1 types by the length of their codes
+_GS1_TYPES = {14: ('gtin14',), 13: ('ean13',), 12: ('upca',), 8: ('gtin8',)}
+
+
+def identify(code):
+    """ Returns every type of product code a code is valid as.
+
+    Returns:
+      (tuple): The types (see TYPES), most specific first; empty if the code
+          is none of them.
+    """
+    if type(code) is not str:
+        return ()
+    length = len(code)
+    if length == 10:
+        return _identify10(code)
+    if length not in _GS1_TYPES or not gtin.is_ascii_digits(code):
+        return ()
+    return _identify_digits(code, gtin.has_valid_check_digit(code))
+
+
+def identify_many(codes):
+    """ Identifies many codes at once (see identify).
+
+    The GS1 and ISBN-10 checksums of all the digit only codes are checked
+    in batches (see gtin.is_valid_many and isbn.is_valid_many).
+
+    Returns:
+      (list): The types of each code.
+    """
+    codes = list(codes)
+    results = [()] * len(codes)
+    gs1 = []
+    tens = []
+    for index, code in enumerate(codes):
+        if type(code) is not str:
+            continue
+        if not gtin.is_ascii_digits(code):
+            if len(code) == 10:
+                results[index] = _identify10(code)
+        elif len(code) == 10:
+            tens.append(index)
+        elif len(code) in _GS1_TYPES:
+            gs1.append(index)
+
+    checksums_ok = gtin.is_valid_many([codes[index] for index in gs1])
+    for index, ok in zip(gs1, checksums_ok):
+        results[index] = _identify_digits(codes[index], bool(ok))
+
+    isbn_ok = isbn.is_valid_many([codes[index] for index in tens])
+    for index, ok in zip(tens, isbn_ok):
+        results[index] = ('isbn10', 'asin') if ok else ('asin',)
+    return results
+
+
+def detect(code):
+    """ Returns the most specific type of a code (see identify), None if it
+    is not a product code. """
+    types = identify(code)
+    return types[0] if types else None
+
+
+def normalize(code):
+    """ Returns the canonical form of a product code and its type.
+
+    GTINs (of any form, and UPC-E) are normalized to GTIN-14 (see
+    converters.normalize_gtin14) and ISBN-10s to the GTIN-14 of their ISBN-13,
+    so each item has one form.  ASINs are kept as they are.
+
+    Raises:
+      ValueError: If the code is not a product code.
+
+    Returns:
+      (normalized, type)
+    """
+    kind = detect(code)
+    if kind is None:
+        raise ValueError("{} is not a product code".format(repr(code)))
+    if kind == 'asin':
+        return code, kind
+    if kind == 'isbn10':
+        return converters.to_gtin14(
+            converters.isbn10_to_isbn13(code, validate=False)
+        ), kind
+    return converters.normalize_gtin14(code), kind
+
+
+def _identify10(code):
+    """ The types of a 10 character code: ISBN-10 and/or ASIN. """
+    types = ()
+    if isbn.has_valid_check_digit(code):
+        types = ('isbn10',)
+    if code.isalnum():  # see validators.ASINValidator
+        types += ('asin',)
+    return types
+
+
+def _identify_digits(code, checksum_ok):
+    """ The types of a code of ASCII digits of one of the GS1 lengths, given
+    whether its GS1 check digit is valid. """
+    length = len(code)
+    types = _GS1_TYPES[length] if checksum_ok else ()
+    if length == 13 and checksum_ok and code[:3] in isbn.ISBN13_PREFIXES:
+        types = ('isbn13',) + types
+    elif length == 8 and code[0] in '01' and gtin.has_valid_check_digit(
+        converters.upce_to_upca(code, validate=False)
+    ):
+        types += ('upce',)
+    return types
@@ -1,25 +1,213 @@
-from django.db.models import CharField
-from gtin_fields import validators
+from django import forms
+from django.core.exceptions import ValidationError
+from django.db.models import BigIntegerField, CharField, IntegerField, signals
+from django.db.models.query_utils import DeferredAttribute
+from django.utils.functional import cached_property
+from gtin_fields import (cache, converters, detect, functions, gtin, isbn,
+                         lookups, validators)
+from gtin_fields.forms import GTINFormField
 
+# The primary validators of the fields with allow_restricted=False, by
+# validator class (shared like the validators.KINDS instances)
+_restricted_validators = {}
 
-class ProductCodeFieldBase(CharField):
+
+class ProductCodeFieldMixin:
+    """ Methods shared by all product code fields (see
+    ProductCodeFieldBase). """
+
+    # GS1 indicator digits of the packaging levels of an item (9, variable
+    # measure, is not a packaging level)
+    packaging_indicators = '012345678'
+
+    # Whether the column holds codes of different lengths, which do not sort
+    # like the codes they stand for: the company_prefix lookup then compares
+    # each range with the codes as long as its bounds only
+    mixed_lengths = False
+
+    @property
+    def gtin_width(self):
+        """ The number of digits of the GTIN form stored in this field (None
+        if the field does not hold GTINs). """
+        return max(self._primary_validator.valid_lengths)
+
+    def from_gtin14(self, gtin14):
+        """ Returns a GTIN-14 in the form stored in this field, or None if it
+        has no such form (e.g., a GTIN-14 with an indicator digit in a UPC-A
+        field). """
+        width = self.gtin_width
+        if width is None:
+            return None
+        head = gtin14[:len(gtin14) - width]
+        if head.strip('0'):
+            return None
+        return gtin14[len(head):]
+
+    def gtin_variants(self, value):
+        """ Returns every packaging level of the item with the given code
+        (any GTIN or UPC-E), in the form stored in this field. """
+        try:
+            item = converters.normalize_gtin14(value)[1:-1]
+        except ValueError:
+            return []
+        variants = []
+        for indicator in self.packaging_indicators:
+            body = indicator + item
+            code = self.from_gtin14(body + gtin.check_digit(body))
+            if code is not None:
+                variants.append(code)
+        return variants
+
+    def company_prefix_ranges(self, prefix):
+        """ Returns the ranges of codes (in the form stored in this field)
+        under a GS1 company prefix.
+
+        Args:
+          prefix (str): The GS1 company prefix as it starts an EAN-13 (i.e.,
+              a UPC company prefix with a leading zero).
+
+        Returns:
+          (list): (low, high) tuples: low is inclusive and high exclusive
+              (or None for no upper bound).
+        """
+        prefix = str(prefix)
+        width = self.gtin_width
+        if width is None or not gtin.is_ascii_digits(prefix) or (
+            len(prefix) > 13
+        ):
+            return []
+
+        if width >= 14:
+            heads = [indicator + prefix for indicator in '0123456789']
+        else:
+            dropped = 13 - width
+            if prefix[:dropped].strip('0'):
+                return []
+            heads = [prefix[dropped:]]
+
+        ranges = []
+        for head in heads:
+            span = 10 ** (width - len(head))
+            low = int(head or 0) * span
+            high = low + span
+            ranges.append((
+                str(low).zfill(width),
+                str(high).zfill(width) if high < 10 ** width else None,
+            ))
+        return ranges
+
+    def clean_many(self, values):
+        """ Cleans a whole column of values in one batched pass.
+
+        Does what clean() does for each value but validates them with the
+        primary validator's validate_many (which builds the errors from the
+        reasons values fail instead of raising them) and returns the errors.
+        Other validators that can fail are run on every value.
+
+        Returns:
+          (cleaned, errors): The list of cleaned values and a dict mapping
+              the index of each invalid value to its ValidationError (with
+              the messages clean() would have raised).
+        """
+        cleaned = [self.to_python(value) for value in values]
+        errors = {}
+        checked = []
+        for index, value in enumerate(cleaned):
+            if self.choices or value in self.empty_values:
+                try:
+                    self.validate(value, None)
+                except ValidationError as error:
+                    errors[index] = error
+                    continue
+            if value not in self.empty_values:
+                checked.append(index)
+
+        if self._extra_validators():
+            for index in checked:
+                try:
+                    self.run_validators(cleaned[index])
+                except ValidationError as error:
+                    errors[index] = error
+            return cleaned, errors
+
+        failed = self._primary_validator.validate_many(
+            [cleaned[index] for index in checked]
+        )
+        for position, error in failed.items():
+            errors[checked[position]] = error
+        return cleaned, errors
+
+    def contribute_to_class(self, cls, name, *args, **kwargs):
+        super().contribute_to_class(cls, name, *args, **kwargs)
+        # one pass of type, length, character and checksum checks
+        self.validators = [
+            validators.fuse(self._primary_validator, self.validators)
+        ]
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        if not self.allow_restricted:
+            kwargs['allow_restricted'] = False
+        return name, path, args, kwargs
+
+    def _init_primary_validator(self, allow_restricted):
+        """ Sets up the primary validator: one that rejects restricted
+        circulation and coupon codes unless allow_restricted (see
+        validators.GTINValidatorBase), cached (see cache.cached). """
+        self.allow_restricted = allow_restricted
+        validator = self._primary_validator
+        if not allow_restricted:
+            if not isinstance(validator, validators.GTINValidatorBase):
+                raise TypeError(
+                    "allow_restricted only applies to GTIN fields"
+                )
+            validator = _restricted_validators.setdefault(
+                type(validator), type(validator)(allow_restricted=False)
+            )
+        self._primary_validator = cache.cached(validator)
+
+    def _fuse_formfield_validators(self, formfield):
+        """ Fuses the validators of a form field made by formfield() (which
+        adds its own length and null character checks). """
+        formfield.validators = [
+            validators.fuse(self._primary_validator, formfield.validators)
+        ]
+        return formfield
+
+    def _field_validators(self, kwargs):
+        """ Returns the validators kwarg with the primary validator added
+        (once, as a deconstructed field already has it). """
+        return [
+            validator for validator in kwargs.get('validators', [])
+            if validator != self._primary_validator
+        ] + [self._primary_validator]
+
+    def _extra_validators(self):
+        """ The validators besides the primary validator that can fail. """
+        return validators.fuse(self._primary_validator, self.validators).extra
+
+
+class ProductCodeFieldBase(ProductCodeFieldMixin, CharField):
     """ Base class for all these product code fields.
 
     Expects the variable _primary_validator (one of the
     gtin_fields.validators) on self.  The _validator_class object should
-    have 'valid_lengths' and 'verbose_object_name'.
+    have 'valid_lengths' and 'verbose_object_name'.  It is wrapped in a
+    cache.CachedValidator when GTIN_FIELDS_VALIDATOR_CACHE_SIZE is set.
+
+    GTIN fields initialized with allow_restricted=False also reject
+    restricted circulation and coupon codes (see prefixes.classify).
     """
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, allow_restricted=True, **kwargs):
+        self._init_primary_validator(allow_restricted)
         new_kwargs = dict(
             dict(
                 max_length=max(self._primary_validator.valid_lengths),
                 verbose_name=self._primary_validator.verbose_object_name,
-                validators=kwargs.get(
-                    'validators', []
-                ) + [self._primary_validator],
             ),
             **kwargs
         )
+        new_kwargs['validators'] = self._field_validators(kwargs)
         super().__init__(*args, **new_kwargs)
 
     def formfield(self, **kwargs):
@@ -31,14 +219,81 @@ class ProductCodeFieldBase(CharField):
             ),
             **kwargs
         )
-        return super().formfield(**new_kwargs)
+        return self._fuse_formfield_validators(
+            super().formfield(**new_kwargs)
+        )
 
     def __str__(self):
         return self.value
 
 
 class ISBNField(ProductCodeFieldBase):
+    """ International Standard Book Number field (ISBN-10 or ISBN-13).
+
+    If initialized with normalize='isbn13' then valid ISBN-10 codes are
+    stored as their ISBN-13 (see converters.isbn10_to_isbn13), so each book
+    has one form and lookups by either form are an exact match on the one
+    (indexable) column:
+
+        Book.objects.filter(isbn='0765348276')  # matches '9780765348272'
+    """
     _primary_validator = validators.ISBNValidator
+    normalize_forms = ('isbn13',)
+    mixed_lengths = True
+
+    def __init__(self, *args, normalize=None, **kwargs):
+        if normalize is not None and normalize not in self.normalize_forms:
+            raise ValueError("Unknown normalize {}, use one of {}".format(
+                repr(normalize), ', '.join(self.normalize_forms)
+            ))
+        self.normalize = normalize
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        if self.normalize is not None:
+            kwargs['normalize'] = self.normalize
+        return name, path, args, kwargs
+
+    def company_prefix_ranges(self, prefix):
+        """ Returns the ranges of the ISBN-13s under a GS1 prefix (see
+        ProductCodeFieldMixin.company_prefix_ranges) and the range of the
+        ISBN-10s whose ISBN-13 is under it.
+
+        An ISBN-10 is the body of a 978 ISBN-13 with another check
+        character, so its range is that of the ISBN-13 bodies without 978.
+        """
+        ranges = super().company_prefix_ranges(prefix)
+        prefix = str(prefix)
+        if not ranges or not (
+            prefix.startswith('978') or '978'.startswith(prefix)
+        ):
+            return ranges
+        if len(prefix) == 13 and not gtin.has_valid_check_digit(prefix):
+            return ranges
+
+        body = prefix[3:12]
+        high = None
+        if body:
+            following = str(int(body) + 1).zfill(len(body))
+            if len(following) == len(body):
+                high = following.ljust(10, '0')
+        return ranges + [(body.ljust(10, '0'), high)]
+
+    def to_python(self, value):
+        value = super().to_python(value)
+        if self.normalize is None or value in self.empty_values or (
+            len(value) != 10 or not isbn.has_valid_check_digit(value)
+        ):
+            return value  # left for the validator to report
+        return converters.isbn10_to_isbn13(value, validate=False)
+
+    def pre_save(self, model_instance, add):
+        value = super().pre_save(model_instance, add)
+        if self.normalize is not None:
+            value = self.to_python(value)
+            setattr(model_instance, self.attname, value)
+        return value
 
 
 class UPCAField(ProductCodeFieldBase):
@@ -53,6 +308,45 @@ class GTIN14Field(ProductCodeFieldBase):
     _primary_validator = validators.GTIN14Validator
 
 
+class GTINField(ProductCodeFieldBase):
+    """ A GTIN stored in one canonical form: GTIN-14.
+
+    Accepts GTIN-8, UPC-A (GTIN-12), EAN-13 (GTIN-13), GTIN-14 and UPC-E
+    codes and stores them as GTIN-14 (see converters.normalize_gtin14).
+    Lookup values are normalized the same way (CharField.get_prep_value
+    goes through to_python), so every form of a code is an
+    exact match on the one (indexable) column:
+
+        Product.objects.filter(gtin='425261')  # matches '00042100005264'
+    """
+    _primary_validator = validators.GTIN14Validator
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault('verbose_name', 'GTIN')
+        super().__init__(*args, **kwargs)
+
+    def to_python(self, value):
+        value = super().to_python(value)
+        if value in self.empty_values:
+            return value
+        try:
+            return converters.normalize_gtin14(value)
+        except ValueError:
+            return value  # left for the validator to report
+
+    def pre_save(self, model_instance, add):
+        value = self.to_python(super().pre_save(model_instance, add))
+        setattr(model_instance, self.attname, value)
+        return value
+
+    def formfield(self, **kwargs):
+        new_kwargs = dict(
+            dict(form_class=GTINFormField, min_length=None),
+            **kwargs
+        )
+        return super().formfield(**new_kwargs)
+
+
 class ASINField(ProductCodeFieldBase):
     """ Amazon Standard Identification Number field.
 
@@ -60,8 +354,175 @@ class ASINField(ProductCodeFieldBase):
     otherwise ASINValidator.
     """
     _primary_validator = validators.ASINValidator
+    gtin_width = None
 
     def __init__(self, *args, **kwargs):
         if kwargs.pop('strict', None):
             self._primary_validator = validators.ASINStrictValidator
         super().__init__(*args, **kwargs)
+
+
+class ProductCodeDescriptor(DeferredAttribute):
+    """ The attribute of a ProductCodeField: assigning a different code
+    updates the type field (like ImageFileDescriptor does the dimension
+    fields of an ImageField). """
+
+    def __set__(self, instance, value):
+        attname = self.field.attname
+        previous = instance.__dict__.get(attname, _UNSET)
+        instance.__dict__[attname] = value
+        # on Model.__init__ the post_init signal does it
+        if previous is not _UNSET and (
+            self.field.to_python(previous) != self.field.to_python(value)
+        ):
+            self.field.update_type_field(instance, force=True)
+
+
+_UNSET = object()
+
+
+class ProductCodeField(ProductCodeFieldBase):
+    """ Any product code: GTIN-8, UPC-E, UPC-A, EAN-13, GTIN-14, ISBN or ASIN.
+
+    The type of a code is detected in one pass (see detect.identify) and the
+    code is stored in its canonical form (see detect.normalize): GTIN-14 for
+    all but ASINs, so every form of an item is an exact match on the one
+    (indexable) column.
+
+    Args:
+      type_field (str): The name of a CharField of the model to keep the
+          detected type of the code in (one of detect.TYPES, None if the
+          code is not valid).  It is set when the model is created and
+          whenever a different code is assigned, like the width_field of an
+          ImageField.
+    """
+    _primary_validator = validators.ProductCodeValidator
+    descriptor_class = ProductCodeDescriptor
+    mixed_lengths = True  # ASINs
+
+    def __init__(self, *args, type_field=None, **kwargs):
+        self.type_field = type_field
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        if self.type_field:
+            kwargs['type_field'] = self.type_field
+        return name, path, args, kwargs
+
+    def contribute_to_class(self, cls, name, **kwargs):
+        super().contribute_to_class(cls, name, **kwargs)
+        if self.type_field and not cls._meta.abstract:
+            signals.post_init.connect(self.update_type_field, sender=cls)
+
+    def update_type_field(self, instance, force=False, *args, **kwargs):
+        """ Sets the type field to the type of the code (if it is empty,
+        unless force). """
+        if not self.type_field or self.attname not in instance.__dict__:
+            return  # deferred
+        type_attname = instance._meta.get_field(self.type_field).attname
+        if type_attname not in instance.__dict__:
+            return  # deferred
+        if not force and instance.__dict__[type_attname] not in (
+            self.empty_values
+        ):
+            return
+        value = instance.__dict__[self.attname]
+        setattr(instance, type_attname, (
+            None if value in self.empty_values else detect.detect(str(value))
+        ))
+
+    def to_python(self, value):
+        value = super().to_python(value)
+        if value in self.empty_values:
+            return value
+        try:
+            return detect.normalize(value)[0]
+        except ValueError:
+            return value  # left for the validator to report
+
+    def pre_save(self, model_instance, add):
+        value = self.to_python(super().pre_save(model_instance, add))
+        setattr(model_instance, self.attname, value)
+        return value
+
+
+class ProductCodeIntegerFieldBase(ProductCodeFieldMixin, BigIntegerField):
+    """ Base class for product code fields stored in an integer column.
+
+    Works with the same zero padded strings as ProductCodeFieldBase: they
+    are validated as strings, stored as BIGINT and restored with their
+    leading zeros when read back.  Integer columns make for much smaller
+    indexes that are faster to compare than varchar ones.
+
+    Expects the variable _primary_validator (one of the
+    gtin_fields.validators) on self, with a single valid length.
+    """
+    def __init__(self, *args, allow_restricted=True, **kwargs):
+        self._init_primary_validator(allow_restricted)
+        new_kwargs = dict(
+            dict(
+                verbose_name=self._primary_validator.verbose_object_name,
+            ),
+            **kwargs
+        )
+        new_kwargs['validators'] = self._field_validators(kwargs)
+        super().__init__(*args, **new_kwargs)
+
+    @property
+    def width(self):
+        """ The number of digits of a code (what is zero padded to). """
+        return max(self._primary_validator.valid_lengths)
+
+    @cached_property
+    def validators(self):
+        # values are validated as strings so skip the integer range
+        # validators of IntegerField
+        return [*self.default_validators, *self._validators]
+
+    def to_python(self, value):
+        if value is None or value == '':
+            return None
+        if isinstance(value, int):
+            return str(value).zfill(self.width)
+        return str(value)
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return value
+        return str(value).zfill(self.width)
+
+    def formfield(self, **kwargs):
+        new_kwargs = dict(
+            dict(
+                form_class=forms.CharField,
+                max_length=self.width,
+                min_length=self.width,
+                validators=[self._primary_validator],
+            ),
+            **kwargs
+        )
+        if self.null:
+            new_kwargs.setdefault('empty_value', None)
+        # skip the IntegerField formfield (a forms.IntegerField)
+        return self._fuse_formfield_validators(
+            super(IntegerField, self).formfield(**new_kwargs)
+        )
+
+
+class UPCAIntegerField(ProductCodeIntegerFieldBase):
+    _primary_validator = validators.UPCAValidator
+
+
+class EAN13IntegerField(ProductCodeIntegerFieldBase):
+    _primary_validator = validators.EAN13Validator
+
+
+class GTIN14IntegerField(ProductCodeIntegerFieldBase):
+    _primary_validator = validators.GTIN14Validator
+
+
+for _field_class in (ProductCodeFieldBase, ProductCodeIntegerFieldBase):
+    _field_class.register_lookup(lookups.GTINEquivalent)
+    _field_class.register_lookup(lookups.CompanyPrefix)
+    _field_class.register_lookup(functions.GTINCheckDigit)
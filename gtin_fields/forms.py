@@ -0,0 +1,18 @@
+""" Form fields for the product code fields that normalize their input. """
+from django import forms
+from gtin_fields import converters
+
+
+class GTINFormField(forms.CharField):
+    """ Accepts any GTIN or UPC-E code and cleans it to its GTIN-14 form
+    (see converters.normalize_gtin14).  Codes that cannot be normalized are
+    left as entered for the validators to report. """
+
+    def to_python(self, value):
+        value = super().to_python(value)
+        if value in self.empty_values:
+            return value
+        try:
+            return converters.normalize_gtin14(value)
+        except ValueError:
+            return value
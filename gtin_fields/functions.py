@@ -0,0 +1,102 @@
+""" Database functions computing GS1 check digits in SQL.
+
+GTINCheckDigit computes the check digit a code's body (all but its last
+digit) calls for, so codes loaded by raw SQL, COPY or QuerySet.update() can
+be checked by the database at set speed:
+
+    # the rows with a bad check digit
+    Product.objects.exclude(upca__gtin_check_digit=Right('upca', 1))
+
+    # or have the database refuse them
+    class Meta:
+        constraints = [check_digit_constraint('upca', 12)]
+
+SQLite gets the gtin_check_digit() function registered on every connection
+(see register_sqlite_functions); PostgreSQL computes it inline.
+"""
+from django.db.backends.signals import connection_created
+from django.db.models import CharField, CheckConstraint, Q, Transform
+from django.db.models.functions import Right
+from gtin_fields import gtin
+
+# Name of the function registered on SQLite connections
+SQLITE_FUNCTION = 'gtin_check_digit'
+
+# The longest code whose check digit the inline SQL computes (GTIN-14)
+MAX_LENGTH = 14
+
+
+class GTINCheckDigit(Transform):
+    """ The GS1 check digit (a one character string) for the body of a code.
+
+    The body is every character but the last, so for a valid code this
+    equals its last character.  NULL for NULL; meaningless for codes that are
+    not all digits (see check_digit_constraint).
+    """
+    lookup_name = 'gtin_check_digit'
+    output_field = CharField()
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler, connection, function=SQLITE_FUNCTION, **extra_context
+        )
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        sql, params = compiler.compile(self.lhs)
+        digits = "REVERSE(({})::text)".format(sql)
+        # weights from the right of the body: 3, 1, 3, ... (position 1 of
+        # the reversed code is the check digit itself).  POSITION of an
+        # empty string (past the start of a short code) is 1, a zero digit.
+        terms = [
+            "{} * (POSITION(SUBSTRING({} FROM {} FOR 1) IN '0123456789') "
+            "- 1)".format(3 if position % 2 == 0 else 1, digits, position)
+            for position in range(2, MAX_LENGTH + 1)
+        ]
+        sql = "((10 - ({}) %% 10) %% 10)::text".format(' + '.join(terms))
+        return sql, params * len(terms)
+
+
+def check_digit_constraint(field_name, length, name=None, blank=False):
+    """ Returns a CheckConstraint that a column holds only codes of the
+    given length (e.g., 12 for a UPCAField) with a valid check digit.
+
+    NULL passes, as for any CHECK constraint.
+
+    Args:
+      field_name (str): The name of the field.
+      length (int): The number of digits of the codes.
+      name (str): The constraint name (default: <field_name>_gtin_check).
+      blank (bool): Whether to also allow the empty string.
+    """
+    check = Q(**{
+        field_name + '__regex': '^[0-9]{{{}}}$'.format(length),
+        field_name + '__gtin_check_digit': Right(field_name, 1),
+    })
+    if blank:
+        check |= Q(**{field_name: ''})
+    return CheckConstraint(
+        check=check, name=name or '{}_gtin_check'.format(field_name)
+    )
+
+
+def sqlite_check_digit(value):
+    """ The gtin_check_digit() SQL function of SQLite (see
+    GTINCheckDigit). """
+    if value is None:
+        return None
+    body = str(value)[:-1]
+    if not gtin.is_ascii_digits(body):
+        return None
+    return gtin.check_digit(body)
+
+
+def register_sqlite_functions(sender, connection, **kwargs):
+    """ Registers gtin_check_digit() on new SQLite connections (connected
+    to the connection_created signal). """
+    if connection.vendor == 'sqlite':
+        connection.connection.create_function(
+            SQLITE_FUNCTION, 1, sqlite_check_digit, deterministic=True
+        )
+
+
+connection_created.connect(register_sqlite_functions)
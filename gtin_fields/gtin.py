@@ -4,24 +4,76 @@ TODO: This code should be pushed into python-stdnum.  Within python stdnum
 should move ean.py to gtin.py.
 
 The code in this file is nearly identical to the stdnum/ean.py code.
+
+has_valid_check_digit and check_digit are table-driven versions of the
+stdnum checksum math for strings already known to be ASCII digits.
+
+validate_many and is_valid_many check whole batches of numbers at once.  They
+use numpy (if installed) to compute the checksums of all plain digit strings
+in one vectorized pass and fall back to validate for anything else.
+
+Numbers may also be bytes, bytearray or memoryview (e.g., read from a file
+or socket): their digits and checksums are checked on the byte values,
+without decoding them into str objects.  validate_records checks the fixed
+width records of one large buffer (e.g., an mmap) in place.
+
+stdnum and numpy are imported on first use (see lazy.LazyModule).
 """
-from stdnum.ean import calc_check_digit, compact
-from stdnum.exceptions import (InvalidChecksum, InvalidFormat, InvalidLength,
-                               ValidationError)
+from gtin_fields.lazy import LazyModule
+
+ean = LazyModule('stdnum.ean')
+exceptions = LazyModule('stdnum.exceptions')
+numpy = LazyModule('numpy', optional=True)
+
+VALID_LENGTHS = (14, 13, 12, 8)
+
+# The binary types accepted besides str
+BYTES_TYPES = (bytes, bytearray, memoryview)
+
+# Failure reason codes returned by reason() and validate_many()
+VALID = 0
+INVALID_FORMAT = 1
+INVALID_LENGTH = 2
+INVALID_CHECKSUM = 3
+
+# REASON_EXCEPTIONS (see __getattr__) maps each INVALID_* code to the stdnum
+# exception validate raises for it
+
+_ASCII_DIGITS = frozenset('0123456789')
+
+# Translation tables mapping ASCII digits to their weighted digit values
+_WEIGHT_1 = bytes.maketrans(b'0123456789', bytes(range(10)))
+_WEIGHT_3 = bytes.maketrans(b'0123456789', bytes(3 * d for d in range(10)))
+
+# Number of codes converted to a digit matrix at a time by validate_many
+BATCH_SIZE = 65536
+
+
+def compact(number):
+    """Convert the number to the minimal representation. This strips the
+    number of any valid separators and removes surrounding whitespace (see
+    stdnum.ean.compact).  A bytes, bytearray or memoryview number is returned
+    as bytes."""
+    if isinstance(number, BYTES_TYPES):
+        return _compact_bytes(number)
+    return ean.compact(number)
 
 
 def validate(number):
     """Checks to see if the number provided is a valid GTIN code.  Will
     validate GTIN-14, GTIN-13 (EAN-13), GTIN-12 (UPC-A), and GTIN-8 (EAN-8)
     codes. This checks the length and the check bit but does not check whether
-    a known GS1 Prefix and company identifier are referenced."""
+    a known GS1 Prefix and company identifier are referenced.
+
+    Returns the compact number: bytes for a bytes, bytearray or memoryview
+    number."""
     number = compact(number)
     if not number.isdigit():
-        raise InvalidFormat()
-    if len(number) not in (14, 13, 12, 8):
-        raise InvalidLength()
-    if calc_check_digit(number[:-1]) != number[-1]:
-        raise InvalidChecksum()
+        raise exceptions.InvalidFormat()
+    if len(number) not in VALID_LENGTHS:
+        raise exceptions.InvalidLength()
+    if not has_valid_check_digit(number):
+        raise exceptions.InvalidChecksum()
     return number
 
 
@@ -31,5 +83,289 @@ def is_valid(number):
     whether a known GS1 Prefix and company identifier are referenced."""
     try:
         return bool(validate(number))
-    except ValidationError:
+    except exceptions.ValidationError:
         return False
+
+
+def is_ascii_digits(value):
+    """Like str.isdigit but only for the ASCII digits 0-9 (bytes.isdigit
+    already is)."""
+    if isinstance(value, str):
+        return value.isdigit() and _ASCII_DIGITS.issuperset(value)
+    return as_bytes(value).isdigit()
+
+
+def as_bytes(value):
+    """Returns a bytes, bytearray or memoryview as something with the bytes
+    methods (a memoryview is copied, the others are returned as they are).
+
+    A memoryview has none of the bytes methods (isdigit, translate, ...) and
+    copying the few bytes of one number costs less than looping over them in
+    Python.  Large buffers are checked without copies by validate_records and
+    lists of numbers by validate_many, which joins them into one buffer."""
+    return bytes(value) if isinstance(value, memoryview) else value
+
+
+def has_valid_check_digit(digits):
+    """Checks the check digit (the last digit) of a string (or bytes) already
+    known to be all digits, e.g., by str.isdigit.  Does no normalization or
+    length checks."""
+    if isinstance(digits, BYTES_TYPES):
+        return _weighted_sum(as_bytes(digits)) % 10 == 0
+    try:
+        data = digits.encode('ascii')
+    except UnicodeEncodeError:
+        # str.isdigit also allows non-ASCII digits; leave those to stdnum
+        return ean.calc_check_digit(digits[:-1]) == digits[-1]
+    return _weighted_sum(data) % 10 == 0
+
+
+def check_digit(body):
+    """Calculates the check digit for a string of ASCII digits that does not
+    yet include it (same as stdnum.ean.calc_check_digit)."""
+    return str(-_weighted_sum(body.encode('ascii') + b'0') % 10)
+
+
+def _weighted_sum(data):
+    """Returns the weighted sum of ASCII digit bytes where the last digit has
+    weight 1, the one before it weight 3, then 1 and so on."""
+    odd = len(data) % 2
+    return (
+        sum(data[odd::2].translate(_WEIGHT_3)) +
+        sum(data[1 - odd::2].translate(_WEIGHT_1))
+    )
+
+
+def _compact_bytes(number):
+    """Removes the separators and surrounding whitespace of a number given
+    as bytes (see stdnum.ean.compact)."""
+    return as_bytes(number).replace(b' ', b'').replace(b'-', b'').strip()
+
+
+def reason(number):
+    """Returns the reason code for the number provided: VALID or the
+    INVALID_* code matching the exception validate would raise."""
+    try:
+        validate(number)
+    except exceptions.InvalidLength:  # a subclass of InvalidFormat
+        return INVALID_LENGTH
+    except exceptions.InvalidFormat:
+        return INVALID_FORMAT
+    except exceptions.InvalidChecksum:
+        return INVALID_CHECKSUM
+    return VALID
+
+
+def validate_many(numbers):
+    """Checks many numbers at once (see validate).
+
+    Args:
+      numbers (sequence or numpy.ndarray): The numbers to check.  The
+          strings of a numpy array are checked as numpy stores them (without
+          trailing NUL characters).
+
+    Returns:
+      (mask, reasons): mask is True for each valid number and reasons holds
+          the reason code (see reason) for each number.  These are numpy
+          arrays (bool and uint8) if numpy is installed, otherwise lists.
+    """
+    if not numpy:
+        reasons = [reason(number) for number in numbers]
+        return [code == VALID for code in reasons], reasons
+
+    if not isinstance(numbers, (list, tuple, numpy.ndarray)):
+        numbers = list(numbers)
+
+    reasons = numpy.empty(len(numbers), dtype=numpy.uint8)
+    for start in range(0, len(numbers), BATCH_SIZE):
+        chunk = numbers[start:start + BATCH_SIZE]
+        reasons[start:start + len(chunk)] = _chunk_reasons(chunk)
+    return reasons == VALID, reasons
+
+
+def is_valid_many(numbers):
+    """Checks many numbers at once (see validate_many) and returns the mask of
+    valid numbers only."""
+    return validate_many(numbers)[0]
+
+
+def validate_records(buffer, width, stride=None, offset=0):
+    """Checks the numbers in the fixed width records of a buffer (see
+    validate), in place: with numpy the records are a view of the buffer
+    and no bytes are copied.
+
+    Args:
+      buffer (bytes-like): E.g., bytes, a bytearray or an mmap.
+      width (int): The size of a number (which may be padded with spaces on
+          either side).
+      stride (int): The size of a record (default width), e.g., width + 1
+          for numbers on lines of their own.
+      offset (int): Where the number starts in each record (the offset of
+          the first record in the buffer).
+
+    Returns:
+      (mask, reasons): As validate_many, for each record.  A last record
+          missing only the bytes after its number counts.
+    """
+    stride = stride or width
+    view = memoryview(buffer).cast('B')
+    count = max(0, (len(view) - offset - width) // stride + 1)
+    if not numpy:
+        reasons = [
+            reason(view[start:start + width])
+            for start in range(offset, offset + count * stride, stride)
+        ]
+        return [code == VALID for code in reasons], reasons
+
+    records = numpy.lib.stride_tricks.as_strided(
+        numpy.frombuffer(view, dtype=numpy.uint8, offset=offset)
+        if count else numpy.empty(0, dtype=numpy.uint8),
+        shape=(count, width), strides=(stride, 1), writeable=False,
+    )
+    filled = records != ord(' ')
+    starts = filled.argmax(axis=1)
+    lengths = numpy.where(
+        filled.any(axis=1), width - starts - filled[:, ::-1].argmax(axis=1), 0
+    )
+    reasons = _matrix_reasons(records, lengths, starts).astype(numpy.uint8)
+    for index in numpy.flatnonzero(reasons == _NOT_PLAIN):
+        start = offset + index * stride
+        reasons[index] = reason(view[start:start + width])
+    return reasons == VALID, reasons
+
+
+def _chunk_reasons(chunk):
+    """ Returns the reason codes for a chunk of numbers as a numpy array. """
+    if isinstance(chunk, numpy.ndarray):
+        if chunk.dtype.kind in 'US':
+            return _string_array_reasons(chunk)
+        chunk = chunk.tolist()
+
+    if all(type(number) is str for number in chunk):
+        return _sequence_reasons(chunk, str)
+    if all(isinstance(number, BYTES_TYPES) for number in chunk):
+        return _bytes_sequence_reasons(chunk)
+
+    return numpy.array([reason(number) for number in chunk], dtype=numpy.uint8)
+
+
+def _sequence_reasons(chunk, dtype):
+    """ Returns the reason codes for a sequence of str numbers.
+
+    numpy drops the trailing NUL characters of the strings it stores, so the
+    numbers that change length in the array are left to validate.  So are
+    the numbers longer than any GTIN, stored empty so that one long value
+    does not widen the whole array.
+    """
+    width = max(VALID_LENGTHS)
+    strings = numpy.array(
+        [number if len(number) <= width else '' for number in chunk],
+        dtype=dtype,
+    )
+    reasons = _string_array_reasons(strings)
+    changed = numpy.char.str_len(strings) != numpy.fromiter(
+        map(len, chunk), dtype=numpy.int64, count=len(chunk)
+    )
+    for index in numpy.flatnonzero(changed):
+        reasons[index] = reason(chunk[index])
+    return reasons
+
+
+def _bytes_sequence_reasons(chunk):
+    """ Returns the reason codes for a sequence of bytes, bytearray and
+    memoryview numbers.
+
+    Their bytes are joined into one buffer (numpy takes a memoryview for a
+    sequence of numbers, not a string) that the digit matrix is gathered
+    from.  Numbers longer than any GTIN are left to validate.
+    """
+    lengths = numpy.fromiter(
+        (memoryview(number).nbytes for number in chunk),
+        dtype=numpy.int64, count=len(chunk),
+    )
+    data = numpy.frombuffer(b''.join(chunk), dtype=numpy.uint8)
+    starts = numpy.cumsum(lengths) - lengths
+    width = max(VALID_LENGTHS)
+    lengths = numpy.where(lengths <= width, lengths, 0)
+    inside = numpy.arange(width) < lengths[:, None]
+    positions = numpy.where(inside, starts[:, None] + numpy.arange(width), 0)
+    chars = numpy.where(inside, data[positions] if len(data) else 0, 0)
+
+    reasons = _matrix_reasons(chars, lengths).astype(numpy.uint8)
+    for index in numpy.flatnonzero(reasons == _NOT_PLAIN):
+        reasons[index] = reason(chunk[index])
+    return reasons
+
+
+def _string_array_reasons(strings):
+    """ Computes the reason codes for a numpy unicode (or bytes) array.
+
+    Rows made only of ASCII digits are checked in one pass over a fixed-width
+    digit matrix (at most as wide as the longest GTIN).  Anything else
+    (separators, whitespace, non-ASCII digits, empty strings, longer rows)
+    is left to validate so results match it exactly.
+    """
+    count = len(strings)
+    reasons = numpy.empty(count, dtype=numpy.uint8)
+    if not count:
+        return reasons
+
+    char_type = numpy.uint32 if strings.dtype.kind == 'U' else numpy.uint8
+    width = strings.dtype.itemsize // numpy.dtype(char_type).itemsize
+    lengths = numpy.char.str_len(strings)
+    chars = numpy.ascontiguousarray(strings).view(char_type).reshape(
+        count, width
+    )[:, :max(VALID_LENGTHS)]
+    lengths = numpy.where(lengths <= chars.shape[1], lengths, 0)
+    reasons[:] = _matrix_reasons(chars, lengths)
+    for index in numpy.flatnonzero(reasons == _NOT_PLAIN):
+        reasons[index] = reason(strings[index].item())
+    return reasons
+
+
+# Marks the rows _matrix_reasons leaves to validate
+_NOT_PLAIN = 255
+
+
+def _matrix_reasons(chars, lengths, starts=0):
+    """ Computes the reason codes for a matrix of character codes (one number
+    per row, its characters in columns starts to starts + lengths).
+
+    Returns _NOT_PLAIN for the rows that are not all ASCII digits.
+    """
+    width = chars.shape[1]
+    columns = numpy.arange(width)
+    ends = starts + lengths
+    inside = (columns >= numpy.reshape(starts, (-1, 1))) & (
+        columns < ends[:, None]
+    )
+    is_digit = (chars >= 48) & (chars <= 57)
+    plain = (is_digit | ~inside).all(axis=1) & (lengths > 0)
+
+    # check digit has weight 1, then alternating 3, 1, ... going left
+    weights = 1 + 2 * ((ends[:, None] - 1 - columns) & 1)
+    digits = numpy.where(inside & is_digit, chars.astype(numpy.int64) - 48, 0)
+    checksum_ok = (digits * weights).sum(axis=1) % 10 == 0
+    length_ok = numpy.isin(lengths, VALID_LENGTHS)
+
+    return numpy.where(
+        plain,
+        numpy.where(
+            length_ok,
+            numpy.where(checksum_ok, VALID, INVALID_CHECKSUM),
+            INVALID_LENGTH,
+        ),
+        _NOT_PLAIN,
+    )
+
+
+def __getattr__(name):
+    if name == 'REASON_EXCEPTIONS':
+        return {
+            INVALID_FORMAT: exceptions.InvalidFormat,
+            INVALID_LENGTH: exceptions.InvalidLength,
+            INVALID_CHECKSUM: exceptions.InvalidChecksum,
+        }
+    raise AttributeError(
+        "module {} has no attribute {}".format(repr(__name__), repr(name))
+    )
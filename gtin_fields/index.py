@@ -0,0 +1,381 @@
+""" Compact in-memory collections of GTINs.
+
+A set of millions of GTIN-14 strings costs 60+ bytes per code in str objects
+alone.  GTINSet keeps the codes as the integers of their GTIN-14 form in one
+sorted array('Q') (8 bytes per code) and answers membership by bisection:
+
+    from gtin_fields.index import GTINSet
+
+    catalog = GTINSet(['042100005264', '4006381333931'])
+    '425261' in catalog  # => True (any form of a code, see normalize_gtin14)
+    catalog.contains_many(codes)  # => a bool for each code
+
+With numpy installed the batch operations (building, contains_many, union
+and difference) run vectorized over the same buffer.
+
+The same sorted array can be saved in an index file (see write_index) that
+GTINIndex memory maps: opening it takes constant time whatever the size of
+the catalog, and every process mapping the file shares the same pages.
+
+Index file format (version 1, little endian):
+
+    header (HEADER_SIZE bytes): MAGIC, version (uint16), flags (uint16),
+        4 reserved bytes, count (uint64), 8 reserved bytes
+    keys: count sorted uint64 (the GTIN-14 codes as integers)
+    payloads (if flags has HAS_PAYLOADS): count uint64, one for each key
+"""
+import heapq
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+
+from gtin_fields import gtin
+from gtin_fields.converters import normalize_gtin14
+from gtin_fields.lazy import LazyModule
+
+exceptions = LazyModule('stdnum.exceptions')
+numpy = LazyModule('numpy', optional=True)
+
+# array typecode of the codes: unsigned 64 bit integers (every GTIN-14 fits)
+TYPECODE = 'Q'
+
+# Index file header (see the module docstring)
+MAGIC = b'GTINIDX\0'
+VERSION = 1
+HEADER = struct.Struct('<8sHH4xQ8x')
+HEADER_SIZE = HEADER.size
+HAS_PAYLOADS = 1
+
+
+def gtin_key(code):
+    """ Returns the integer a code is stored as in a GTINSet.
+
+    Separators and surrounding whitespace are removed first (see
+    gtin.compact), as write_index does.
+
+    Raises:
+      ValueError: If the code is not a GTIN (see normalize_gtin14).
+    """
+    if isinstance(code, gtin.BYTES_TYPES):
+        code = gtin.compact(code).decode('ascii')
+    elif isinstance(code, str):
+        code = gtin.compact(code)
+    return int(normalize_gtin14(code))
+
+
+class GTINSet:
+    """ An immutable set of GTINs stored as a sorted array of integers.
+
+    Codes are normalized to GTIN-14 (see converters.normalize_gtin14) so the
+    GTIN-8, UPC-A, EAN-13, GTIN-14 and UPC-E forms of a code are the same
+    member.  Check digits are not validated.
+
+    Args:
+      codes (iterable): The codes (strings in any GTIN form).
+
+    Raises:
+      ValueError: If one of the codes is not a GTIN.
+    """
+    def __init__(self, codes=()):
+        keys = array(TYPECODE, map(gtin_key, codes))
+        self._keys = _sorted_unique(keys)
+
+    @classmethod
+    def _from_keys(cls, keys):
+        """ Returns a GTINSet of a sorted array of unique keys. """
+        instance = cls.__new__(cls)
+        instance._keys = keys
+        return instance
+
+    @property
+    def nbytes(self):
+        """ The size of the buffer holding the codes. """
+        return self._keys.itemsize * len(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __iter__(self):
+        """ Yields the codes (in their GTIN-14 form) in order. """
+        for key in self._keys:
+            yield str(key).zfill(14)
+
+    def __contains__(self, code):
+        try:
+            key = gtin_key(code)
+        except ValueError:
+            return False
+        return self._has_key(key)
+
+    def contains_many(self, codes):
+        """ Tests many codes for membership at once.
+
+        Returns:
+          (list or numpy.ndarray): A bool for each code (False for anything
+              that is not a GTIN); a numpy array if numpy is installed.
+        """
+        keys = []
+        valid = []
+        for code in codes:
+            try:
+                keys.append(gtin_key(code))
+                valid.append(True)
+            except ValueError:
+                keys.append(0)
+                valid.append(False)
+
+        if not numpy:
+            return [
+                is_valid and self._has_key(key)
+                for key, is_valid in zip(keys, valid)
+            ]
+        found = numpy.isin(
+            numpy.array(keys, dtype=numpy.uint64), self._numpy_keys()
+        )
+        return found & numpy.array(valid, dtype=bool)
+
+    def union(self, other):
+        """ Returns a GTINSet of the codes in either set. """
+        other = _as_gtin_set(other)
+        if numpy:
+            keys = numpy.union1d(self._numpy_keys(), other._numpy_keys())
+            return GTINSet._from_keys(_to_array(keys))
+        return GTINSet._from_keys(_sorted_unique(array(
+            TYPECODE, heapq.merge(self._keys, other._keys)
+        ), presorted=True))
+
+    def difference(self, other):
+        """ Returns a GTINSet of the codes not in other. """
+        other = _as_gtin_set(other)
+        if numpy:
+            keys = numpy.setdiff1d(
+                self._numpy_keys(), other._numpy_keys(), assume_unique=True
+            )
+            return GTINSet._from_keys(_to_array(keys))
+        return GTINSet._from_keys(array(
+            TYPECODE, (key for key in self._keys if not other._has_key(key))
+        ))
+
+    __or__ = union
+    __sub__ = difference
+
+    def __eq__(self, other):
+        if not isinstance(other, GTINSet):
+            return NotImplemented
+        return self._keys == other._keys
+
+    def __repr__(self):
+        return '<{} of {} GTINs>'.format(type(self).__name__, len(self))
+
+    def _numpy_keys(self):
+        """ The keys as a numpy array sharing the buffer. """
+        return numpy.frombuffer(self._keys, dtype=numpy.uint64)
+
+    def _has_key(self, key):
+        keys = self._keys
+        position = bisect_left(keys, key)
+        return position < len(keys) and keys[position] == key
+
+
+class GTINIndex(GTINSet):
+    """ A GTINSet memory mapped from an index file (see write_index).
+
+    Opening only reads the header; the keys (and payloads) are looked up in
+    place, without copying them.  Use it as a context manager or close it.
+
+    Args:
+      path (str): The index file.
+
+    Raises:
+      ValueError: If the file is not a GTIN index (of a known version).
+    """
+    def __init__(self, path):
+        with open(path, 'rb') as handle:
+            self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._keys, self._payloads = self._map()
+        except ValueError:
+            self._mmap.close()
+            raise
+
+    def _map(self):
+        """ Returns views of the keys and payloads of the mapped file. """
+        buffer = self._mmap
+        if len(buffer) < HEADER_SIZE:
+            raise ValueError("Not a GTIN index file")
+        magic, version, flags, count = HEADER.unpack_from(buffer)
+        if magic != MAGIC:
+            raise ValueError("Not a GTIN index file")
+        if version != VERSION:
+            raise ValueError(
+                "Unsupported GTIN index version {}".format(version)
+            )
+        sections = 2 if flags & HAS_PAYLOADS else 1
+        if len(buffer) != HEADER_SIZE + 8 * count * sections:
+            raise ValueError("Truncated GTIN index file")
+
+        view = memoryview(buffer)
+        keys = _uint64s(view[HEADER_SIZE:HEADER_SIZE + 8 * count])
+        payloads = None
+        if flags & HAS_PAYLOADS:
+            payloads = _uint64s(view[HEADER_SIZE + 8 * count:])
+        return keys, payloads
+
+    @property
+    def has_payloads(self):
+        return self._payloads is not None
+
+    def get(self, code, default=None):
+        """ Returns the payload of a code (default if it is not a member).
+
+        Raises:
+          ValueError: If the index has no payloads.
+        """
+        if self._payloads is None:
+            raise ValueError("The GTIN index has no payloads")
+        try:
+            key = gtin_key(code)
+        except ValueError:
+            return default
+        keys = self._keys
+        position = bisect_left(keys, key)
+        if position < len(keys) and keys[position] == key:
+            return self._payloads[position]
+        return default
+
+    def close(self):
+        """ Unmaps the file. """
+        for view in (self._keys, self._payloads):
+            if isinstance(view, memoryview):
+                view.release()
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def write_index(path, items, payloads=False):
+    """ Writes an index file of GTINs (see GTINIndex).
+
+    Each code (str or bytes-like) goes through gtin.validate; the invalid
+    ones are left out and reported.  The codes are collected as 8
+    byte integers (not strings) to be sorted.  The file is written next to
+    path and moved in place, so processes still mapping an older index keep
+    reading it.
+
+    Args:
+      path (str): The file to write.
+      items (iterable): GTIN-8/12/13/14 codes, or (code, payload) pairs if
+          payloads is True (payloads are unsigned 64 bit integers, e.g.,
+          offsets of rows).
+      payloads (bool): Whether to store a payload with each code.  When a
+          code is repeated, the payload of its first occurrence is kept.
+
+    Returns:
+      (count, errors): The number of codes written and a dict mapping the
+          index of each invalid item to its stdnum ValidationError.
+    """
+    keys = array(TYPECODE)
+    values = array(TYPECODE)
+    errors = {}
+    for index, item in enumerate(items):
+        code, payload = item if payloads else (item, None)
+        try:
+            # int() of the digits, str or bytes, is that of their GTIN-14
+            keys.append(int(gtin.validate(code)))
+        except exceptions.ValidationError as error:
+            errors[index] = error
+            continue
+        if payloads:
+            values.append(payload)
+
+    keys, values = _sort_index(keys, values if payloads else None)
+    if sys.byteorder != 'little':  # pragma: no cover
+        keys.byteswap()
+        if values is not None:
+            values.byteswap()
+
+    temporary = '{}.{}.tmp'.format(path, os.getpid())
+    with open(temporary, 'wb') as handle:
+        handle.write(HEADER.pack(
+            MAGIC, VERSION, HAS_PAYLOADS if payloads else 0, len(keys)
+        ))
+        keys.tofile(handle)
+        if values is not None:
+            values.tofile(handle)
+    os.replace(temporary, path)
+    return len(keys), errors
+
+
+def _sort_index(keys, values):
+    """ Sorts the keys (and their values), keeping the first of each key.
+
+    Returns:
+      (keys, values): The arrays (values is None if given None).
+    """
+    if values is None:
+        return _sorted_unique(keys), None
+
+    if numpy:
+        numpy_keys = numpy.frombuffer(keys, dtype=numpy.uint64)
+        order = numpy.argsort(numpy_keys, kind='stable')
+        numpy_keys = numpy_keys[order]
+        first = numpy.ones(len(order), dtype=bool)
+        first[1:] = numpy_keys[1:] != numpy_keys[:-1]
+        numpy_values = numpy.frombuffer(values, dtype=numpy.uint64)
+        return (
+            _to_array(numpy_keys[first]),
+            _to_array(numpy_values[order][first]),
+        )
+
+    unique_keys = array(TYPECODE)
+    unique_values = array(TYPECODE)
+    for position in sorted(range(len(keys)), key=keys.__getitem__):
+        if unique_keys and unique_keys[-1] == keys[position]:
+            continue
+        unique_keys.append(keys[position])
+        unique_values.append(values[position])
+    return unique_keys, unique_values
+
+
+def _uint64s(view):
+    """ Returns a view of little endian uint64s as integers (without copying
+    them on little endian machines). """
+    if sys.byteorder == 'little':
+        return view.cast(TYPECODE)
+    values = array(TYPECODE, view.tobytes())  # pragma: no cover
+    values.byteswap()  # pragma: no cover
+    return values  # pragma: no cover
+
+
+def _as_gtin_set(codes):
+    return codes if isinstance(codes, GTINSet) else GTINSet(codes)
+
+
+def _sorted_unique(keys, presorted=False):
+    """ Returns the array of keys sorted, without duplicates. """
+    if numpy:
+        return _to_array(numpy.unique(numpy.frombuffer(
+            keys, dtype=numpy.uint64
+        )))
+    ordered = keys if presorted else sorted(keys)
+    unique = array(TYPECODE)
+    last = None
+    for key in ordered:
+        if key != last:
+            unique.append(key)
+            last = key
+    return unique
+
+
+def _to_array(keys):
+    """ Copies a numpy array of keys into an array('Q'). """
+    result = array(TYPECODE)
+    result.frombytes(keys.astype(numpy.uint64).tobytes())
+    return result
@@ -0,0 +1,147 @@
+""" Streaming validation and normalization of a column of product codes.
+
+Rows are processed in chunks so memory use stays flat however large the
+input is:
+
+    with open('feed.tsv', newline='') as handle:
+        for row, error in ingest(read_rows(handle).rows, column=2):
+            ...
+"""
+import csv
+import itertools
+from collections import namedtuple
+
+from gtin_fields import converters, validators
+
+# Rows validated per batch
+CHUNK_SIZE = 10000
+
+# Bytes read to detect the dialect and header of a file
+SAMPLE_SIZE = 64 * 1024
+
+# 'gtin' takes any GTIN or UPC-E code and normalizes it to GTIN-14, the
+# other kinds are checked as they are (see validators.KINDS)
+KINDS = ('gtin',) + tuple(validators.KINDS)
+
+Reader = namedtuple('Reader', 'rows dialect header')
+
+
+def read_rows(handle, delimiter=None, header=None):
+    """ Detects the dialect and header of a CSV / TSV file.
+
+    Args:
+      handle (file): A text file opened with newline=''.
+      delimiter (str): The delimiter, detected if None.
+      header (bool): Whether the first row is a header, detected if None.
+
+    Returns:
+      (Reader): rows is a csv.reader over the data rows, dialect the
+          (detected) dialect and header the header row or None.
+    """
+    sample = handle.read(SAMPLE_SIZE)
+    sniffer = csv.Sniffer()
+    if delimiter is None:
+        try:
+            dialect = sniffer.sniff(sample, delimiters=',\t;|')
+        except csv.Error:
+            dialect = csv.excel
+    else:
+        dialect = type('dialect', (csv.excel,), dict(delimiter=delimiter))
+    if header is None:
+        try:
+            header = sniffer.has_header(sample)
+        except csv.Error:
+            header = False
+
+    rows = csv.reader(_lines(sample, handle), dialect)
+    header_row = next(rows, None) if header else None
+    return Reader(rows, dialect, header_row)
+
+
+def _lines(sample, handle):
+    """ Yields the lines of the file including those already sampled. """
+    lines = sample.splitlines(keepends=True)
+    if lines and not lines[-1].endswith(('\n', '\r')):
+        # complete the partial last line of the sample with the rest of it
+        lines[-1] += handle.readline()
+    yield from lines
+    yield from handle
+
+
+def column_index(column, header=None):
+    """ Returns the index of a column given by name (needs the header) or by
+    (0 based) index. """
+    if isinstance(column, int) or str(column).isdigit():
+        return int(column)
+    if header is None or column not in header:
+        raise ValueError("No column named {}".format(repr(column)))
+    return header.index(column)
+
+
+def clean_codes(values, kind='gtin'):
+    """ Validates (and for kind 'gtin' normalizes) a batch of codes.
+
+    Returns:
+      (cleaned, errors): The cleaned values and a dict mapping the index of
+          each invalid value to its error message.
+    """
+    if kind == 'gtin':
+        cleaned = [_normalize_gtin14(value) for value in values]
+        validator = validators.GTIN14Validator
+    else:
+        cleaned = list(values)
+        validator = validators.KINDS[kind]
+    errors = {
+        index: ' '.join(error.messages)
+        for index, error in validator.validate_many(cleaned).items()
+    }
+    return cleaned, errors
+
+
+def _normalize_gtin14(value):
+    try:
+        return converters.normalize_gtin14(value)
+    except ValueError:
+        return value
+
+
+def ingest(rows, column, kind='gtin', chunk_size=CHUNK_SIZE):
+    """ Validates and normalizes one column of a stream of rows.
+
+    Args:
+      rows (iterable): Lists of values (e.g., a csv.reader).
+      column (int): The index of the column holding the codes.
+      kind (str): The kind of code (see KINDS).
+      chunk_size (int): Rows validated per batch.
+
+    Yields:
+      (row, error): In input order.  For valid rows, the row with the code
+          replaced by its cleaned value and None.  For invalid rows, the
+          original row and the error message.
+    """
+    if kind not in KINDS:
+        raise ValueError("Unknown kind {}, use one of {}".format(
+            repr(kind), ', '.join(KINDS)
+        ))
+    rows = iter(rows)
+    while True:
+        chunk = list(itertools.islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield from _ingest_chunk(chunk, column, kind)
+
+
+def _ingest_chunk(chunk, column, kind):
+    values = [
+        row[column].strip() if len(row) > column else None for row in chunk
+    ]
+    cleaned, errors = clean_codes(values, kind)
+    for index, row in enumerate(chunk):
+        if values[index] is None:
+            yield row, "Missing column {}".format(column)
+        elif index in errors:
+            yield row, errors[index]
+        else:
+            row = list(row)
+            row[column] = cleaned[index]
+            yield row, None
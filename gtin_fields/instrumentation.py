@@ -0,0 +1,156 @@
+""" Optional instrumentation of the product code validators.
+
+While enabled, every call of a validator (see
+validators.AlphaNumCodeValidatorBase) is counted by validator and outcome
+(valid, or the reason it failed: type, length, characters or checksum), its
+check is timed into a latency histogram and the validated signal is sent (if
+anything listens):
+
+    from gtin_fields import instrumentation
+
+    instrumentation.enable()
+    ...
+    instrumentation.snapshot()
+    # => {'upca': {'calls': 120, 'valid': 98,
+    #              'invalid': {'length': 2, 'checksum': 20},
+    #              'latency': {'bounds': [...], 'counts': [...], ...}}}
+
+snapshot() returns plain data for any exporter (Prometheus, StatsD, logs)
+to translate.  When disabled (the default) a validator call costs one extra
+comparison.  The batch methods (validate_many, invalid_indexes) and the
+exception-free check/is_valid are not recorded.
+"""
+import threading
+import time
+from bisect import bisect_left
+
+from django.dispatch import Signal
+from gtin_fields import validators
+
+# Upper bounds (seconds) of the latency histogram buckets; a last bucket
+# takes anything slower
+LATENCY_BOUNDS = (
+    1e-6, 2e-6, 5e-6, 1e-5, 2e-5, 5e-5, 1e-4, 2e-4, 5e-4, 1e-3, 1e-2, 1e-1,
+)
+
+# Sent after each validation while enabled, with the arguments validator,
+# value, reason (None if valid) and seconds (the time the check took)
+validated = Signal()
+
+_lock = threading.Lock()
+_stats = {}
+
+
+class ValidatorStats:
+    """ The counts and latency histogram of one validator. """
+
+    def __init__(self):
+        self.calls = 0
+        self.valid = 0
+        self.invalid = {}
+        self.latency_counts = [0] * (len(LATENCY_BOUNDS) + 1)
+        self.latency_sum = 0.0
+
+    def add(self, reason, seconds):
+        self.calls += 1
+        if reason is None:
+            self.valid += 1
+        else:
+            self.invalid[reason] = self.invalid.get(reason, 0) + 1
+        self.latency_counts[bisect_left(LATENCY_BOUNDS, seconds)] += 1
+        self.latency_sum += seconds
+
+    def merge(self, other):
+        """ Adds the counts of another ValidatorStats to these. """
+        self.calls += other.calls
+        self.valid += other.valid
+        for reason, count in other.invalid.items():
+            self.invalid[reason] = self.invalid.get(reason, 0) + count
+        self.latency_counts = [
+            mine + theirs for mine, theirs in zip(
+                self.latency_counts, other.latency_counts
+            )
+        ]
+        self.latency_sum += other.latency_sum
+
+    def as_dict(self):
+        return dict(
+            calls=self.calls,
+            valid=self.valid,
+            invalid=dict(self.invalid),
+            latency=dict(
+                bounds=list(LATENCY_BOUNDS),
+                counts=list(self.latency_counts),
+                sum=self.latency_sum,
+                count=self.calls,
+            ),
+        )
+
+
+def record(validator, value):
+    """ Checks a value with a validator and records it (installed as
+    validators._recorder while enabled).
+
+    Returns:
+      (str): The reason the value is invalid, None if it is valid.
+    """
+    start = time.perf_counter()
+    reason = validator.check(value)
+    seconds = time.perf_counter() - start
+
+    with _lock:
+        stats = _stats.get(validator)
+        if stats is None:
+            stats = _stats[validator] = ValidatorStats()
+        stats.add(reason, seconds)
+
+    if validated.has_listeners():
+        validated.send(
+            sender=type(validator), validator=validator, value=value,
+            reason=reason, seconds=seconds,
+        )
+    return reason
+
+
+def enable():
+    """ Starts recording the validations. """
+    validators._recorder = record
+
+
+def disable():
+    """ Stops recording the validations (what was recorded is kept). """
+    validators._recorder = None
+
+
+def is_enabled():
+    return validators._recorder is not None
+
+
+def reset():
+    """ Forgets everything recorded so far. """
+    with _lock:
+        _stats.clear()
+
+
+def snapshot():
+    """ Returns what was recorded, by validator.
+
+    The validators of validators.KINDS are named by their kind, any other by
+    its class name (validators of the same class are added up).
+
+    Returns:
+      (dict): Maps each validator name to a dict of: calls, valid (the
+          count of valid values), invalid (the count of each failure reason)
+          and latency (a histogram: the counts of the checks that took at
+          most each of bounds seconds, and a last count for anything slower;
+          sum and count of the times).
+    """
+    kinds = {
+        id(validator): kind for kind, validator in validators.KINDS.items()
+    }
+    merged = {}
+    with _lock:
+        for validator, stats in _stats.items():
+            name = kinds.get(id(validator), type(validator).__name__)
+            merged.setdefault(name, ValidatorStats()).merge(stats)
+    return {name: stats.as_dict() for name, stats in merged.items()}
@@ -0,0 +1,125 @@
+""" Code for ISBN checksum validation.
+
+A native version of stdnum.isbn.is_valid: ISBN-10 codes (the last digit may
+be an X) have a mod 11 check digit and ISBN-13 codes are EAN-13 codes with
+the Bookland prefix 978 or 979 (see gtin.has_valid_check_digit).  This checks
+the length, prefix and check digit but not the group and publisher.
+
+is_valid_many checks whole batches of codes at once, with numpy (if
+installed) computing the checksums of all plain digit strings of each length
+in one vectorized pass.
+"""
+from operator import mul
+
+from gtin_fields import gtin
+from gtin_fields.lazy import LazyModule
+
+numpy = LazyModule('numpy', optional=True)
+
+# The prefixes of ISBN-13 codes (only 978 codes have an ISBN-10 form)
+ISBN13_PREFIXES = ('978', '979')
+
+VALID_LENGTHS = (10, 13)
+
+# Weights of the ISBN-10 check digit sum (of the digits without the check
+# digit) and the offset of summing their ASCII codes instead of the digits
+_WEIGHTS_10 = range(1, 10)
+_ASCII_OFFSET_10 = ord('0') * sum(_WEIGHTS_10)
+
+
+def compact(number):
+    """Removes the separators (spaces and dashes) and surrounding whitespace
+    of an ISBN and uppercases it (same as stdnum.isbn.compact)."""
+    number = number.replace(' ', '').replace('-', '').strip().upper()
+    if len(number) == 9:
+        number = '0' + number
+    return number
+
+
+def is_valid(number):
+    """Checks to see if the number provided is a valid ISBN-10 or ISBN-13
+    (same as stdnum.isbn.is_valid, which is False for anything that is not a
+    string)."""
+    if not isinstance(number, str):
+        return False
+    return has_valid_check_digit(compact(number))
+
+
+def has_valid_check_digit(digits):
+    """Checks the length, prefix (of an ISBN-13) and check digit of a compact
+    ISBN, e.g., a string already known to be all digits."""
+    if len(digits) == 10:
+        return (
+            gtin.is_ascii_digits(digits[:-1]) and
+            check_digit10(digits[:-1]) == digits[-1]
+        )
+    if len(digits) == 13:
+        return (
+            digits[:3] in ISBN13_PREFIXES and
+            gtin.is_ascii_digits(digits) and
+            gtin.has_valid_check_digit(digits)
+        )
+    return False
+
+
+def check_digit10(body):
+    """Calculates the ISBN-10 check digit (0-9 or X) for a string of 9 ASCII
+    digits."""
+    check = (
+        sum(map(mul, _WEIGHTS_10, body.encode('ascii'))) - _ASCII_OFFSET_10
+    ) % 11
+    return 'X' if check == 10 else str(check)
+
+
+def is_valid_many(numbers):
+    """Checks many numbers at once (see is_valid).
+
+    Returns:
+      (list or numpy.ndarray): A bool for each number; a numpy array if numpy
+          is installed.
+    """
+    if not numpy:
+        return [is_valid(number) for number in numbers]
+
+    numbers = list(numbers)
+    valid = numpy.zeros(len(numbers), dtype=bool)
+    plain = {length: [] for length in VALID_LENGTHS}
+    for index, number in enumerate(numbers):
+        if (type(number) is str and len(number) in plain and
+                gtin.is_ascii_digits(number)):
+            plain[len(number)].append(index)
+        else:
+            valid[index] = is_valid(number)
+
+    for length, indexes in plain.items():
+        if indexes:
+            digits = numpy.frombuffer(
+                ''.join([numbers[index] for index in indexes]).encode(),
+                dtype=numpy.uint8,
+            ).reshape(len(indexes), length) - ord('0')
+            valid[indexes] = _DIGIT_MATRIX_CHECKS[length](digits)
+    return valid
+
+
+def _isbn10_matrix_valid(digits):
+    """ Checks a matrix of ISBN-10 digits (one code per row): the sum of
+    each digit times its position is a multiple of 11. """
+    weights = numpy.arange(1, 11, dtype=numpy.int64)
+    return digits @ weights % 11 == 0
+
+
+def _isbn13_matrix_valid(digits):
+    """ Checks a matrix of ISBN-13 digits (one code per row): the 978 or 979
+    prefix and the EAN-13 check digit. """
+    weights = numpy.array([1, 3] * 6 + [1], dtype=numpy.int64)
+    prefix_ok = (
+        (digits[:, 0] == 9) & (digits[:, 1] == 7) &
+        ((digits[:, 2] == 8) | (digits[:, 2] == 9))
+    )
+    return prefix_ok & (digits @ weights % 10 == 0)
+
+
+_DIGIT_MATRIX_CHECKS = {
+    10: _isbn10_matrix_valid,
+    13: _isbn13_matrix_valid,
+}
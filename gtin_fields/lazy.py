@@ -0,0 +1,62 @@
+""" Deferred imports of slow to import modules.
+
+Importing stdnum (whose package pulls in much of the standard library) and
+numpy takes far longer than the rest of gtin_fields, and most processes
+(management commands, workers) never touch them.  A LazyModule stands in for
+such a module and imports it on first use:
+
+    ean = LazyModule('stdnum.ean')
+    numpy = LazyModule('numpy', optional=True)
+
+    ean.compact(number)  # imports stdnum.ean
+    if numpy:  # False if numpy is not installed
+        numpy.asarray(values)
+
+Each attribute is looked up once and then kept on the LazyModule, so using
+one costs the same as using the module.  Note that exception classes should
+only be looked up where they are needed (in an except clause or a raise), or
+the import happens right away.
+"""
+import importlib
+
+
+class LazyModule:
+    """ A module imported on first attribute access (or truth test).
+
+    Args:
+      name (str): The name of the module.
+      optional (bool): If the module may be missing: the LazyModule is then
+          false (instead of raising ImportError).
+    """
+    def __init__(self, name, optional=False):
+        self._lazy_name = name
+        self._lazy_optional = optional
+        self._lazy_module = None
+
+    def _load(self):
+        if self._lazy_module is None:
+            try:
+                self._lazy_module = importlib.import_module(self._lazy_name)
+            except ImportError:
+                if not self._lazy_optional:
+                    raise
+                self._lazy_module = False
+        return self._lazy_module
+
+    def __getattr__(self, name):
+        if name.startswith('_lazy_'):
+            raise AttributeError(name)
+        module = self._load()
+        if module is False:
+            raise ImportError("No module named {}".format(
+                repr(self._lazy_name)
+            ))
+        value = getattr(module, name)
+        setattr(self, name, value)
+        return value
+
+    def __bool__(self):
+        return self._load() is not False
+
+    def __repr__(self):
+        return '<LazyModule {}>'.format(repr(self._lazy_name))
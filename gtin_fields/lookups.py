@@ -0,0 +1,57 @@
+""" Custom lookups for the product code fields.
+
+Both compile to predicates an index on the column can serve:
+
+    field__gtin_equivalent=code: any packaging level of the item, as an IN
+        list of the precomputed variants of the code (see
+        ProductCodeFieldMixin.gtin_variants).
+    field__company_prefix=prefix: every code under a GS1 company prefix, as
+        range predicates (see ProductCodeFieldMixin.company_prefix_ranges),
+        each on the codes of the length of its bounds if the column holds
+        codes of several lengths.
+"""
+from django.core.exceptions import EmptyResultSet
+from django.db.models import Lookup
+from django.db.models.functions import Length
+from django.db.models.lookups import In
+
+
+class GTINEquivalent(In):
+    lookup_name = 'gtin_equivalent'
+
+    def get_prep_lookup(self):
+        if hasattr(self.rhs, 'resolve_expression'):
+            raise ValueError("gtin_equivalent needs a code, not an expression")
+        self.rhs = self.lhs.output_field.gtin_variants(self.rhs)
+        return super().get_prep_lookup()
+
+
+class CompanyPrefix(Lookup):
+    lookup_name = 'company_prefix'
+    prepare_rhs = False
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        field = self.lhs.output_field
+        ranges = field.company_prefix_ranges(self.rhs)
+        if not ranges:
+            raise EmptyResultSet
+
+        if field.mixed_lengths:
+            length, length_params = compiler.compile(Length(self.lhs))
+        predicates = []
+        params = []
+        for low, high in ranges:
+            predicate = '{} >= %s'.format(lhs)
+            if field.mixed_lengths:
+                predicate = '{} = %s AND {}'.format(length, predicate)
+                params.extend(length_params)
+                params.append(len(low))
+            params.extend(lhs_params)
+            params.append(field.get_db_prep_value(low, connection))
+            if high is not None:
+                predicate += ' AND {} < %s'.format(lhs)
+                params.extend(lhs_params)
+                params.append(field.get_db_prep_value(high, connection))
+            predicates.append('({})'.format(predicate))
+        return '({})'.format(' OR '.join(predicates)), params
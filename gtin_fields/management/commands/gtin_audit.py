@@ -0,0 +1,149 @@
+""" Audits the product codes stored in the database.
+
+Validates every product code column of the installed models (or of the
+given apps and models) chunk by chunk, in parallel worker processes, and
+writes the invalid values to a CSV report.  Progress is checkpointed after
+each chunk: run the command again to resume an interrupted audit.
+"""
+import csv
+import os
+import time
+from contextlib import closing
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+from gtin_fields import audit
+
+
+class Command(BaseCommand):
+    help = __doc__.strip()
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'labels', nargs='*', metavar='app_label[.ModelName]',
+            help="Only audit these apps or models (default: all)."
+        )
+        parser.add_argument(
+            '--report', '-o', default='gtin_audit.csv',
+            help="File for the invalid values (default: gtin_audit.csv)."
+        )
+        parser.add_argument(
+            '--checkpoint',
+            help="File to save the progress in (default: "
+                 "<report>.checkpoint.json)."
+        )
+        parser.add_argument(
+            '--restart', action='store_true',
+            help="Start over instead of resuming from the checkpoint."
+        )
+        parser.add_argument(
+            '--workers', '-w', type=int, default=os.cpu_count() or 1,
+            help="Worker processes validating the chunks (default: the "
+                 "number of CPUs, 1 validates in this process)."
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=audit.CHUNK_SIZE,
+            help="Rows fetched and validated per chunk."
+        )
+        parser.add_argument(
+            '--include-unmanaged', action='store_true',
+            help="Also audit the models with Meta.managed = False (skipped "
+                 "by default, their tables may not exist)."
+        )
+        parser.add_argument(
+            '--database', default=DEFAULT_DB_ALIAS,
+            help="The database to audit."
+        )
+
+    def handle(self, *args, **options):
+        try:
+            targets = audit.audited_models(options['labels'], unmanaged=True)
+        except LookupError as error:
+            raise CommandError(str(error))
+        if not options['include_unmanaged']:
+            for model, _fields in targets:
+                if not model._meta.managed:
+                    self.stderr.write(
+                        "Skipped unmanaged model {} (use "
+                        "--include-unmanaged)".format(model._meta.label)
+                    )
+            targets = [
+                (model, fields) for model, fields in targets
+                if model._meta.managed
+            ]
+
+        report = options['report']
+        path = options['checkpoint'] or '{}.checkpoint.json'.format(report)
+        if options['restart'] and os.path.exists(path):
+            os.remove(path)
+        try:
+            checkpoint = audit.Checkpoint.load(path)
+            states = [
+                checkpoint.state(
+                    model._meta.label, [field.name for field in fields]
+                )
+                for model, fields in targets
+            ]
+        except ValueError as error:
+            raise CommandError("{} (use --restart)".format(error))
+
+        executor = None
+        if options['workers'] > 1:
+            from concurrent.futures import ProcessPoolExecutor
+            executor = ProcessPoolExecutor(options['workers'])
+
+        start = time.perf_counter()
+        rows = 0
+        try:
+            with self._open_report(report, checkpoint.report_size) as handle:
+                writer = csv.writer(handle)
+                for (model, fields), state in zip(targets, states):
+                    if state['done']:
+                        continue
+                    label = model._meta.label
+                    # closed right away if interrupted, cancelling the
+                    # chunks waiting in the executor
+                    with closing(audit.audit_model(
+                        model, fields, after=state['after'],
+                        chunk_size=options['chunk_size'], executor=executor,
+                        prefetch=2 * options['workers'],
+                        using=options['database'],
+                    )) as chunks:
+                        for chunk in chunks:
+                            for name, pk, value, error in chunk.invalid:
+                                writer.writerow(
+                                    [label, name, pk, value, error]
+                                )
+                            handle.flush()
+                            checkpoint.advance(label, chunk, handle.tell())
+                            checkpoint.save()
+                            rows += chunk.rows
+                    state['done'] = True
+                    checkpoint.save()
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        seconds = time.perf_counter() - start
+        self.stdout.write("{} rows audited in {:.2f}s: {:.0f} rows/s".format(
+            rows, seconds, rows / seconds if seconds else 0,
+        ))
+        for (model, fields), state in zip(targets, states):
+            for name in state['fields']:
+                self.stdout.write("{}.{}: {} invalid of {} rows".format(
+                    model._meta.label, name, state['invalid'][name],
+                    state['rows'],
+                ))
+        self.stdout.write("Invalid values: {}".format(report))
+
+    def _open_report(self, report, size):
+        """ Opens the report to append to what the checkpoint covers, or
+        starts it. """
+        if size and os.path.exists(report):
+            handle = open(report, 'r+', newline='')
+            handle.truncate(size)
+            handle.seek(size)
+            return handle
+        handle = open(report, 'w', newline='')
+        csv.writer(handle).writerow(audit.REPORT_HEADER)
+        return handle
@@ -0,0 +1,103 @@
+""" Validates and normalizes a column of product codes in a CSV / TSV file.
+
+Streams the file so memory stays flat whatever its size, writes the valid
+rows (with normalized codes) and the rejected rows (with an extra error
+column) to separate files and reports the throughput.
+"""
+import csv
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from gtin_fields import ingest
+
+
+class Command(BaseCommand):
+    help = __doc__.strip()
+
+    def add_arguments(self, parser):
+        parser.add_argument('input', help="The CSV or TSV file to read.")
+        parser.add_argument(
+            '--column', '-c', required=True,
+            help="Name (needs a header row) or 0 based index of the column "
+                 "holding the codes."
+        )
+        parser.add_argument(
+            '--kind', '-k', default='gtin', choices=ingest.KINDS,
+            help="The kind of code.  'gtin' (default) takes any GTIN or "
+                 "UPC-E and normalizes it to GTIN-14."
+        )
+        parser.add_argument(
+            '--output', '-o',
+            help="File for the valid rows (default: <input>.valid<ext>)."
+        )
+        parser.add_argument(
+            '--rejects', '-r',
+            help="File for the rejected rows (default: "
+                 "<input>.rejects<ext>)."
+        )
+        parser.add_argument(
+            '--delimiter', '-d',
+            help="Field delimiter (default: detected)."
+        )
+        parser.add_argument(
+            '--header', dest='header', action='store_true', default=None,
+            help="The first row is a header (default: detected)."
+        )
+        parser.add_argument(
+            '--no-header', dest='header', action='store_false',
+            help="The first row is data."
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=ingest.CHUNK_SIZE,
+            help="Rows validated per batch."
+        )
+
+    def handle(self, *args, **options):
+        path = options['input']
+        root, ext = os.path.splitext(path)
+        output = options['output'] or '{}.valid{}'.format(root, ext)
+        rejects = options['rejects'] or '{}.rejects{}'.format(root, ext)
+        delimiter = options['delimiter']
+        if delimiter == '\\t':
+            delimiter = '\t'
+
+        start = time.perf_counter()
+        counts = dict(valid=0, rejected=0)
+        with open(path, newline='') as source, \
+                open(output, 'w', newline='') as valid_file, \
+                open(rejects, 'w', newline='') as rejects_file:
+            reader = ingest.read_rows(
+                source, delimiter=delimiter, header=options['header']
+            )
+            try:
+                column = ingest.column_index(options['column'], reader.header)
+            except ValueError as error:
+                raise CommandError(str(error))
+
+            valid_writer = csv.writer(valid_file, reader.dialect)
+            rejects_writer = csv.writer(rejects_file, reader.dialect)
+            if reader.header is not None:
+                valid_writer.writerow(reader.header)
+                rejects_writer.writerow(reader.header + ['error'])
+
+            for row, error in ingest.ingest(
+                reader.rows, column, options['kind'], options['chunk_size']
+            ):
+                if error is None:
+                    valid_writer.writerow(row)
+                    counts['valid'] += 1
+                else:
+                    rejects_writer.writerow(row + [error])
+                    counts['rejected'] += 1
+
+        seconds = time.perf_counter() - start
+        total = counts['valid'] + counts['rejected']
+        self.stdout.write(
+            "{} rows ({} valid, {} rejected) in {:.2f}s: {:.0f} rows/s".format(
+                total, counts['valid'], counts['rejected'], seconds,
+                total / seconds if seconds else 0,
+            )
+        )
+        self.stdout.write("Valid rows: {}".format(output))
+        self.stdout.write("Rejected rows: {}".format(rejects))
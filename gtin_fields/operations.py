@@ -0,0 +1,111 @@
+""" Migration helpers for product code fields. """
+from django.db import migrations
+
+# Rows copied per query when converting columns
+BATCH_SIZE = 10000
+
+# Values not all digits named by the error of convert_to_integer_field
+REPORTED_VALUES = 10
+
+
+def convert_to_integer_field(app_label, model_name, name, field,
+                             batch_size=BATCH_SIZE):
+    """ Returns the migration operations converting a product code char
+    column (e.g., a GTIN14Field) to an integer one (e.g., a
+    GTIN14IntegerField) while keeping the data.
+
+    A nullable integer column is added next to the char column, the codes
+    are copied over in batches, the char column is dropped and the new one
+    takes its name and final definition.  Empty values become NULL, and
+    the migration fails before converting anything if some values are not
+    all digits (fix or clear those first).  Reversing copies the codes back
+    to a (re-added, so nullable or defaulted) char column.
+
+    Use it in a migration like so:
+
+        operations = convert_to_integer_field(
+            'shop', 'product', 'gtin', GTIN14IntegerField(db_index=True)
+        )
+
+    Args:
+      app_label (str): The app label of the model.
+      model_name (str): The (lower case) model name.
+      name (str): The name of the char field to convert.
+      field: The integer field to end up with.
+      batch_size (int): Rows copied per query.
+    """
+    temporary_name = '{}_as_integer'.format(name)
+    _, _, args, kwargs = field.deconstruct()
+    temporary_field = field.__class__(*args, **dict(
+        kwargs, null=True, db_index=False, unique=False
+    ))
+
+    def forwards(apps, schema_editor):
+        model = apps.get_model(app_label, model_name)
+        _check_digits(model, name, schema_editor.connection.alias)
+        _copy_column(
+            model, name, temporary_name, _to_integer, batch_size,
+            schema_editor.connection.alias,
+        )
+
+    def backwards(apps, schema_editor):
+        model = apps.get_model(app_label, model_name)
+        _copy_column(
+            model, temporary_name, name, _identity, batch_size,
+            schema_editor.connection.alias,
+        )
+
+    return [
+        migrations.AddField(model_name, temporary_name, temporary_field),
+        migrations.RunPython(forwards, backwards),
+        migrations.RemoveField(model_name, name),
+        migrations.RenameField(model_name, temporary_name, name),
+        migrations.AlterField(model_name, name, field),
+    ]
+
+
+def _check_digits(model, name, using):
+    """ Raises a ValueError naming the (first REPORTED_VALUES) values of
+    the column that are neither empty nor all digits. """
+    rows = model._base_manager.db_manager(using).exclude(**{
+        name + '__regex': r'^[0-9]*$',
+    }).exclude(**{name + '__isnull': True}).order_by('pk')
+    count = rows.count()
+    if count:
+        values = rows.values_list('pk', name)[:REPORTED_VALUES]
+        raise ValueError(
+            "Cannot convert {}.{} to integers, {} values are not all digits: "
+            "{}{}".format(
+                model._meta.label, name, count,
+                ', '.join('{!r} (pk {})'.format(v, pk) for pk, v in values),
+                ', ...' if count > REPORTED_VALUES else '',
+            )
+        )
+
+
+def _to_integer(value):
+    if not value:
+        return None
+    return int(value)
+
+
+def _identity(value):
+    return value
+
+
+def _copy_column(model, source, target, convert, batch_size, using):
+    """ Copies (converted) values between two columns in pk ordered batches.
+    """
+    manager = model._base_manager.db_manager(using)
+    last_pk = None
+    while True:
+        rows = manager.order_by('pk')
+        if last_pk is not None:
+            rows = rows.filter(pk__gt=last_pk)
+        rows = list(rows.only('pk', source)[:batch_size])
+        if not rows:
+            return
+        for row in rows:
+            setattr(row, target, convert(getattr(row, source)))
+        manager.bulk_update(rows, [target], batch_size=batch_size)
+        last_pk = rows[-1].pk
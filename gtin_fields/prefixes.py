@@ -0,0 +1,234 @@
+""" Classification of GTINs by their GS1 prefix.
+
+The GS1 prefix (the first digits of a code in its GTIN-13 form) tells which
+GS1 member organisation issued the code, or that it is not a regular trade
+item number at all: restricted circulation numbers (variable measure and
+in-store codes, 02x, 04x and 2xx), coupons (05x, 981-984 and 99x), refund
+receipts, ISBN/ISSN and so on:
+
+    from gtin_fields import prefixes
+
+    prefixes.classify('4006381333931')
+    # => Prefix(prefix='400', type='gs1', region='Germany', restricted=False)
+    prefixes.classify('042100005264').region  # => 'United States'
+    prefixes.is_restricted('2012345678900')  # => True
+
+The prefixes come from the bundled data file data/gs1_prefixes.txt, which is
+compiled on first use into a digit trie (a lookup walks at most
+MAX_PREFIX_LENGTH digits of the code) and, for classify_many, an interval
+table searched for many codes at once (vectorized with numpy if installed).
+
+GTIN-8 codes have their own prefixes: a GTIN-13 starting with five zeros is
+a GTIN-8 (GS1 never issues such GTIN-13s) and is classified by the first
+digits of the GTIN-8.
+"""
+import functools
+import os
+from bisect import bisect_right
+from collections import namedtuple
+
+from gtin_fields.converters import normalize_gtin14
+from gtin_fields.lazy import LazyModule
+
+numpy = LazyModule('numpy', optional=True)
+
+DATA_FILE = os.path.join(
+    os.path.dirname(__file__), 'data', 'gs1_prefixes.txt'
+)
+
+# The classification of a code: prefix is the GS1 prefix matched (the first
+# digits of the code), type one of TYPES, region the country (or area) of
+# the issuing GS1 member organisation (None if there is none) and restricted
+# whether the code is not a globally unique trade item number (see
+# RESTRICTED_TYPES)
+Prefix = namedtuple('Prefix', 'prefix type region restricted')
+
+# The prefix types: GS1 member organisation numbers, restricted circulation
+# numbers, coupons, refund receipts, GS1 Global Office numbers,
+# demonstration codes, serial publications (ISSN), books (ISBN), music
+# (ISMN), GTIN-8 prefixes reserved for future use and prefixes that are not
+# assigned (anything not in the data file)
+TYPES = (
+    'gs1', 'restricted', 'coupon', 'refund', 'global', 'demo', 'issn',
+    'isbn', 'ismn', 'reserved', 'unassigned',
+)
+
+# The types of the codes that are only meaningful within a company or area
+RESTRICTED_TYPES = frozenset(('restricted', 'coupon', 'refund', 'demo'))
+
+# The longest GS1 prefix (the number of digits of a code looked at)
+MAX_PREFIX_LENGTH = 7
+
+UNASSIGNED = ('unassigned', None)
+
+
+def classify(code):
+    """ Classifies a GTIN (or UPC-E) by its GS1 prefix.
+
+    The check digit is not validated.
+
+    Raises:
+      ValueError: If the code is not a GTIN (see
+          converters.normalize_gtin14).
+
+    Returns:
+      (Prefix)
+    """
+    return _classify13(normalize_gtin14(code)[1:])
+
+
+def classify_many(codes):
+    """ Classifies many codes at once (see classify).
+
+    Returns:
+      (list): A Prefix for each code, None for those that are not GTINs.
+    """
+    results = []
+    pending = []  # (position, GTIN-13) of the codes left to the table
+    for position, code in enumerate(codes):
+        try:
+            gtin13 = normalize_gtin14(code)[1:]
+        except ValueError:
+            results.append(None)
+            continue
+        if gtin13.startswith(_GTIN8_LEADER):
+            results.append(_classify_gtin8(gtin13[len(_GTIN8_LEADER):]))
+        else:
+            results.append(None)
+            pending.append((position, gtin13))
+
+    heads = [int(gtin13[:MAX_PREFIX_LENGTH]) for _, gtin13 in pending]
+
+    starts, entries = _tables().intervals
+    if numpy:
+        indexes = numpy.searchsorted(
+            numpy.array(starts, dtype=numpy.int64),
+            numpy.array(heads, dtype=numpy.int64),
+            side='right',
+        ) - 1
+    else:
+        indexes = [bisect_right(starts, head) - 1 for head in heads]
+
+    for (position, gtin13), index in zip(pending, indexes):
+        length, kind, region = entries[index]
+        results[position] = _prefix(gtin13[:length], kind, region)
+    return results
+
+
+def is_restricted(code):
+    """ Returns whether a GTIN is a restricted circulation number, coupon or
+    other code that is not a globally unique trade item number (see
+    RESTRICTED_TYPES).
+
+    Raises:
+      ValueError: If the code is not a GTIN.
+    """
+    return classify(code).restricted
+
+
+def restricted_many(codes):
+    """ Tests many GTINs at once (see is_restricted).
+
+    Returns:
+      (list): A bool for each code (False for anything that is not a GTIN).
+    """
+    return [
+        prefix is not None and prefix.restricted
+        for prefix in classify_many(codes)
+    ]
+
+
+# GTIN-13s starting with these are GTIN-8s
+_GTIN8_LEADER = '00000'
+
+
+def _classify13(gtin13):
+    if gtin13.startswith(_GTIN8_LEADER):
+        return _classify_gtin8(gtin13[len(_GTIN8_LEADER):])
+    return _lookup(_tables().trie13, gtin13)
+
+
+def _classify_gtin8(gtin8):
+    tables = _tables()
+    prefix = _lookup(tables.trie8, gtin8)
+    if prefix.type == 'unassigned':
+        return _lookup(tables.trie13, gtin8)
+    return prefix
+
+
+def _lookup(trie, code):
+    """ Walks the trie along the digits of a code and returns the Prefix of
+    the longest match. """
+    node = trie
+    found = UNASSIGNED
+    length = 0
+    for depth, digit in enumerate(code[:MAX_PREFIX_LENGTH], 1):
+        node = node.get(digit)
+        if node is None:
+            break
+        if None in node:
+            found = node[None]
+            length = depth
+    return _prefix(code[:length], *found)
+
+
+def _prefix(prefix, kind, region):
+    return Prefix(prefix, kind, region, kind in RESTRICTED_TYPES)
+
+
+_Tables = namedtuple('_Tables', 'trie13 trie8 intervals')
+
+
+@functools.lru_cache(maxsize=None)
+def _tables():
+    """ Compiles the data file into the lookup tables (once). """
+    ranges = {'13': [], '8': []}
+    with open(DATA_FILE, encoding='utf-8') as handle:
+        for line in handle:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            scope, first, last, kind, region = line.split(None, 4)
+            ranges[scope].append((
+                first, last, kind, None if region == '-' else region
+            ))
+    trie13 = _build_trie(ranges['13'])
+    return _Tables(
+        trie13, _build_trie(ranges['8']), _intervals(trie13, ranges['13'])
+    )
+
+
+def _build_trie(ranges):
+    """ Returns a trie (nested dicts keyed by digit) of the ranges of
+    prefixes, with the (type, region) of a prefix under the key None. """
+    trie = {}
+    for first, last, kind, region in ranges:
+        for value in range(int(first), int(last) + 1):
+            node = trie
+            for digit in str(value).zfill(len(first)):
+                node = node.setdefault(digit, {})
+            node[None] = (kind, region)
+    return trie
+
+
+def _intervals(trie, ranges):
+    """ Flattens the trie into an interval table over the first
+    MAX_PREFIX_LENGTH digits of the codes.
+
+    Returns:
+      (starts, entries): The sorted starts of the intervals and for each the
+          (prefix length, type, region) of the codes in it.
+    """
+    bounds = {0}
+    for first, last, _kind, _region in ranges:
+        scale = 10 ** (MAX_PREFIX_LENGTH - len(first))
+        bounds.add(int(first) * scale)
+        bounds.add((int(last) + 1) * scale)
+    starts = sorted(
+        bound for bound in bounds if bound < 10 ** MAX_PREFIX_LENGTH
+    )
+    entries = []
+    for start in starts:
+        prefix = _lookup(trie, str(start).zfill(MAX_PREFIX_LENGTH))
+        entries.append((len(prefix.prefix), prefix.type, prefix.region))
+    return starts, entries
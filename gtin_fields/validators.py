@@ -9,14 +9,63 @@ any callable):
     GTIN14Validator (GTIN-14)
     ASINValidator (Amazon Standard Identification Number, possible values)
     ASINStrictValidator (ASIN limiting to currently known patterns)
+    ProductCodeValidator (any of GTIN-8/12/13/14, UPC-E, ISBN or ASIN)
 """
+import functools
 import re
+import warnings
 
+from django.core import validators as django_validators
 from django.core.exceptions import ValidationError
 from django.utils.deconstruct import deconstructible
-from django.utils.translation import ugettext_lazy
-from gtin_fields import gtin
-from stdnum import isbn
+from django.utils.functional import SimpleLazyObject
+from django.utils.translation import gettext_lazy
+from gtin_fields import detect, gtin, isbn, prefixes
+
+# Reasons a value is invalid, as returned by the validators' check method
+# (and used as the code of the ValidationError raised)
+INVALID_TYPE = 'type'
+INVALID_LENGTH = 'length'
+INVALID_CHARACTERS = 'characters'
+INVALID_CHECKSUM = 'checksum'
+INVALID_PREFIX = 'prefix'
+
+# The description of each reason (but INVALID_CHARACTERS, which is the
+# validator's chartype_message)
+PROBLEMS = {
+    INVALID_TYPE: gettext_lazy("Not a string"),
+    INVALID_LENGTH: gettext_lazy("Wrong length"),
+    INVALID_CHECKSUM: gettext_lazy("Failed checksum"),
+    INVALID_PREFIX: gettext_lazy("Restricted circulation or coupon code"),
+}
+
+# Records each call of a validator while instrumentation is enabled (see
+# gtin_fields.instrumentation), None when it is off
+_recorder = None
+
+# The methods validators had before check(): still there (see
+# _deprecated_hook) but no longer called by the validation, so subclasses
+# may not override them
+DEPRECATED_HOOKS = (
+    'validate_type', 'validate_length', 'validate_character_types',
+    'valid_checksum', 'strict_valid_char_types', 'error_msg',
+)
+
+
+def _deprecated_hook(method):
+    """ Marks a method kept for the callers of the validators written before
+    check() (it warns when called). """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        warnings.warn(
+            "{}.{} is deprecated, use check() or is_valid()".format(
+                type(self).__name__, method.__name__
+            ),
+            DeprecationWarning, stacklevel=2,
+        )
+        return method(self, *args, **kwargs)
+    wrapper.deprecated_hook = True
+    return wrapper
 
 
 @deconstructible
@@ -29,39 +78,172 @@ class AlphaNumCodeValidatorBase:
             validated.
         valid_lengths (anything that __contains__): The lengths that are
             valid.
+
+    And optionally:
+
+        value_types (tuple): The types of values that may be valid (default:
+            str only).
     """
-    chartype_message = "Only alpha-numeric characters allowed."
+    message = gettext_lazy("Invalid %(name)s '%(value)s': %(problem)s")
+    chartype_message = gettext_lazy("Only alpha-numeric characters allowed.")
     verbose_object_name = "Product Code"
+    value_types = (str,)
+
+    def __init_subclass__(cls, **kwargs):
+        """ Rejects the subclasses overriding the methods validation no
+        longer calls (see DEPRECATED_HOOKS), whose checks would silently be
+        skipped. """
+        super().__init_subclass__(**kwargs)
+        for name in DEPRECATED_HOOKS:
+            method = cls.__dict__.get(name)
+            if method is not None and not getattr(
+                method, 'deprecated_hook', False
+            ):
+                raise TypeError(
+                    "{}.{} is no longer called by the validation, override "
+                    "check(), has_valid_characters() or has_valid_checksum() "
+                    "instead".format(cls.__name__, name)
+                )
 
     def __call__(self, value):
         """ Validates the given value. """
-        self.validate_type(value)
-        self.validate_length(value)
-        self.validate_character_types(value)
-
+        if _recorder is not None:
+            reason = _recorder(self, value)
+        else:
+            reason = self.check(value)
+        if reason is not None:
+            self.invalid(value, reason)
+
+    def check(self, value):
+        """ Checks the given value without raising.
+
+        Returns:
+          (str): The reason the value is invalid (INVALID_TYPE,
+              INVALID_LENGTH, INVALID_CHARACTERS, ...), None if it is valid.
+        """
+        if not isinstance(value, self.value_types):
+            return INVALID_TYPE
+        if len(value) not in self.valid_lengths:
+            return INVALID_LENGTH
+        if not self.has_valid_characters(value):
+            return INVALID_CHARACTERS
+        return None
+
+    def is_valid(self, value):
+        """ Returns whether the given value is valid (without raising). """
+        return self.check(value) is None
+
+    def validate_many(self, values):
+        """ Validates many values at once without raising.
+
+        Returns:
+          (dict): Maps the index of each invalid value to the
+              ValidationError that calling the validator on it raises.
+        """
+        errors = {}
+        for index in self.invalid_indexes(values):
+            error = self.error(values[index])
+            if error is not None:
+                errors[index] = error
+        return errors
+
+    def error(self, value):
+        """ Returns the ValidationError calling the validator on the given
+        value raises, built from the reason check() gives instead of raised
+        and caught (None if the value is valid). """
+        if type(self).__call__ is not AlphaNumCodeValidatorBase.__call__:
+            # a subclass validating in __call__ itself
+            try:
+                self(value)
+            except ValidationError as error:
+                return error
+            return None
+        reason = self.check(value)
+        if reason is None:
+            return None
+        return self._reason_error(value, reason)
+
+    def invalid_indexes(self, values):
+        """ Returns the indexes of the values that may be invalid.
+
+        validate_many calls the validator on each of these to get the actual
+        error, so subclasses may override this with any quicker screening
+        that never misses an invalid value.
+        """
+        check = self.check
+        return [
+            index for index, value in enumerate(values)
+            if check(value) is not None
+        ]
+
+    def has_valid_characters(self, value):
+        return value.isalnum()
+
+    def invalid(self, value, reason):
+        """ Raises the ValidationError for a value invalid for the given
+        reason (its message is only formatted when it is displayed).
+
+        A reason that is not one of the INVALID_* codes is taken as the
+        description of the problem (deprecated, as invalid was called before
+        check()) and the error has no code.
+        """
+        raise self._reason_error(value, reason)
+
+    def _reason_error(self, value, reason):
+        """ Returns the ValidationError invalid raises. """
+        if reason == INVALID_CHARACTERS:
+            code, problem = reason, self.chartype_message
+        elif reason in PROBLEMS:
+            code, problem = reason, PROBLEMS[reason]
+        else:
+            warnings.warn(
+                "invalid() takes a reason code (e.g., INVALID_CHECKSUM), not "
+                "the description of the problem",
+                DeprecationWarning, stacklevel=3,
+            )
+            code, problem = None, reason
+        return ValidationError(self.message, code=code, params=dict(
+            name=self.verbose_object_name,
+            value=value,
+            problem=problem,
+        ))
+
+    @_deprecated_hook
     def validate_type(self, value):
-        if not isinstance(value, str):
-            self.invalid(value, "Not a string")
+        if not isinstance(value, self.value_types):
+            self.invalid(value, INVALID_TYPE)
 
+    @_deprecated_hook
     def validate_length(self, value):
         if len(value) not in self.valid_lengths:
-            self.invalid(value, "Wrong length")
+            self.invalid(value, INVALID_LENGTH)
 
+    @_deprecated_hook
     def validate_character_types(self, value):
-        if not value.isalnum():
-            self.invalid(value, self.chartype_message)
+        if not self.has_valid_characters(value):
+            self.invalid(value, INVALID_CHARACTERS)
 
+    @_deprecated_hook
     def error_msg(self, value, problem_description):
         return "Invalid {} '{}': {}".format(
-            self.verbose_object_name,
-            value, problem_description
+            self.verbose_object_name, value, problem_description
         )
 
-    def invalid(self, value, problem_description):
-        raise ValidationError(
-            ugettext_lazy(self.error_msg(value, problem_description))
+    def __eq__(self, other):
+        """ Validators of the same class built with the same arguments are
+        equal (e.g., UPCAValidator and the _UPCAValidator() a migration
+        deserializes it to), so fields can drop the duplicates. """
+        if not isinstance(other, AlphaNumCodeValidatorBase):
+            return NotImplemented
+        return (
+            type(self) is type(other) and
+            self.deconstruct() == other.deconstruct()
         )
 
+    def __hash__(self):
+        _path, args, kwargs = self.deconstruct()
+        return hash((type(self), args, tuple(sorted(kwargs.items()))))
+
 
 @deconstructible
 class _ASINValidator(AlphaNumCodeValidatorBase):
@@ -73,20 +255,27 @@ class _ASINValidator(AlphaNumCodeValidatorBase):
     """
     verbose_object_name = "ASIN"
     # valid as of 2017, see http://stackoverflow.com/a/12827734/422075
-    strict_regex = re.compile(r'^B[\dA-Z]{9}|\d{9}(X|\d)$')
-    strict_chartype_message = str(
+    strict_regex = SimpleLazyObject(
+        lambda: re.compile(r'^B[\dA-Z]{9}|\d{9}(X|\d)$')
+    )
+    strict_chartype_message = gettext_lazy(
         "Must start with 'B' and be alphanumeric, "
         "or all digits, or all digits with terminal 'X'"
     )
     valid_lengths = (10,)
 
+    def strict_has_valid_characters(self, value):
+        return self.strict_regex.match(value) is not None
+
+    @_deprecated_hook
     def strict_valid_char_types(self, value):
-        if not self.strict_regex.match(value):
-            self.invalid(value, self.strict_chartype_message)
+        if not self.strict_has_valid_characters(value):
+            self.invalid(value, INVALID_CHARACTERS)
 
     def __init__(self, *args, **kwargs):
         if kwargs.pop('strict', None):
-            self.validate_character_types = self.strict_valid_char_types
+            self.has_valid_characters = self.strict_has_valid_characters
+            self.chartype_message = self.strict_chartype_message
 
         super().__init__(*args, **kwargs)
 
@@ -104,21 +293,93 @@ class GTINValidatorBase(AlphaNumCodeValidatorBase):
             given correct checksum.  Note: to prevent the function from being
             bound to the class you will need to wrap the function with
             staticmethod()!!
-    """
-    chartype_message = "Only numbers allowed."
 
-    def __call__(self, value):
-        """ Validates the given value. """
-        super().__call__(value)
-        self.valid_checksum(value)
+    And optionally:
 
-    def validate_character_types(self, value):
-        if not value.isdigit():
-            self.invalid(value, self.chartype_message)
+        is_valid_digits_checksum (callable): A faster static function used
+            instead of is_valid_checksum for values that are all digits.
+        is_valid_checksum_many (callable): A static function taking a list
+            of all digit values and returning a bool for each (used by
+            validate_many).
 
+    If initialized with allow_restricted=False then GTINs with a restricted
+    circulation, coupon or other GS1 prefix that is not a globally unique
+    trade item number (see prefixes.RESTRICTED_TYPES) are invalid too.
+    """
+    chartype_message = gettext_lazy("Only numbers allowed.")
+    is_valid_digits_checksum = None
+    is_valid_checksum_many = None
+
+    def __init__(self, allow_restricted=True):
+        self.allow_restricted = allow_restricted
+
+    def check(self, value):
+        reason = super().check(value)
+        if reason is None and not self.has_valid_checksum(value):
+            return INVALID_CHECKSUM
+        if reason is None and not self.has_allowed_prefix(value):
+            return INVALID_PREFIX
+        return reason
+
+    def has_allowed_prefix(self, value):
+        """ Checks the GS1 prefix of a value with a valid checksum (any
+        prefix is allowed unless allow_restricted is False). """
+        if self.allow_restricted or len(value) not in gtin.VALID_LENGTHS:
+            return True
+        if isinstance(value, gtin.BYTES_TYPES):
+            value = bytes(value).decode('ascii')
+        try:
+            return not prefixes.is_restricted(value)
+        except ValueError:
+            return True  # not ASCII digits, which have no GS1 prefix
+
+    def has_valid_characters(self, value):
+        return gtin.as_bytes(value).isdigit()
+
+    def invalid_indexes(self, values):
+        """ Screens type, length and characters in one loop and checks the
+        checksums of the remaining values as a batch. """
+        lengths = self.valid_lengths
+        invalid = []
+        candidates = []
+        for index, value in enumerate(values):
+            if (isinstance(value, self.value_types) and
+                    len(value) in lengths and
+                    gtin.as_bytes(value).isdigit()):
+                candidates.append(index)
+            else:
+                invalid.append(index)
+
+        digit_values = [values[index] for index in candidates]
+        if self.is_valid_checksum_many is not None:
+            checksums_ok = self.is_valid_checksum_many(digit_values)
+        else:
+            checksums_ok = map(self.is_valid_checksum, digit_values)
+        passed = []
+        for index, ok in zip(candidates, checksums_ok):
+            (passed if ok else invalid).append(index)
+        if not self.allow_restricted:
+            restricted = prefixes.restricted_many([
+                values[index] if len(values[index]) in gtin.VALID_LENGTHS
+                else '' for index in passed
+            ])
+            invalid.extend(
+                index for index, is_restricted in zip(passed, restricted)
+                if is_restricted
+            )
+        return sorted(invalid)
+
+    @_deprecated_hook
     def valid_checksum(self, value):
-        if not self.is_valid_checksum(value):
-            self.invalid(value, 'Failed checksum')
+        if not self.has_valid_checksum(value):
+            self.invalid(value, INVALID_CHECKSUM)
+
+    def has_valid_checksum(self, value):
+        if self.is_valid_digits_checksum is not None and (
+            gtin.as_bytes(value).isdigit()
+        ):
+            return self.is_valid_digits_checksum(value)
+        return self.is_valid_checksum(value)
 
 
 @deconstructible
@@ -127,6 +388,8 @@ class _ISBNValidator(GTINValidatorBase):
     verbose_object_name = "ISBN"
     valid_lengths = (10, 13)
     is_valid_checksum = staticmethod(isbn.is_valid)
+    is_valid_digits_checksum = staticmethod(isbn.has_valid_check_digit)
+    is_valid_checksum_many = staticmethod(isbn.is_valid_many)
 
 
 @deconstructible
@@ -134,7 +397,10 @@ class _UPCAValidator(GTINValidatorBase):
     """ Check string is a well-formed GTIN-12 / UPC-A code. """
     verbose_object_name = "UPC-A"
     valid_lengths = (12,)
+    value_types = (str,) + gtin.BYTES_TYPES
     is_valid_checksum = staticmethod(gtin.is_valid)
+    is_valid_digits_checksum = staticmethod(gtin.has_valid_check_digit)
+    is_valid_checksum_many = staticmethod(gtin.is_valid_many)
 
 
 @deconstructible
@@ -142,7 +408,10 @@ class _EAN13Validator(GTINValidatorBase):
     """ Check string is a well-formed GTIN-13 / EAN-13 code. """
     verbose_object_name = "EAN-13"
     valid_lengths = (13,)
+    value_types = (str,) + gtin.BYTES_TYPES
     is_valid_checksum = staticmethod(gtin.is_valid)
+    is_valid_digits_checksum = staticmethod(gtin.has_valid_check_digit)
+    is_valid_checksum_many = staticmethod(gtin.is_valid_many)
 
 
 @deconstructible
@@ -150,7 +419,115 @@ class _GTIN14Validator(GTINValidatorBase):
     """ Check string is a well-formed GTIN-14 code. """
     verbose_object_name = "GTIN-14"
     valid_lengths = (14,)
+    value_types = (str,) + gtin.BYTES_TYPES
     is_valid_checksum = staticmethod(gtin.is_valid)
+    is_valid_digits_checksum = staticmethod(gtin.has_valid_check_digit)
+    is_valid_checksum_many = staticmethod(gtin.is_valid_many)
+
+
+@deconstructible
+class _ProductCodeValidator(AlphaNumCodeValidatorBase):
+    """ Check string is any product code detect.identify recognizes (GTIN-8,
+    UPC-E, UPC-A, EAN-13, GTIN-14, ISBN or ASIN). """
+    verbose_object_name = "Product Code"
+    valid_lengths = (8, 10, 12, 13, 14)
+    chartype_message = gettext_lazy(
+        "Only numbers allowed (or alpha-numeric characters for an ASIN)."
+    )
+
+    def check(self, value):
+        reason = super().check(value)
+        if reason is None and not detect.identify(value):
+            return INVALID_CHECKSUM
+        return reason
+
+    def has_valid_characters(self, value):
+        if len(value) == 10:
+            return value.isalnum()
+        return gtin.is_ascii_digits(value)
+
+    def invalid_indexes(self, values):
+        """ Identifies the values as a batch (see detect.identify_many). """
+        return [
+            index for index, types in enumerate(detect.identify_many(values))
+            if not types
+        ]
+
+
+class FusedValidator:
+    """ A field's whole validation in one callable: the primary (product
+    code) validator followed by whatever other validators the primary does
+    not already cover (see fuse).
+
+    Args:
+      primary (AlphaNumCodeValidatorBase): The product code validator.
+      extra (list): The other validators.
+    """
+    def __init__(self, primary, extra=()):
+        self.primary = primary
+        self.extra = list(extra)
+
+    def __call__(self, value):
+        """ Validates the given value, raising all the errors at once like
+        Field.run_validators does. """
+        if not self.extra:
+            return self.primary(value)
+
+        errors = []
+        for validator in [self.primary] + self.extra:
+            try:
+                validator(value)
+            except ValidationError as error:
+                errors.extend(error.error_list)
+        if errors:
+            raise ValidationError(errors)
+
+
+def fuse(primary, validators):
+    """ Fuses a field's validators into one FusedValidator.
+
+    Drops the duplicates of primary and the validators it makes redundant:
+    length limits its valid lengths already satisfy and the null character
+    check (only alphanumerics pass it).
+
+    Args:
+      primary (AlphaNumCodeValidatorBase): The product code validator.
+      validators (list): All the validators of the field (may include
+          primary and FusedValidators).
+
+    Returns:
+      (FusedValidator)
+    """
+    shortest = min(primary.valid_lengths)
+    longest = max(primary.valid_lengths)
+    extra = []
+    for validator in _unfused(validators):
+        if validator == primary or validator in extra:
+            continue
+        if isinstance(validator, django_validators.MaxLengthValidator) and (
+            validator.limit_value >= longest
+        ):
+            continue
+        if isinstance(validator, django_validators.MinLengthValidator) and (
+            validator.limit_value <= shortest
+        ):
+            continue
+        if isinstance(
+            validator, django_validators.ProhibitNullCharactersValidator
+        ):
+            continue
+        extra.append(validator)
+    return FusedValidator(primary, extra)
+
+
+def _unfused(validators):
+    """ Yields the validators with any FusedValidator taken apart. """
+    for validator in validators:
+        if isinstance(validator, FusedValidator):
+            yield validator.primary
+            yield from validator.extra
+        else:
+            yield validator
 
 
 ISBNValidator = _ISBNValidator()
@@ -159,3 +536,15 @@ EAN13Validator = _EAN13Validator()
 GTIN14Validator = _GTIN14Validator()
 ASINValidator = _ASINValidator()
 ASINStrictValidator = _ASINValidator(strict=True)
+ProductCodeValidator = _ProductCodeValidator()
+
+# The validators by the kind of code they check
+KINDS = dict(
+    isbn=ISBNValidator,
+    upca=UPCAValidator,
+    ean13=EAN13Validator,
+    gtin14=GTIN14Validator,
+    asin=ASINValidator,
+    asin_strict=ASINStrictValidator,
+    product_code=ProductCodeValidator,
+)
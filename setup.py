@@ -1,4 +1,4 @@
-from setuptools import setup
+from setuptools import find_packages, setup
 
 setup(
     name='django-gtin-fields',
@@ -43,12 +43,22 @@ setup(
         ),
         'Development Status :: 5 - Production/Stable',
         'Programming Language :: Python',
-        'Programming Language :: Python :: 3'
+        'Programming Language :: Python :: 3',
+        'Programming Language :: Python :: 3 :: Only',
     ],
 
     # Package
-    packages=['gtin_fields'],
-    install_requires=['Django', 'python-stdnum>=1.5'],
+    # gtin_fields.data holds no module, only the GS1 prefix table
+    packages=find_packages(exclude=['tests*', 'benchmarks*']) + [
+        'gtin_fields.data',
+    ],
+    package_data={'gtin_fields.data': ['*.txt']},
+    # asyncio.get_running_loop (see aio) and module __getattr__ (see gtin)
+    # are new in Python 3.7
+    python_requires='>=3.7',
+    # Field.descriptor_class (see ProductCodeField) is new in Django 3.0
+    install_requires=['Django>=3.0', 'python-stdnum>=1.5'],
+    extras_require={'numpy': ['numpy']},
     zip_safe=False,
     include_package_data=True,
 )
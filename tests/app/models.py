@@ -1,6 +1,8 @@
 """ Models for testing. """
 from django.db import models
 from gtin_fields import fields
+from gtin_fields.bulk import ProductCodeQuerySet
+from gtin_fields.functions import check_digit_constraint
 
 NOT_REQUIRED = dict(null=True, blank=True)
 
@@ -11,8 +13,67 @@ class MockProduct(models.Model):
     upca = fields.UPCAField(**NOT_REQUIRED)
     gtin14 = fields.GTIN14Field(**NOT_REQUIRED)
     isbn = fields.ISBNField(**NOT_REQUIRED)
+    isbn13 = fields.ISBNField(normalize='isbn13', **NOT_REQUIRED)
     ean13 = fields.EAN13Field(**NOT_REQUIRED)
+    gtin = fields.GTINField(**NOT_REQUIRED)
+
+    objects = ProductCodeQuerySet.as_manager()
+
+    def save(self, *args, **kwargs):
+        self.full_clean()
+        super().save(*args, **kwargs)
+
+
+class MockIntegerProduct(models.Model):
+    upca = fields.UPCAIntegerField(**NOT_REQUIRED)
+    ean13 = fields.EAN13IntegerField(**NOT_REQUIRED)
+    gtin14 = fields.GTIN14IntegerField(**NOT_REQUIRED)
+
+    objects = ProductCodeQuerySet.as_manager()
 
     def save(self, *args, **kwargs):
         self.full_clean()
         super().save(*args, **kwargs)
+
+
+class IndexedProduct(models.Model):
+    """ Product code columns with indexes for testing query plans. """
+    upca = fields.UPCAField(db_index=True, **NOT_REQUIRED)
+    gtin14 = fields.GTIN14Field(db_index=True, **NOT_REQUIRED)
+    gtin = fields.GTINField(db_index=True, **NOT_REQUIRED)
+    gtin14_int = fields.GTIN14IntegerField(db_index=True, **NOT_REQUIRED)
+
+
+class LegacyProduct(models.Model):
+    """ A model with a char column for testing conversion migrations. """
+    gtin14 = fields.GTIN14Field(**NOT_REQUIRED)
+
+
+class CheckedProduct(models.Model):
+    """ Product code columns with check digit constraints. """
+    upca = fields.UPCAField(**NOT_REQUIRED)
+    ean13 = fields.EAN13Field(**NOT_REQUIRED)
+    gtin = fields.GTINField(**NOT_REQUIRED)
+
+    class Meta:
+        constraints = [
+            check_digit_constraint('upca', 12),
+            check_digit_constraint('ean13', 13, blank=True),
+            check_digit_constraint('gtin', 14),
+        ]
+
+
+class CatalogItem(models.Model):
+    """ A column of mixed product codes with their detected type. """
+    code = fields.ProductCodeField(type_field='code_type', **NOT_REQUIRED)
+    code_type = models.CharField(max_length=6, **NOT_REQUIRED)
+
+
+class UnmanagedProduct(models.Model):
+    """ A model over the table of MockProduct that Django does not
+    manage. """
+    upca = fields.UPCAField(**NOT_REQUIRED)
+
+    class Meta:
+        managed = False
+        db_table = 'app_mockproduct'
@@ -99,4 +99,23 @@ CODES = dict(
             '000000000X',
         ],
     ),
+    GTIN=dict(
+        invalid=[
+            '12345',  # short
+            '010123456000015',  # long
+            '00123456000016',  # checksum error
+            '001234560Y0018',  # bad character
+            '0252614',  # seven digits but not a missing left zero
+        ],
+        # code: canonical GTIN-14
+        valid={
+            '425261': '00042100005264',  # UPC-E
+            '4252614': '00042100005264',  # UPC-E missing its left zero
+            '04252614': '00042100005264',  # UPC-E
+            '73513537': '00000073513537',  # GTIN-8
+            '042100005264': '00042100005264',  # UPC-A
+            '9780471117094': '09780471117094',  # EAN-13
+            '10123456000015': '10123456000015',  # GTIN-14
+        },
+    ),
 )
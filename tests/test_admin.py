@@ -0,0 +1,166 @@
+""" Test the product code search of GTINSearchAdminMixin. """
+from django.contrib.admin import AdminSite, ModelAdmin
+from django.test import RequestFactory, TestCase
+from gtin_fields.admin import GTINSearchAdminMixin, is_ambiguous, search_code
+
+from tests.app.models import (CatalogItem, IndexedProduct, MockIntegerProduct,
+                              MockProduct)
+
+UPCA = '042100005264'
+UPCE = '04252614'
+EAN13 = '0' + UPCA
+GTIN14 = '00' + UPCA
+CASE = '10042100005261'
+ISBN10 = '0765348276'
+ISBN13 = '9780765348272'
+ASIN = 'B00005N5PF'
+DATE = '20231231'  # also a GTIN-8
+
+
+class SearchCodeTest(TestCase):
+
+    def test_gtin(self):
+        for term in (UPCE, UPCA, EAN13, GTIN14, '0421-0000-5264'):
+            self.assertEqual(search_code(term), (GTIN14, None), term)
+
+    def test_isbn_and_asin(self):
+        self.assertEqual(search_code(ISBN10), ('0' + ISBN13, ISBN10))
+        self.assertEqual(search_code('0-7653-4827-6'), ('0' + ISBN13, ISBN10))
+        self.assertEqual(search_code(ASIN.lower()), (None, ASIN))
+
+    def test_free_text(self):
+        for term in ('042100005265', 'strawberry', 'acme', '12345', '1.5',
+                     '425261', '202401', '0425261'):
+            self.assertIsNone(search_code(term), term)
+
+    def test_ambiguous(self):
+        for term in (DATE, '2023-12-31', UPCE, ISBN10, '0-7653-4827-6'):
+            self.assertTrue(is_ambiguous(term), term)
+        for term in (UPCA, EAN13, GTIN14, ISBN13, ASIN, '0421-0000-5264'):
+            self.assertFalse(is_ambiguous(term), term)
+
+
+class GTINSearchAdminMixinTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.product = MockProduct.objects.create(
+            upca=UPCA, isbn=ISBN10, asin=ASIN
+        )
+        cls.other = MockProduct.objects.create(
+            ean13=EAN13, gtin14=CASE, isbn13=ISBN10, asin=ISBN10
+        )
+        cls.integer_product = MockIntegerProduct.objects.create(gtin14=GTIN14)
+        cls.book = CatalogItem.objects.create(code=ISBN10)
+        cls.item = CatalogItem.objects.create(code=ASIN)
+
+    def search(self, model, search_term, **options):
+        admin_class = type('Admin', (GTINSearchAdminMixin, ModelAdmin), dict(
+            dict(search_fields=['id']), **options
+        ))
+        model_admin = admin_class(model, AdminSite())
+        request = RequestFactory().get('/', dict(q=search_term))
+        queryset, may_have_duplicates = model_admin.get_search_results(
+            request, model.objects.all(), search_term
+        )
+        self.assertFalse(may_have_duplicates)
+        return queryset
+
+    def test_any_form(self):
+        for term in (UPCE, UPCA, EAN13, GTIN14):
+            self.assertEqual(
+                set(self.search(MockProduct, term)),
+                {self.product, self.other},
+                term,
+            )
+            self.assertEqual(
+                list(self.search(MockIntegerProduct, term)),
+                [self.integer_product],
+            )
+
+    def test_isbn(self):
+        for term in (ISBN10, ISBN13, '978-0-7653-4827-2'):
+            self.assertEqual(
+                set(self.search(MockProduct, term)),
+                {self.product, self.other},
+                term,
+            )
+            self.assertEqual(
+                list(self.search(CatalogItem, term)), [self.book]
+            )
+
+    def test_asin(self):
+        self.assertEqual(list(self.search(MockProduct, ASIN)), [self.product])
+        self.assertEqual(list(self.search(CatalogItem, ASIN)), [self.item])
+
+    def test_any_code(self):
+        self.assertEqual(
+            set(self.search(MockProduct, '{} {}'.format(CASE, ASIN))),
+            {self.product, self.other},
+        )
+        self.assertFalse(self.search(MockProduct, '00614141000005'))
+
+    def test_gtin_search_fields(self):
+        self.assertEqual(
+            list(self.search(MockProduct, UPCA, gtin_search_fields=['upca'])),
+            [self.product],
+        )
+
+    def test_free_text(self):
+        """ Falls back to the default search for terms that are not codes
+        (and quoted ones). """
+        self.assertEqual(
+            list(self.search(CatalogItem, 'ASI', search_fields=['code_type'])),
+            [self.item],
+        )
+        self.assertFalse(
+            self.search(CatalogItem, '"{}"'.format(ASIN)).exists()
+        )
+        self.assertEqual(
+            list(self.search(MockProduct, '100005', search_fields=['upca'])),
+            [self.product],
+        )
+        self.assertEqual(
+            list(self.search(
+                CatalogItem, '{} isbn'.format(ISBN13),
+                search_fields=['code_type'],
+            )),
+            [self.book],
+        )
+        self.assertFalse(self.search(
+            CatalogItem, '{} asin'.format(ISBN13), search_fields=['code_type']
+        ).exists())
+
+    def test_ambiguous(self):
+        """ Finds the rows with the code or the text for the terms that may
+        be other numbers, such as dates. """
+        dated = MockProduct.objects.create(upca='020231231004')
+        coded = MockProduct.objects.create(gtin=DATE)
+        self.assertEqual(
+            set(self.search(MockProduct, DATE, search_fields=['upca'])),
+            {dated, coded},
+        )
+        self.assertEqual(
+            list(self.search(
+                MockProduct, '2023-12-31', search_fields=['upca']
+            )),
+            [coded],
+        )
+        self.assertEqual(
+            list(self.search(MockProduct, DATE, gtin_search_fields=['upca'],
+                             search_fields=['upca'])),
+            [dated],
+        )
+        self.assertEqual(
+            list(self.search(
+                CatalogItem, '{} isbn'.format(DATE),
+                search_fields=['code_type'],
+            )),
+            [],
+        )
+
+    def test_uses_index(self):
+        plan = self.search(IndexedProduct, UPCA).explain()
+        for column in ('upca', 'gtin14', 'gtin', 'gtin14_int'):
+            self.assertIn('INDEX app_indexedproduct_' + column, plan)
+        self.assertNotIn('SCAN', plan.replace('SCAN CONSTANT ROW', ''))
@@ -0,0 +1,63 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from django.test import SimpleTestCase
+from gtin_fields import aio, ingest
+
+from .product_codes import CODES
+
+
+async def _aiter(values):
+    for value in values:
+        await asyncio.sleep(0)
+        yield value
+
+
+class AsyncValidationTest(SimpleTestCase):
+    """ Test the async batch validation. """
+    values = CODES['UPCA']['valid'] + CODES['UPCA']['invalid']
+
+    async def test_avalidate_many(self):
+        expected = ingest.clean_codes(self.values, 'upca')
+        for values in (self.values, _aiter(self.values)):
+            self.assertEqual(
+                await aio.avalidate_many(values, 'upca', chunk_size=3),
+                expected,
+            )
+
+    async def test_normalizes(self):
+        cleaned, errors = await aio.avalidate_many(['425261', '12345'])
+        self.assertEqual(cleaned, ['00042100005264', '12345'])
+        self.assertEqual(list(errors), [1])
+
+    async def test_executors(self):
+        expected = ingest.clean_codes(self.values, 'upca')
+        for executor_class in (ThreadPoolExecutor, ProcessPoolExecutor):
+            with executor_class(2) as executor:
+                self.assertEqual(
+                    await aio.avalidate_many(
+                        self.values, 'upca', chunk_size=4, executor=executor
+                    ),
+                    expected,
+                )
+
+    async def test_backpressure(self):
+        """ Reads no further ahead than max_pending chunks. """
+        read = []
+
+        async def values():
+            for value in self.values:
+                read.append(value)
+                yield value
+
+        chunks = aio.avalidate_chunks(
+            values(), 'upca', chunk_size=2, max_pending=2
+        )
+        first = await chunks.__anext__()
+        self.assertLessEqual(len(read), 3 * 2)
+        self.assertIn(first.start, (0, 2))
+        await chunks.aclose()
+
+    async def test_unknown_kind(self):
+        with self.assertRaises(ValueError):
+            await aio.avalidate_many([], kind='upce')
@@ -0,0 +1,271 @@
+""" Test the audit of stored product codes. """
+import csv
+import io
+import json
+import os
+import shutil
+import tempfile
+from concurrent.futures import Future, ThreadPoolExecutor
+from unittest import mock
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase
+from gtin_fields import audit
+
+from tests.app.models import (CatalogItem, CheckedProduct, MockIntegerProduct,
+                              MockProduct, UnmanagedProduct)
+
+UPCA = '042100005264'
+BAD_UPCA = '042100005265'
+
+
+class AuditTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        # bulk_create skips the validation of MockProduct.save
+        cls.products = MockProduct.objects.bulk_create([
+            MockProduct(upca=UPCA),
+            MockProduct(upca=BAD_UPCA),
+            MockProduct(upca=UPCA, ean13='12345'),
+            MockProduct(gtin='425261'),
+            MockProduct(upca=BAD_UPCA),
+        ])
+        cls.pks = list(MockProduct.objects.values_list('pk', flat=True))
+        cls.fields = [
+            MockProduct._meta.get_field(name) for name in ('upca', 'ean13')
+        ]
+
+    def test_audited_models(self):
+        models = dict(audit.audited_models(['app']))
+        self.assertIn(MockProduct, models)
+        self.assertIn(MockIntegerProduct, models)
+        self.assertEqual(
+            [field.name for field in models[CatalogItem]], ['code']
+        )
+        self.assertEqual(
+            audit.audited_models(['app.CheckedProduct']),
+            [(CheckedProduct, audit.product_code_fields(CheckedProduct))],
+        )
+        with self.assertRaises(LookupError):
+            audit.audited_models(['app.Unknown'])
+
+    def test_unmanaged_models(self):
+        self.assertNotIn(UnmanagedProduct, dict(audit.audited_models()))
+        self.assertIn(
+            UnmanagedProduct, dict(audit.audited_models(unmanaged=True))
+        )
+
+    def test_stored_form(self):
+        """ Values stored (e.g., with raw SQL) in another form than the
+        field stores are invalid, though they clean to valid values. """
+        product = MockProduct.objects.create()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'UPDATE app_mockproduct SET gtin = %s, isbn13 = %s '
+                'WHERE id = %s', [UPCA, '0765348276', product.pk],
+            )
+        fields = [
+            MockProduct._meta.get_field(name) for name in ('gtin', 'isbn13')
+        ]
+        chunk, = audit.audit_model(MockProduct, fields, after=self.pks[-1])
+        self.assertEqual(chunk.invalid, [
+            ('gtin', product.pk, UPCA,
+             "Invalid GTIN-14 '042100005264': Wrong length"),
+            ('isbn13', product.pk, '0765348276',
+             'Not stored in its normalized form 9780765348272'),
+        ])
+
+    def test_iter_chunks(self):
+        chunks = list(audit.iter_chunks(
+            MockProduct, self.fields, chunk_size=2
+        ))
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 2, 1])
+        self.assertEqual(
+            [row[0] for chunk in chunks for row in chunk], self.pks
+        )
+        self.assertEqual(chunks[0][1], (self.pks[1], BAD_UPCA, None))
+        self.assertEqual(
+            len(list(audit.iter_chunks(
+                MockProduct, self.fields, after=self.pks[2]
+            ))[0]),
+            2,
+        )
+
+    def test_audit_model(self):
+        for executor in (None, ThreadPoolExecutor(2)):
+            chunks = list(audit.audit_model(
+                MockProduct, self.fields, chunk_size=2, executor=executor,
+                prefetch=1,
+            ))
+            self.assertEqual(
+                [(chunk.last_pk, chunk.rows) for chunk in chunks],
+                [(self.pks[1], 2), (self.pks[3], 2), (self.pks[4], 1)],
+            )
+            invalid = [entry for chunk in chunks for entry in chunk.invalid]
+            self.assertEqual(
+                [entry[:3] for entry in invalid],
+                [
+                    ('upca', self.pks[1], BAD_UPCA),
+                    ('ean13', self.pks[2], '12345'),
+                    ('upca', self.pks[4], BAD_UPCA),
+                ],
+            )
+            self.assertIn('checksum', invalid[0][3])
+
+    def test_close_cancels_pending(self):
+        """ Closing the audit early cancels the chunks still queued in the
+        executor. """
+        class Executor:
+            def __init__(self):
+                self.futures = []
+
+            def submit(self, func, *args):
+                future = Future()
+                if not self.futures:
+                    future.set_result(func(*args))
+                self.futures.append(future)
+                return future
+
+        executor = Executor()
+        chunks = audit.audit_model(
+            MockProduct, self.fields, chunk_size=1, executor=executor,
+            prefetch=2,
+        )
+        self.assertEqual(next(chunks).last_pk, self.pks[0])
+        chunks.close()
+        self.assertEqual(
+            [future.cancelled() for future in executor.futures],
+            [False, True, True],
+        )
+
+    def test_integer_fields(self):
+        MockIntegerProduct.objects.bulk_create([
+            MockIntegerProduct(upca=UPCA), MockIntegerProduct(upca=BAD_UPCA),
+        ])
+        fields = audit.product_code_fields(MockIntegerProduct)
+        chunk, = audit.audit_model(MockIntegerProduct, fields)
+        self.assertEqual(
+            [entry[::2] for entry in chunk.invalid], [('upca', BAD_UPCA)]
+        )
+
+
+class CheckpointTest(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.path = os.path.join(self.directory, 'audit.json')
+
+    def test_save_and_load(self):
+        checkpoint = audit.Checkpoint.load(self.path)
+        self.assertEqual(checkpoint.models, {})
+        state = checkpoint.state('app.Product', ['upca'])
+        self.assertIsNone(state['after'])
+        checkpoint.advance('app.Product', audit.ChunkResult(7, 10, [
+            ('upca', 3, BAD_UPCA, 'Failed checksum'),
+        ]), 120)
+        checkpoint.save()
+
+        loaded = audit.Checkpoint.load(self.path)
+        self.assertEqual(loaded.report_size, 120)
+        self.assertEqual(loaded.state('app.Product', ['upca']), dict(
+            fields=['upca'], after=7, rows=10, invalid=dict(upca=1),
+            done=False,
+        ))
+        with self.assertRaises(ValueError):
+            loaded.state('app.Product', ['upca', 'ean13'])
+
+    def test_not_a_checkpoint(self):
+        with open(self.path, 'w') as handle:
+            json.dump([], handle)
+        with self.assertRaises(ValueError):
+            audit.Checkpoint.load(self.path)
+
+
+class AuditCommandTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        MockProduct.objects.bulk_create(
+            [MockProduct(upca=UPCA), MockProduct(upca=BAD_UPCA)] * 3
+        )
+        CatalogItem.objects.bulk_create([
+            CatalogItem(code='junk'), CatalogItem(code='04252614'),
+        ])
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.report = os.path.join(self.directory, 'audit.csv')
+
+    def audit(self, *labels, **options):
+        stdout = io.StringIO()
+        call_command(
+            'gtin_audit', *labels or ('app.MockProduct', 'app.CatalogItem'),
+            report=self.report, chunk_size=4, stdout=stdout,
+            **dict(dict(workers=1), **options)
+        )
+        with open(self.report, newline='') as handle:
+            return stdout.getvalue(), list(csv.reader(handle))
+
+    def test_command(self):
+        output, rows = self.audit(workers=2)
+        self.assertIn('8 rows audited', output)
+        self.assertIn('app.MockProduct.upca: 3 invalid of 6 rows', output)
+        self.assertIn('app.CatalogItem.code: 1 invalid of 2 rows', output)
+        self.assertEqual(rows[0], list(audit.REPORT_HEADER))
+        self.assertEqual(
+            [row[:2] + row[3:4] for row in rows[1:]],
+            [['app.CatalogItem', 'code', 'junk']] +
+            [['app.MockProduct', 'upca', BAD_UPCA]] * 3,
+        )
+
+        # done: a second run resumes with nothing left to audit
+        output, rows_again = self.audit()
+        self.assertIn('0 rows audited', output)
+        self.assertEqual(rows_again, rows)
+
+    def test_resume(self):
+        expected = self.audit()[1]
+        audit_chunk = audit.audit_chunk
+        calls = []
+
+        def interrupted(*args):
+            calls.append(args)
+            if len(calls) == 3:
+                raise KeyboardInterrupt
+            return audit_chunk(*args)
+
+        with mock.patch.object(audit, 'audit_chunk', interrupted):
+            with self.assertRaises(KeyboardInterrupt):
+                self.audit(restart=True)
+        output, rows = self.audit()
+        self.assertIn('2 rows audited', output)
+        self.assertIn('app.MockProduct.upca: 3 invalid of 6 rows', output)
+        self.assertEqual(rows, expected)
+
+    def test_unmanaged(self):
+        stderr = io.StringIO()
+        output, rows = self.audit('app', stderr=stderr)
+        self.assertIn(
+            'Skipped unmanaged model app.UnmanagedProduct', stderr.getvalue()
+        )
+        self.assertNotIn('app.UnmanagedProduct', output)
+
+        output, rows = self.audit(
+            'app.UnmanagedProduct', include_unmanaged=True, restart=True
+        )
+        self.assertIn(
+            'app.UnmanagedProduct.upca: 3 invalid of 6 rows', output
+        )
+
+    def test_errors(self):
+        with self.assertRaises(CommandError):
+            self.audit('app.Unknown')
+        with open(self.report + '.x', 'w') as handle:
+            handle.write('{}')
+        with self.assertRaises(CommandError):
+            self.audit(checkpoint=self.report + '.x')
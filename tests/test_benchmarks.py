@@ -0,0 +1,69 @@
+""" Sanity checks for the benchmark corpora and harness. """
+from django.core.exceptions import ValidationError
+from django.test import SimpleTestCase
+from gtin_fields import converters, validators
+
+from benchmarks import bench_validators
+from benchmarks.corpora import Corpus
+from benchmarks.harness import BENCHMARKS, measure
+
+VALIDATORS = dict(
+    ISBN=validators.ISBNValidator,
+    UPCA=validators.UPCAValidator,
+    EAN13=validators.EAN13Validator,
+    GTIN14=validators.GTIN14Validator,
+    ASIN=validators.ASINValidator,
+)
+
+
+class CorpusTest(SimpleTestCase):
+    corpus = Corpus(size=200)
+
+    def test_valid_codes(self):
+        for kind, validator in VALIDATORS.items():
+            for code in self.corpus.valid(kind):
+                self.assertIsNone(validator(code), code)
+
+    def test_invalid_codes(self):
+        for kind, validator in VALIDATORS.items():
+            for code in self.corpus.invalid(kind):
+                with self.assertRaises(ValidationError, msg=code):
+                    validator(code)
+
+    def test_upce(self):
+        for code in self.corpus.valid('UPCE'):
+            converters.upce_to_upca(code)
+
+    def test_deterministic(self):
+        self.assertEqual(
+            Corpus(size=10).mixed('UPCA'), Corpus(size=10).mixed('UPCA')
+        )
+
+
+class HarnessTest(SimpleTestCase):
+
+    def test_measure(self):
+        def setup(corpus):
+            return (lambda: None), 10, dict(extra=1)
+
+        result = measure(setup, Corpus(size=1), repeat=2)
+        self.assertEqual(result['ops'], 10)
+        self.assertEqual(result['info'], dict(extra=1))
+        self.assertLessEqual(result['best'], result['median'])
+
+    def test_validator_benchmarks(self):
+        """ Sets up and runs each, on a corpus starting with an invalid
+        code too. """
+        corpora = [Corpus(size=20)] + [
+            corpus for corpus in (
+                Corpus(size=20, seed=seed) for seed in range(1, 21)
+            )
+            if not validators.UPCAValidator.is_valid(corpus.mixed('UPCA')[0])
+        ][:1]
+        self.assertEqual(len(corpora), 2)
+        for name, func in BENCHMARKS:
+            if func.__module__ != bench_validators.__name__:
+                continue
+            for corpus in corpora:
+                result = measure(func, corpus, repeat=1)
+                self.assertGreater(result['ops'], 0, name)
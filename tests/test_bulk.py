@@ -0,0 +1,111 @@
+""" Test bulk validation. """
+from unittest import mock
+
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+from gtin_fields.bulk import clean_instances
+
+from tests.app.models import MockProduct
+from tests.product_codes import CODES
+
+KEYS = dict(
+    asin='ASIN',
+    asin_strict='ASIN_strict',
+    upca='UPCA',
+    gtin14='GTIN14',
+    isbn='ISBN',
+    ean13='EAN13',
+)
+
+
+class CleanManyTest(TestCase):
+    """ clean_many must report what clean() raises for each value. """
+
+    def test_clean_many(self):
+        for key, code_key in KEYS.items():
+            field = MockProduct._meta.get_field(key)
+            values = (
+                CODES[code_key]['invalid'] + CODES[code_key]['valid'] +
+                [None, '']
+            )
+            cleaned, errors = field.clean_many(values)
+            self.assertEqual(len(cleaned), len(values))
+            for index, value in enumerate(values):
+                try:
+                    field.clean(value, None)
+                except ValidationError as error:
+                    self.assertEqual(
+                        errors[index].messages, error.messages, value
+                    )
+                else:
+                    self.assertNotIn(index, errors, value)
+
+    def test_errors_from_reasons(self):
+        """ Builds the errors from the reasons values fail (not calling the
+        validators), unless other validators than the primary can fail. """
+        field = MockProduct._meta.get_field('upca').clone()
+        values = ['042100005264', '042100005265', '0421', 'x']
+        with mock.patch.object(
+            field, 'run_validators', side_effect=AssertionError
+        ):
+            cleaned, errors = field.clean_many(values)
+        self.assertEqual(
+            {index: error.code for index, error in errors.items()},
+            {1: 'checksum', 2: 'length', 3: 'length'},
+        )
+
+        def not_on_sale(value):
+            if value.startswith('0421'):
+                raise ValidationError('Not on sale')
+
+        field = field.clone()
+        field.validators.append(not_on_sale)
+        cleaned, errors = field.clean_many(values)
+        self.assertEqual(errors[0].messages, ['Not on sale'])
+        self.assertEqual(len(errors[1].messages), 2)
+
+    def test_not_blank(self):
+        field = MockProduct._meta.get_field('upca').clone()
+        field.blank = field.null = False
+        cleaned, errors = field.clean_many(['', None, '042100005264'])
+        self.assertEqual(sorted(errors), [0, 1])
+
+
+class BulkCreateTest(TestCase):
+
+    def test_clean_instances(self):
+        products = [
+            MockProduct(upca=CODES['UPCA']['valid'][0]),
+            MockProduct(upca=CODES['UPCA']['invalid'][0]),
+            MockProduct(gtin14=CODES['GTIN14']['invalid'][0],
+                        ean13=CODES['EAN13']['invalid'][0]),
+        ]
+        errors = clean_instances(products)
+        self.assertEqual(sorted(errors), [1, 2])
+        self.assertEqual(list(errors[1]), ['upca'])
+        self.assertEqual(sorted(errors[2]), ['ean13', 'gtin14'])
+
+    def test_bulk_create_valid(self):
+        products = [MockProduct(upca=code) for code in (
+            CODES['UPCA']['invalid'] + CODES['UPCA']['valid']
+        )]
+        created, errors = MockProduct.objects.bulk_create_valid(products)
+        self.assertEqual(len(created), len(CODES['UPCA']['valid']))
+        self.assertEqual(len(errors), len(CODES['UPCA']['invalid']))
+        self.assertEqual(
+            MockProduct.objects.count(), len(CODES['UPCA']['valid'])
+        )
+
+    def test_bulk_update_valid(self):
+        product = MockProduct.objects.create(upca=CODES['UPCA']['valid'][0])
+        other = MockProduct.objects.create(upca=CODES['UPCA']['valid'][1])
+        product.upca = CODES['UPCA']['invalid'][0]
+        other.upca = CODES['UPCA']['valid'][2]
+        errors = MockProduct.objects.bulk_update_valid(
+            [product, other], ['upca']
+        )
+        self.assertEqual(list(errors), [0])
+        product.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual(product.upca, CODES['UPCA']['valid'][0])
+        self.assertEqual(other.upca, CODES['UPCA']['valid'][2])
@@ -0,0 +1,130 @@
+from django.core.exceptions import ValidationError
+from django.db.migrations.writer import MigrationWriter
+from django.test import SimpleTestCase
+from gtin_fields import cache, fields, validators
+
+from .product_codes import CODES
+
+
+class CachedValidatorTest(SimpleTestCase):
+    """ Test the LRU caching of a validator. """
+
+    def setUp(self):
+        self.validator = cache.CachedValidator(
+            validators.UPCAValidator, maxsize=2
+        )
+
+    def test_caches_outcomes(self):
+        """ Remembers both passes and failures. """
+        valid = CODES['UPCA']['valid'][0]
+        invalid = CODES['UPCA']['invalid'][0]
+        for _ in range(3):
+            self.assertIsNone(self.validator(valid))
+            with self.assertRaises(ValidationError) as raised:
+                self.validator(invalid)
+            with self.assertRaises(ValidationError) as expected:
+                validators.UPCAValidator(invalid)
+            self.assertEqual(
+                raised.exception.messages, expected.exception.messages
+            )
+        self.assertEqual(self.validator.stats(), dict(
+            hits=4, misses=2, evictions=0, size=2, maxsize=2,
+        ))
+
+    def test_new_error_per_hit(self):
+        """ Raises a new ValidationError on every hit: a caller changing the
+        one it got does not change the next. """
+        invalid = '042100005265'
+        raised = []
+        for _ in range(3):
+            with self.assertRaises(ValidationError) as context:
+                self.validator(invalid)
+            raised.append(context.exception)
+            context.exception.params['value'] = 'changed'
+            context.exception.error_list.append(ValidationError('Another'))
+        self.assertIsNot(raised[1], raised[2])
+        with self.assertRaises(ValidationError) as context:
+            self.validator(invalid)
+        self.assertEqual(context.exception.code, validators.INVALID_CHECKSUM)
+        self.assertEqual(
+            context.exception.messages,
+            ["Invalid UPC-A '042100005265': Failed checksum"],
+        )
+        self.assertEqual(self.validator.stats()['hits'], 3)
+
+    def test_error_list(self):
+        """ Rebuilds the errors of validators raising several at once. """
+        def validator(value):
+            raise ValidationError([
+                ValidationError('Too %(what)s', params=dict(what='short')),
+                ValidationError('Not on sale', code='sale'),
+            ])
+
+        cached = cache.CachedValidator(validator)
+        for _ in range(2):
+            with self.assertRaises(ValidationError) as context:
+                cached('1')
+            self.assertEqual(
+                context.exception.messages, ['Too short', 'Not on sale']
+            )
+            self.assertEqual(context.exception.error_list[1].code, 'sale')
+
+    def test_evicts_least_recently_used(self):
+        """ Evicts the least recently used value when full. """
+        first, second, third = CODES['UPCA']['valid'][:3]
+        self.validator(first)
+        self.validator(second)
+        self.validator(first)
+        self.validator(third)  # evicts second
+        self.validator(first)
+        self.validator(second)
+        stats = self.validator.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (2, 4))
+        self.assertEqual(stats['evictions'], 2)
+
+        self.validator.clear()
+        self.assertEqual(self.validator.stats()['size'], 0)
+        self.assertEqual(self.validator.stats()['hits'], 0)
+
+    def test_unhashable(self):
+        """ Validates values it cannot cache. """
+        with self.assertRaises(ValidationError):
+            self.validator(['042100005264'])
+        self.assertEqual(self.validator.stats()['misses'], 0)
+
+    def test_wraps_validator(self):
+        """ Looks like the wrapped validator to everything else. """
+        self.assertEqual(
+            self.validator.deconstruct(),
+            validators.UPCAValidator.deconstruct(),
+        )
+        self.assertEqual(self.validator, validators.UPCAValidator)
+        self.assertEqual(self.validator.valid_lengths, (12,))
+        self.assertEqual(self.validator.validate_many(['1']).keys(), {0})
+
+
+class CachedFieldTest(SimpleTestCase):
+    """ Test enabling the caching from the settings. """
+
+    def test_disabled_by_default(self):
+        field = fields.UPCAField()
+        self.assertIs(field._primary_validator, validators.UPCAValidator)
+
+    def test_enabled_from_settings(self):
+        uncached = fields.UPCAField()
+        with self.settings(GTIN_FIELDS_VALIDATOR_CACHE_SIZE=16):
+            field = fields.UPCAField()
+            other = fields.UPCAField()
+        self.assertIsInstance(field._primary_validator, cache.CachedValidator)
+        self.assertIs(field._primary_validator, other._primary_validator)
+        self.assertIn(field._primary_validator, field.validators)
+        # migrations are not affected
+        self.assertEqual(
+            MigrationWriter.serialize(field),
+            MigrationWriter.serialize(uncached),
+        )
+
+        field._primary_validator.clear()
+        field.clean(CODES['UPCA']['valid'][0], None)
+        other.clean(CODES['UPCA']['valid'][0], None)
+        self.assertEqual(cache.stats()['upca']['hits'], 1)
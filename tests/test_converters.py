@@ -1,6 +1,8 @@
 from django.test import SimpleTestCase
 from gtin_fields import converters
-from stdnum.exceptions import InvalidChecksum
+from stdnum.exceptions import InvalidChecksum, InvalidComponent
+
+from .product_codes import CODES
 
 
 class ConvertersTest(SimpleTestCase):
@@ -69,3 +71,138 @@ class ConvertersTest(SimpleTestCase):
             converters.upce_to_upca(bad_checksum_upce, validate=False),
             '042100005266'
         )
+
+    def test_upca_to_upce_round_trip(self):
+        """ Compresses UPC-A to UPC-E and back, for every mapping digit. """
+        for map_id in '0123456789':
+            for leader in '01':
+                upce6 = '4{}52{}{}'.format(leader, map_id, map_id)
+                upca = converters.upce_to_upca(upce6)
+                upca = leader + upca[1:-1]
+                upca += converters.gtin.check_digit(upca)
+                upce = converters.upca_to_upce(upca)
+                self.assertEqual(upce[:7], leader + upce6, upca)
+                self.assertEqual(upce[-1], upca[-1])
+                self.assertEqual(converters.upce_to_upca(upce), upca)
+
+    def test_upca_to_upce(self):
+        """ Compresses UPC-A to UPC-E where the zeros allow it. """
+        self.assertEqual(converters.upca_to_upce('042100005264'), '04252614')
+        self.assertEqual(converters.upca_to_upce(42100005264), '04252614')
+        self.assertEqual(converters.upca_to_upce('042526000096'), '04252696')
+        for upca in ('042100015263', '242100005268', '042526100093',
+                     '042526000034'):
+            self.assertIsNone(converters.upca_to_upce(upca), upca)
+
+        with self.assertRaises(InvalidChecksum):
+            converters.upca_to_upce('042100005265')
+        for bad_upca in ('04210000526', '0421000052X4'):
+            with self.assertRaises(ValueError):
+                converters.upca_to_upce(bad_upca)
+
+    def test_many(self):
+        """ Converts many codes between UPC-E and UPC-A at once. """
+        converted, errors = converters.upce_to_upca_many(
+            ['425261', '04252616', '42526']
+        )
+        self.assertEqual(converted, ['042100005264', None, None])
+        self.assertIsInstance(errors[1], InvalidChecksum)
+        self.assertIsInstance(errors[2], ValueError)
+
+        converted, errors = converters.upca_to_upce_many(
+            ['042100005264', '042100015263', '0421']
+        )
+        self.assertEqual(converted, ['04252614', None, None])
+        self.assertEqual(list(errors), [2])
+
+    def test_normalize_gtin14(self):
+        """ Converts GTIN-8/12/13/14 and UPC-E codes to GTIN-14. """
+        for code, gtin14 in CODES['GTIN']['valid'].items():
+            self.assertEqual(converters.normalize_gtin14(code), gtin14)
+
+        # neither a valid GTIN-8 nor UPC-E: left for validation
+        self.assertEqual(
+            converters.normalize_gtin14('04252616'), '00000004252616'
+        )
+
+    def test_normalize_gtin14_bad_values(self):
+        for code in ('12345', '010123456000015', '0252614', '0421X0005264',
+                     ''):
+            with self.assertRaises(ValueError):
+                converters.normalize_gtin14(code)
+
+    def test_convert_many(self):
+        """ Converts many values in order, collecting per-item errors. """
+        values = ['425261', '0252614', '042100005264', '12345', '73513537']
+        for workers in (1, 2):
+            converted, errors = converters.convert_many(
+                values, workers=workers, chunksize=2
+            )
+            self.assertEqual(converted, [
+                '00042100005264', None, '00042100005264', None,
+                '00000073513537',
+            ])
+            self.assertEqual(sorted(errors), [1, 3])
+            self.assertIsInstance(errors[3], ValueError)
+
+    def test_convert_many_upca(self):
+        """ Converts many UPC-E values to UPC-A. """
+        converted, errors = converters.convert_many(
+            ['425261', '04252616', '4252614'], target='upca'
+        )
+        self.assertEqual(converted, ['042100005264', None, '042100005264'])
+        self.assertIsInstance(errors[1], InvalidChecksum)
+
+    def test_convert_many_unknown_target(self):
+        """ Rejects an unknown conversion target. """
+        with self.assertRaises(ValueError):
+            converters.convert_many([], target='isbn')
+
+    def test_isbn10_to_isbn13(self):
+        """ Converts an ISBN-10 (with any check digit) to ISBN-13. """
+        self.assertEqual(
+            converters.isbn10_to_isbn13('0765348276'), '9780765348272'
+        )
+        self.assertEqual(
+            converters.isbn10_to_isbn13('080442957X'), '9780804429573'
+        )
+        self.assertEqual(
+            converters.isbn10_to_isbn13(765348276), '9780765348272'
+        )
+        with self.assertRaises(InvalidChecksum):
+            converters.isbn10_to_isbn13('0765348275')
+        self.assertEqual(
+            converters.isbn10_to_isbn13('0765348275', validate=False),
+            '9780765348272',
+        )
+        for code in ('076534827', '07653482X6', '0-7653-4827-6'):
+            with self.assertRaises(ValueError):
+                converters.isbn10_to_isbn13(code)
+
+    def test_isbn13_to_isbn10(self):
+        """ Converts 978 ISBN-13 codes back, None for 979 codes. """
+        self.assertEqual(
+            converters.isbn13_to_isbn10('9780765348272'), '0765348276'
+        )
+        self.assertEqual(
+            converters.isbn13_to_isbn10('9780804429573'), '080442957X'
+        )
+        self.assertIsNone(converters.isbn13_to_isbn10('9791234567896'))
+        with self.assertRaises(InvalidChecksum):
+            converters.isbn13_to_isbn10('9780765348273')
+        with self.assertRaises(InvalidComponent):
+            converters.isbn13_to_isbn10('4006381333931')
+        with self.assertRaises(ValueError):
+            converters.isbn13_to_isbn10('0765348276')
+
+    def test_convert_many_isbn13(self):
+        """ Normalizes ISBN-10 and ISBN-13 codes to ISBN-13. """
+        converted, errors = converters.convert_many(
+            ['0765348276', '9780765348272', '0765348275', '123'],
+            target='isbn13',
+        )
+        self.assertEqual(
+            converted, ['9780765348272', '9780765348272', None, None]
+        )
+        self.assertIsInstance(errors[2], InvalidChecksum)
+        self.assertIsInstance(errors[3], ValueError)
@@ -0,0 +1,79 @@
+from django.core.exceptions import ValidationError
+from django.test import SimpleTestCase
+from gtin_fields import detect, validators
+
+# (code, types)
+CASES = [
+    ('00042100005264', ('gtin14',)),
+    ('4006381333931', ('ean13',)),
+    ('9780765348272', ('isbn13', 'ean13')),
+    ('042100005264', ('upca',)),
+    ('73513537', ('gtin8',)),
+    ('04252614', ('upce',)),
+    ('0765348276', ('isbn10', 'asin')),
+    ('080442957X', ('isbn10', 'asin')),
+    ('B00005N5PF', ('asin',)),
+    ('0765348275', ('asin',)),  # bad ISBN-10 check digit
+    ('042100005265', ()),
+    ('04252615', ()),
+    ('425261', ()),  # 6 digit UPC-E
+    ('0421-0005264', ()),
+    ('B0-0005N5P', ()),
+    ('', ()),
+    (None, ()),
+    (42100005264, ()),
+]
+
+
+class IdentifyTest(SimpleTestCase):
+
+    def test_identify(self):
+        for code, types in CASES:
+            self.assertEqual(detect.identify(code), types, code)
+
+    def test_identify_many(self):
+        self.assertEqual(
+            detect.identify_many([code for code, _types in CASES]),
+            [types for _code, types in CASES],
+        )
+
+    def test_detect(self):
+        self.assertEqual(detect.detect('9780765348272'), 'isbn13')
+        self.assertIsNone(detect.detect('042100005265'))
+
+    def test_normalize(self):
+        self.assertEqual(
+            detect.normalize('04252614'), ('00042100005264', 'upce')
+        )
+        self.assertEqual(
+            detect.normalize('0765348276'), ('09780765348272', 'isbn10')
+        )
+        self.assertEqual(
+            detect.normalize('B00005N5PF'), ('B00005N5PF', 'asin')
+        )
+        with self.assertRaises(ValueError):
+            detect.normalize('042100005265')
+
+
+class ProductCodeValidatorTest(SimpleTestCase):
+
+    def test_validator(self):
+        validator = validators.ProductCodeValidator
+        for code, types in CASES:
+            self.assertEqual(validator.is_valid(code), bool(types), code)
+        self.assertEqual(
+            validator.check('042100005265'), validators.INVALID_CHECKSUM
+        )
+        self.assertEqual(
+            validator.check('04210000526A'), validators.INVALID_CHARACTERS
+        )
+        with self.assertRaises(ValidationError):
+            validator('0421-0005264')
+
+    def test_validate_many(self):
+        codes = [code for code, _types in CASES]
+        self.assertEqual(
+            sorted(validators.ProductCodeValidator.validate_many(codes)),
+            [index for index, (_code, types) in enumerate(CASES)
+             if not types],
+        )
@@ -1,10 +1,16 @@
 """ Test fields. """
 from itertools import zip_longest
+from unittest import mock
 
 from django.core.exceptions import ValidationError
+from django.core.validators import BaseValidator
+from django.db import connection, models
+from django.db.migrations.writer import MigrationWriter
 from django.test import TestCase
+from django.test.utils import isolate_apps
+from gtin_fields import fields, validators
 
-from tests.app.models import MockProduct
+from tests.app.models import CatalogItem, MockIntegerProduct, MockProduct
 from tests.product_codes import CODES
 
 
@@ -15,13 +21,16 @@ class FieldTestMixin:
 
         self.codes (dict): A dict with 'valid' and 'invalid' keys, each with an
             iterable of valid and invalid codes.
+        self.model (Model): The model to test (default: MockProduct).
         self.key (str): The key for assigning the value on MockProduct (e.g.,
             'isbn')
     """
+    model = MockProduct
+
     def test_full_clean(self):
         """ Should not raise an error. """
         for code in self.codes['valid']:
-            product = MockProduct(**{self.key: code})
+            product = self.model(**{self.key: code})
             product.full_clean()
 
         # assert to indicate that valid codes were in fact tested
@@ -31,18 +40,18 @@ class FieldTestMixin:
         """ Should raise a ValidationError. """
         for code in self.codes['invalid']:
             with self.assertRaises(ValidationError):
-                product = MockProduct(**{self.key: code})
+                product = self.model(**{self.key: code})
                 product.full_clean()
 
     def test_saving(self):
         """ Can save all valid objects to the db. """
         for code in self.codes['valid']:
-            product = MockProduct(**{self.key: code})
+            product = self.model(**{self.key: code})
             product.full_clean()
             product.save()
 
         for (code, obj) in zip_longest(
-            self.codes['valid'], MockProduct.objects.all()
+            self.codes['valid'], self.model.objects.all()
         ):
             self.assertEqual(getattr(obj, self.key), code)
 
@@ -72,6 +81,287 @@ class ISBNFieldTest(FieldTestMixin, TestCase):
     codes = CODES['ISBN']
 
 
+class ProductCodeFieldTest(TestCase):
+    """ Test the ProductCodeField and its type field. """
+
+    def test_full_clean(self):
+        for code, normalized, code_type in (
+            ('04252614', '00042100005264', 'upce'),
+            ('042100005264', '00042100005264', 'upca'),
+            ('0765348276', '09780765348272', 'isbn10'),
+            ('B00005N5PF', 'B00005N5PF', 'asin'),
+        ):
+            item = CatalogItem(code=code)
+            self.assertEqual(item.code_type, code_type)
+            item.full_clean()
+            self.assertEqual(item.code, normalized)
+            self.assertEqual(item.code_type, code_type)
+
+    def test_full_clean_on_invalid(self):
+        for code in ('042100005265', '425261', 'B0-0005N5P'):
+            item = CatalogItem(code=code)
+            self.assertIsNone(item.code_type)
+            with self.assertRaises(ValidationError):
+                item.full_clean()
+
+    def test_saving(self):
+        """ Keeps the detected type of the code as given. """
+        CatalogItem.objects.create(code='04252614')
+        item = CatalogItem.objects.get()
+        self.assertEqual(
+            (item.code, item.code_type), ('00042100005264', 'upce')
+        )
+        item.save()
+        self.assertEqual(CatalogItem.objects.get().code_type, 'upce')
+
+    def test_assigning(self):
+        """ Assigning a different code updates the type. """
+        item = CatalogItem(code='04252614')
+        item.code = '00042100005264'  # the same item
+        self.assertEqual(item.code_type, 'upce')
+        item.code = '4006381333931'
+        self.assertEqual(item.code_type, 'ean13')
+        item.code = None
+        self.assertIsNone(item.code_type)
+
+        item = CatalogItem()
+        item.code = 'B00005N5PF'
+        self.assertEqual(item.code_type, 'asin')
+
+    def test_lookups(self):
+        """ Every form of a code matches the stored one. """
+        CatalogItem.objects.create(code='0765348276')
+        for code in ('0765348276', '9780765348272', '09780765348272'):
+            self.assertEqual(
+                CatalogItem.objects.filter(code=code).count(), 1, code
+            )
+
+    def test_deferred_type(self):
+        CatalogItem.objects.create(code='04252614')
+        item = CatalogItem.objects.defer('code_type').get()
+        self.assertEqual(item.code, '00042100005264')
+        self.assertEqual(item.code_type, 'upce')
+
+    def test_deconstruct(self):
+        field = CatalogItem._meta.get_field('code')
+        self.assertEqual(field.deconstruct()[3]['type_field'], 'code_type')
+
+
+class ISBN13FieldTest(TestCase):
+    """ Test an ISBNField with normalize='isbn13'. """
+
+    def test_full_clean(self):
+        for code, isbn13 in (('0765348276', '9780765348272'),
+                             ('9780765348272', '9780765348272'),
+                             ('080442957X', '9780804429573')):
+            product = MockProduct(isbn13=code)
+            product.full_clean()
+            self.assertEqual(product.isbn13, isbn13)
+
+    def test_full_clean_on_invalid(self):
+        for code in CODES['ISBN']['invalid']:
+            with self.assertRaises(ValidationError):
+                MockProduct(isbn13=code).full_clean()
+
+    def test_saving(self):
+        """ Saves the ISBN-13 even without full_clean(). """
+        product = MockProduct(isbn13='0765348276')
+        super(MockProduct, product).save()
+        self.assertEqual(product.isbn13, '9780765348272')
+        self.assertEqual(
+            MockProduct.objects.get().isbn13, '9780765348272'
+        )
+
+    def test_lookups(self):
+        """ Both forms of an ISBN match the stored ISBN-13. """
+        MockProduct.objects.create(isbn13='9780765348272')
+        for code in ('0765348276', '9780765348272'):
+            self.assertEqual(
+                MockProduct.objects.filter(isbn13=code).count(), 1, code
+            )
+
+    def test_deconstruct(self):
+        field = MockProduct._meta.get_field('isbn13')
+        self.assertEqual(field.deconstruct()[3]['normalize'], 'isbn13')
+        self.assertNotIn(
+            'normalize',
+            MockProduct._meta.get_field('isbn').deconstruct()[3],
+        )
+
+    def test_unknown_normalize(self):
+        with self.assertRaises(ValueError):
+            fields.ISBNField(normalize='isbn10')
+
+
 class EAN13FieldTest(FieldTestMixin, TestCase):
     key = 'ean13'
     codes = CODES['EAN13']
+
+
+class GTINFieldTest(TestCase):
+    codes = CODES['GTIN']
+
+    def test_full_clean(self):
+        for code, gtin14 in self.codes['valid'].items():
+            product = MockProduct(gtin=code)
+            product.full_clean()
+            self.assertEqual(product.gtin, gtin14)
+
+    def test_full_clean_on_invalid(self):
+        for code in self.codes['invalid']:
+            with self.assertRaises(ValidationError):
+                MockProduct(gtin=code).full_clean()
+
+    def test_saving(self):
+        """ Saves the canonical form even without full_clean(). """
+        for code, gtin14 in self.codes['valid'].items():
+            product = MockProduct(gtin=code)
+            super(MockProduct, product).save()
+            self.assertEqual(product.gtin, gtin14)
+        self.assertEqual(
+            set(MockProduct.objects.values_list('gtin', flat=True)),
+            set(self.codes['valid'].values()),
+        )
+
+    def test_lookups(self):
+        """ All forms of a code match the stored GTIN-14. """
+        MockProduct.objects.create(gtin='042100005264')
+        for code in ('425261', '04252614', '042100005264', '0042100005264',
+                     '00042100005264'):
+            self.assertEqual(
+                MockProduct.objects.filter(gtin=code).count(), 1, code
+            )
+        self.assertEqual(
+            MockProduct.objects.filter(
+                gtin__in=['425261', '73513537']
+            ).count(),
+            1,
+        )
+
+
+class UPCAIntegerFieldTest(FieldTestMixin, TestCase):
+    model = MockIntegerProduct
+    key = 'upca'
+    codes = CODES['UPCA']
+
+
+class EAN13IntegerFieldTest(FieldTestMixin, TestCase):
+    model = MockIntegerProduct
+    key = 'ean13'
+    codes = CODES['EAN13']
+
+
+class GTIN14IntegerFieldTest(FieldTestMixin, TestCase):
+    model = MockIntegerProduct
+    key = 'gtin14'
+    codes = CODES['GTIN14']
+
+    def test_lookup(self):
+        MockIntegerProduct.objects.create(gtin14='00123456000018')
+        product = MockIntegerProduct.objects.get(gtin14='00123456000018')
+        self.assertEqual(product.gtin14, '00123456000018')
+        self.assertEqual(
+            MockIntegerProduct.objects.filter(gtin14=123456000018).count(), 1
+        )
+
+    def test_stored_as_integer(self):
+        MockIntegerProduct.objects.create(gtin14='00123456000018')
+        self.assertEqual(
+            MockIntegerProduct.objects.values_list('gtin14', flat=True).get(),
+            '00123456000018',
+        )
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT gtin14 FROM app_mockintegerproduct')
+            self.assertEqual(cursor.fetchone()[0], 123456000018)
+
+    def test_integer_value(self):
+        product = MockIntegerProduct(gtin14=123456000018)
+        product.full_clean()
+        self.assertEqual(product.gtin14, '00123456000018')
+
+
+class FusedValidationTest(TestCase):
+    """ Each clean checks a value once, with no duplicate validators. """
+
+    def count_validation(self, clean, value):
+        """ Returns how many times clean(value) checks the code and calls
+        Django's limit (length) validators. """
+        with mock.patch.object(
+            validators.GTINValidatorBase, 'check', autospec=True,
+            side_effect=validators.GTINValidatorBase.check,
+        ) as check, mock.patch.object(
+            BaseValidator, '__call__', autospec=True,
+            side_effect=BaseValidator.__call__,
+        ) as limit:
+            try:
+                clean(value)
+            except ValidationError:
+                pass
+        return check.call_count, limit.call_count
+
+    def test_one_pass(self):
+        for model, name in ((MockProduct, 'upca'), (MockProduct, 'gtin'),
+                            (MockIntegerProduct, 'upca')):
+            field = model._meta.get_field(name)
+            formfield = field.formfield()
+            self.assertEqual(len(field.validators), 1)
+            self.assertEqual(len(formfield.validators), 1)
+            for value in ('042100005264', '042100005265', '0421'):
+                self.assertEqual(
+                    self.count_validation(
+                        lambda value: field.clean(value, None), value
+                    ),
+                    (1, 0),
+                )
+                self.assertEqual(
+                    self.count_validation(formfield.clean, value), (1, 0)
+                )
+
+    @isolate_apps('tests.app')
+    def test_extra_validators(self):
+        """ Keeps the validators the product code validator does not
+        cover. """
+        class ShortProduct(models.Model):
+            upca = fields.UPCAField(max_length=11)
+
+            class Meta:
+                app_label = 'app'
+
+        field = ShortProduct._meta.get_field('upca')
+        self.assertEqual(len(field.validators[0].extra), 1)
+        with self.assertRaises(ValidationError) as raised:
+            field.clean('042100005264', None)
+        self.assertEqual(len(raised.exception.messages), 1)
+
+    def test_deconstruct(self):
+        """ A field rebuilt from deconstruct() has its validator once. """
+        field = MockProduct._meta.get_field('upca')
+        name, path, args, kwargs = field.deconstruct()
+        rebuilt = fields.UPCAField(*args, **kwargs)
+        self.assertEqual(rebuilt._validators, [validators.UPCAValidator])
+        self.assertEqual(rebuilt.deconstruct()[1:], field.deconstruct()[1:])
+
+    @isolate_apps('tests.app')
+    def test_migration_round_trip(self):
+        """ A field rebuilt from its serialized form in a migration (with
+        new validator instances) still checks a value once. """
+        for name in ('upca', 'gtin'):
+            field = MockProduct._meta.get_field(name)
+            source, imports = MigrationWriter.serialize(field)
+            namespace = {}
+            exec('\n'.join(imports), namespace)
+            rebuilt = eval(source, namespace)
+            self.assertIn('validators=[gtin_fields.validators._', source)
+            self.assertEqual(
+                rebuilt._validators, [field._primary_validator]
+            )
+
+            model = type('Rebuilt' + name, (models.Model,), dict(
+                __module__=__name__, Meta=type('Meta', (), dict(
+                    app_label='app'
+                )), code=rebuilt,
+            ))
+            for value in ('042100005264', '042100005265'):
+                self.assertEqual(self.count_validation(
+                    lambda value: model(code=value).full_clean(), value
+                ), (1, 0))
@@ -2,7 +2,7 @@
 from django.forms import ModelForm
 from django.test import TestCase
 
-from tests.app.models import MockProduct
+from tests.app.models import MockIntegerProduct, MockProduct
 from tests.product_codes import CODES
 
 
@@ -69,3 +69,47 @@ class ASINFormTest(TestCase, FormTestMixin):
 class ASINStrictFormTest(TestCase, FormTestMixin):
     code = CODES['ASIN_strict']
     key = 'asin_strict'
+
+
+class GTINFormTest(TestCase):
+
+    def test_form_valid(self):
+        for code, gtin14 in CODES['GTIN']['valid'].items():
+            form = ProductForm({'gtin': code})
+            self.assertEqual(form.errors, {})
+            self.assertEqual(form.cleaned_data['gtin'], gtin14)
+            self.assertEqual(form.save().gtin, gtin14)
+
+    def test_form_invalid(self):
+        for code in CODES['GTIN']['invalid']:
+            form = ProductForm({'gtin': code})
+            self.assertTrue('gtin' in form.errors)
+
+
+class IntegerProductForm(ModelForm):
+    class Meta:
+        model = MockIntegerProduct
+        exclude = []
+
+
+class IntegerFormTest(TestCase):
+    """ Integer backed fields use the same string based form fields. """
+
+    def test_form_valid(self):
+        for key, code_key in (('upca', 'UPCA'), ('gtin14', 'GTIN14')):
+            for code in CODES[code_key]['valid']:
+                form = IntegerProductForm({key: code})
+                self.assertEqual(form.errors, {})
+                self.assertEqual(form.cleaned_data[key], code)
+                self.assertEqual(getattr(form.save(), key), code)
+
+    def test_form_invalid(self):
+        for key, code_key in (('upca', 'UPCA'), ('gtin14', 'GTIN14')):
+            for code in CODES[code_key]['invalid']:
+                form = IntegerProductForm({key: code})
+                self.assertTrue(key in form.errors)
+
+    def test_initial(self):
+        product = MockIntegerProduct.objects.create(gtin14='00123456000018')
+        form = IntegerProductForm(instance=product)
+        self.assertIn('value="00123456000018"', str(form['gtin14']))
@@ -0,0 +1,73 @@
+from django.db import IntegrityError, transaction
+from django.db.models.functions import Right
+from django.test import TestCase
+from gtin_fields import functions
+from gtin_fields.functions import GTINCheckDigit
+
+from tests.app.models import CheckedProduct, MockIntegerProduct, MockProduct
+from tests.product_codes import CODES
+
+
+class GTINCheckDigitTest(TestCase):
+    """ Test computing check digits in the database. """
+
+    def test_annotate(self):
+        for upca in CODES['UPCA']['valid']:
+            MockProduct.objects.create(upca=upca)
+        for product in MockProduct.objects.annotate(
+            check_digit=GTINCheckDigit('upca')
+        ):
+            self.assertEqual(product.check_digit, product.upca[-1])
+
+    def test_filter_bad_check_digits(self):
+        """ Finds the rows a raw update put bad check digits in. """
+        for upca in CODES['UPCA']['valid']:
+            MockProduct.objects.create(upca=upca)
+        bad = MockProduct.objects.first()
+        bad_upca = bad.upca[:-1] + str((int(bad.upca[-1]) + 1) % 10)
+        MockProduct.objects.filter(pk=bad.pk).update(upca=bad_upca)
+
+        invalid = MockProduct.objects.exclude(
+            upca__gtin_check_digit=Right('upca', 1)
+        )
+        self.assertEqual(list(invalid), [bad])
+
+    def test_integer_field(self):
+        product = MockIntegerProduct.objects.create(gtin14='00042100005264')
+        self.assertEqual(
+            MockIntegerProduct.objects.annotate(
+                check_digit=GTINCheckDigit('gtin14')
+            ).get(pk=product.pk).check_digit,
+            '4',
+        )
+
+    def test_sqlite_function(self):
+        self.assertEqual(functions.sqlite_check_digit('042100005264'), '4')
+        self.assertEqual(functions.sqlite_check_digit(42100005264), '4')
+        for value in (None, '', '4', '0421X0005264'):
+            self.assertIsNone(functions.sqlite_check_digit(value))
+
+
+class CheckDigitConstraintTest(TestCase):
+    """ Test the database refusing codes with bad check digits. """
+
+    def test_valid_codes(self):
+        CheckedProduct.objects.create(
+            upca='042100005264', ean13='4006381333931', gtin='00042100005264'
+        )
+        CheckedProduct.objects.create(ean13='')
+        self.assertEqual(CheckedProduct.objects.count(), 2)
+
+    def test_invalid_codes(self):
+        product = CheckedProduct.objects.create()
+        for field, value in (('upca', '042100005265'),
+                             ('upca', '04210000526'),
+                             ('upca', '04210000526X'),
+                             ('upca', ''),
+                             ('ean13', '4006381333932'),
+                             ('gtin', '00042100005265')):
+            with self.assertRaises(IntegrityError, msg=value):
+                with transaction.atomic():
+                    CheckedProduct.objects.filter(pk=product.pk).update(
+                        **{field: value}
+                    )
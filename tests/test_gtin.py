@@ -0,0 +1,207 @@
+from unittest import mock
+
+import numpy
+from django.test import SimpleTestCase
+from gtin_fields import gtin
+from stdnum.ean import calc_check_digit
+
+from .product_codes import CODES
+
+EDGE_CASES = [
+    '',  # empty
+    ' ',  # whitespace only
+    ' 042100005264 ',  # surrounding whitespace
+    '0421-0000-5264',  # separators
+    '042100005264\n',  # trailing newline
+    '66425261',  # GTIN-8
+    '12345678901',  # 11 digits
+    '٠٤٢١٠٠٠٠٥٢٦٤',
+    'abc',
+    None,
+    42100005264,
+]
+
+
+class ValidateManyTest(SimpleTestCase):
+    """ validate_many must agree with validate for every input. """
+
+    def get_numbers(self):
+        numbers = list(EDGE_CASES)
+        for key in ('UPCA', 'EAN13', 'GTIN14'):
+            numbers += CODES[key]['valid'] + CODES[key]['invalid']
+        return numbers
+
+    def assertMatchesScalar(self, numbers, mask, reasons):
+        self.assertEqual(len(mask), len(numbers))
+        for number, valid, reason in zip(numbers, mask, reasons):
+            self.assertEqual(bool(valid), gtin.is_valid(number), number)
+            self.assertEqual(int(reason), gtin.reason(number), number)
+
+    def test_validate_many(self):
+        numbers = self.get_numbers()
+        mask, reasons = gtin.validate_many(numbers)
+        self.assertIsInstance(mask, numpy.ndarray)
+        self.assertMatchesScalar(numbers, mask, reasons)
+
+    def test_only_strings(self):
+        numbers = [n for n in self.get_numbers() if isinstance(n, str)]
+        self.assertMatchesScalar(numbers, *gtin.validate_many(numbers))
+
+    def test_numpy_array(self):
+        numbers = numpy.array(CODES['GTIN14']['valid'] + ['00123456000016'])
+        self.assertEqual(
+            gtin.is_valid_many(numbers).tolist(),
+            [True] * len(CODES['GTIN14']['valid']) + [False],
+        )
+
+    def test_reasons(self):
+        mask, reasons = gtin.validate_many(
+            ['042100005264', '04210000526X', '0421', '042100005265']
+        )
+        self.assertEqual(
+            reasons.tolist(),
+            [gtin.VALID, gtin.INVALID_FORMAT, gtin.INVALID_LENGTH,
+             gtin.INVALID_CHECKSUM],
+        )
+
+    def test_trailing_nul(self):
+        """ numpy drops the trailing NULs of the strings it stores, so
+        those numbers are checked by validate. """
+        numbers = ['042100005264\x00', '042100005264', '0421000052\x00\x00']
+        for values in (numbers, [number.encode() for number in numbers]):
+            self.assertMatchesScalar(values, *gtin.validate_many(values))
+            self.assertEqual(
+                gtin.validate_many(values)[1][0], gtin.INVALID_FORMAT
+            )
+
+    def test_long_values(self):
+        """ Values longer than any GTIN are checked by validate, without
+        widening the digit matrix of the batch. """
+        numbers = ['042100005264', '0 4 2 1 0 0 0 0 5 2 6 4', '4' * 2000]
+        matrix_reasons = gtin._matrix_reasons
+        widths = []
+
+        def recorded(chars, *args):
+            widths.append(chars.shape[1])
+            return matrix_reasons(chars, *args)
+
+        with mock.patch.object(gtin, '_matrix_reasons', recorded):
+            for values in (numbers, numpy.array(numbers)):
+                mask, reasons = gtin.validate_many(values)
+                self.assertMatchesScalar(numbers, mask, reasons)
+                self.assertEqual(list(mask), [True, True, False])
+        self.assertLessEqual(max(widths), max(gtin.VALID_LENGTHS))
+
+    def test_empty(self):
+        mask, reasons = gtin.validate_many([])
+        self.assertEqual(len(mask), 0)
+        self.assertEqual(len(reasons), 0)
+
+    def test_batches(self):
+        numbers = self.get_numbers() * 3
+        with mock.patch.object(gtin, 'BATCH_SIZE', 7):
+            self.assertMatchesScalar(numbers, *gtin.validate_many(numbers))
+
+    def test_without_numpy(self):
+        numbers = self.get_numbers()
+        with mock.patch.object(gtin, 'numpy', None):
+            mask, reasons = gtin.validate_many(numbers)
+        self.assertIsInstance(mask, list)
+        self.assertMatchesScalar(numbers, mask, reasons)
+
+
+class CheckDigitTest(SimpleTestCase):
+    """ The table-driven checksum must agree with stdnum. """
+
+    def test_check_digit(self):
+        for body in ('0', '04210000526', '978047111709', '0012345600001',
+                     '6642526', '9999999999999'):
+            self.assertEqual(
+                gtin.check_digit(body), calc_check_digit(body), body
+            )
+
+    def test_has_valid_check_digit(self):
+        for key in ('UPCA', 'EAN13', 'GTIN14'):
+            for code in CODES[key]['valid'] + CODES[key]['invalid']:
+                if code.isdigit():
+                    self.assertEqual(
+                        gtin.has_valid_check_digit(code),
+                        calc_check_digit(code[:-1]) == code[-1],
+                        code,
+                    )
+
+    def test_all_check_digits(self):
+        body = '04210000526'
+        for digit in '0123456789':
+            self.assertEqual(
+                gtin.has_valid_check_digit(body + digit),
+                digit == calc_check_digit(body),
+            )
+
+    def test_non_ascii_digits(self):
+        self.assertFalse(gtin.has_valid_check_digit('٠٤٢١٠٠٠٠٥٢٦٤'))
+
+
+class BytesTest(SimpleTestCase):
+    """ bytes, bytearray and memoryview numbers are checked like str. """
+
+    def get_numbers(self):
+        return [
+            number for number in ValidateManyTest.get_numbers(None)
+            if isinstance(number, str) and number.isascii()
+        ]
+
+    def test_validate(self):
+        for number in self.get_numbers():
+            data = number.encode()
+            for value in (data, bytearray(data), memoryview(data)):
+                self.assertEqual(gtin.reason(value), gtin.reason(number))
+        self.assertEqual(
+            gtin.validate(memoryview(b' 0421-0000-5264 ')), b'042100005264'
+        )
+
+    def test_validate_many(self):
+        numbers = self.get_numbers()
+        expected = [gtin.reason(number) for number in numbers]
+        data = [number.encode() for number in numbers]
+        for values in (data, data + [memoryview(b'042100005264')]):
+            mask, reasons = gtin.validate_many(values)
+            self.assertEqual(reasons.tolist()[:len(numbers)], expected)
+        self.assertEqual(
+            gtin.validate_many(numpy.array(data))[1].tolist(), expected
+        )
+
+    def test_validate_many_bytes_like(self):
+        """ Lists of bytearrays and memoryviews are checked as a batch
+        too, NUL bytes and long numbers included. """
+        numbers = [number.encode() for number in self.get_numbers()] + [
+            b'042100005264\x00', b'\x00', b'0' * 20, b'0421-0000-5264' * 3,
+        ]
+        expected = [gtin.reason(number) for number in numbers]
+        for convert in (bytearray, memoryview):
+            values = [convert(number) for number in numbers]
+            with mock.patch.object(
+                gtin, 'reason', wraps=gtin.reason
+            ) as scalar:
+                reasons = gtin.validate_many(values)[1]
+            self.assertEqual(reasons.tolist(), expected)
+            self.assertLess(scalar.call_count, len(values) // 2)
+
+    def test_validate_records(self):
+        """ Checks fixed width records in place, padding and all. """
+        records = [
+            '042100005264  ', '  042100005264', '00042100005264',
+            '042100005265  ', '0421-000052640', '              ',
+            '0421 00005264 ',
+        ]
+        expected = [gtin.reason(record) for record in records]
+        buffer = bytearray(b'#' + '\n'.join(records).encode())
+        for module in (numpy, None):
+            with mock.patch.object(gtin, 'numpy', module):
+                mask, reasons = gtin.validate_records(
+                    buffer, 14, stride=15, offset=1
+                )
+            self.assertEqual(list(reasons), expected)
+            self.assertEqual(
+                list(mask), [reason == gtin.VALID for reason in expected]
+            )
@@ -0,0 +1,163 @@
+import os
+import tempfile
+from unittest import mock
+
+from django.test import SimpleTestCase
+from gtin_fields import index
+from gtin_fields.index import GTINIndex, GTINSet
+from stdnum.exceptions import InvalidChecksum
+
+from .product_codes import CODES
+
+
+class GTINSetTest(SimpleTestCase):
+    """ Test the array backed GTINSet. """
+
+    def setUp(self):
+        self.codes = CODES['GTIN']['valid']
+        self.catalog = GTINSet(self.codes)
+
+    def test_contains(self):
+        """ Finds every form of a member code. """
+        self.assertEqual(len(self.catalog), len(set(self.codes.values())))
+        for code, gtin14 in self.codes.items():
+            self.assertIn(code, self.catalog)
+            self.assertIn(gtin14, self.catalog)
+        for code in ('00000000000000', '99999999999999', '0421X0005264',
+                     '12345', None):
+            self.assertNotIn(code, self.catalog)
+        self.assertNotIn('425261', GTINSet())
+
+    def test_separators(self):
+        """ Finds codes written with separators, like write_index reads
+        them. """
+        catalog = GTINSet(['0 42100 00526 4'])
+        for code in ('042100005264', ' 0-42100-00526-4 ', b'0 42100 005264',
+                     '425 261'):
+            self.assertIn(code, catalog)
+        self.assertEqual(
+            list(catalog.contains_many(['0 42100 00526 4', '0 42100'])),
+            [True, False],
+        )
+
+    def test_iter(self):
+        """ Iterates the GTIN-14 codes in order. """
+        self.assertEqual(list(self.catalog), sorted(set(self.codes.values())))
+
+    def test_contains_many(self):
+        codes = list(self.codes) + ['00000000000000', 'junk']
+        self.assertEqual(
+            list(self.catalog.contains_many(codes)),
+            [True] * len(self.codes) + [False, False],
+        )
+
+    def test_union_and_difference(self):
+        first = GTINSet(['042100005264', '73513537'])
+        second = GTINSet(['000073513537', '4006381333931'])
+        self.assertEqual(list(first | second), [
+            '00000073513537', '00042100005264', '04006381333931',
+        ])
+        self.assertEqual(list(first - second), ['00042100005264'])
+        self.assertEqual(first - ['042100005264', '73513537'], GTINSet())
+        self.assertEqual(first.union(['425261']), first)
+
+    def test_nbytes(self):
+        self.assertEqual(self.catalog.nbytes, 8 * len(self.catalog))
+
+    def test_invalid_codes(self):
+        with self.assertRaises(ValueError):
+            GTINSet(['042100005264', '12345'])
+
+
+class GTINIndexTest(SimpleTestCase):
+    """ Test writing and memory mapping index files. """
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'catalog.idx')
+
+    def test_round_trip(self):
+        codes = CODES['GTIN14']['valid'] + CODES['UPCA']['valid']
+        count, errors = index.write_index(
+            self.path, codes + CODES['UPCA']['invalid'][:1]
+        )
+        self.assertEqual(count, len(set(GTINSet(codes))))
+        self.assertEqual(list(errors), [len(codes)])
+
+        with GTINIndex(self.path) as catalog:
+            self.assertEqual(catalog, GTINSet(codes))
+            self.assertFalse(catalog.has_payloads)
+            for code in codes:
+                self.assertIn(code, catalog)
+            self.assertNotIn('00000000000000', catalog)
+            self.assertEqual(
+                list(catalog.contains_many(codes[:1] + ['junk'])),
+                [True, False],
+            )
+            with self.assertRaises(ValueError):
+                catalog.get(codes[0])
+
+    def test_bytes(self):
+        codes = ['042100005264', '4006381333931']
+        count, errors = index.write_index(self.path, [
+            codes[0].encode(), memoryview(codes[1].encode()), b'042100005265',
+        ])
+        self.assertEqual((count, list(errors)), (2, [2]))
+        with GTINIndex(self.path) as catalog:
+            self.assertEqual(catalog, GTINSet(codes))
+            self.assertIn('0 42100 00526 4', catalog)
+
+    def test_payloads(self):
+        count, errors = index.write_index(self.path, [
+            ('4006381333931', 2),
+            ('042100005264', 1),
+            ('042100005265', 3),
+            ('00042100005264', 4),  # repeated: the first payload is kept
+        ], payloads=True)
+        self.assertEqual(count, 2)
+        self.assertIsInstance(errors[2], InvalidChecksum)
+
+        with GTINIndex(self.path) as catalog:
+            self.assertTrue(catalog.has_payloads)
+            self.assertEqual(catalog.get('425261'), 1)
+            self.assertEqual(catalog.get('4006381333931'), 2)
+            self.assertIsNone(catalog.get('00000000000000'))
+            self.assertEqual(catalog.get('junk', 0), 0)
+
+    def test_empty(self):
+        self.assertEqual(index.write_index(self.path, []), (0, {}))
+        with GTINIndex(self.path) as catalog:
+            self.assertEqual(len(catalog), 0)
+            self.assertNotIn('042100005264', catalog)
+
+    def test_bad_files(self):
+        index.write_index(self.path, ['042100005264'])
+        with open(self.path, 'rb') as handle:
+            data = handle.read()
+        for bad in (b'not an index' * 4, data[:-1],
+                    data[:8] + b'\x02' + data[9:]):
+            with open(self.path, 'wb') as handle:
+                handle.write(bad)
+            with self.assertRaises(ValueError):
+                GTINIndex(self.path)
+
+
+class GTINSetWithoutNumpyTest(GTINSetTest):
+    """ Test the pure Python fallbacks of GTINSet. """
+
+    def setUp(self):
+        patcher = mock.patch.object(index, 'numpy', None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        super().setUp()
+
+
+class GTINIndexWithoutNumpyTest(GTINIndexTest):
+    """ Test the pure Python fallbacks of the index files. """
+
+    def setUp(self):
+        patcher = mock.patch.object(index, 'numpy', None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        super().setUp()
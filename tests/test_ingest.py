@@ -0,0 +1,111 @@
+""" Test streaming ingestion. """
+import csv
+import io
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase
+from gtin_fields import ingest
+
+from .product_codes import CODES
+
+
+class IngestTest(SimpleTestCase):
+
+    def test_ingest(self):
+        rows = [['a', '425261'], ['b', '042100005265'], ['c'],
+                ['d', ' 9780471117094 ']]
+        results = list(ingest.ingest(rows, 1, chunk_size=2))
+        self.assertEqual(results[0], (['a', '00042100005264'], None))
+        self.assertEqual(results[1][0], ['b', '042100005265'])
+        self.assertIn('Failed checksum', results[1][1])
+        self.assertEqual(results[2], (['c'], 'Missing column 1'))
+        self.assertEqual(results[3], (['d', '09780471117094'], None))
+
+    def test_kinds(self):
+        for kind, key in (('upca', 'UPCA'), ('isbn', 'ISBN'),
+                          ('asin_strict', 'ASIN_strict')):
+            rows = [[code] for code in CODES[key]['valid']]
+            self.assertTrue(all(
+                error is None for _, error in ingest.ingest(rows, 0, kind)
+            ))
+            rows = [[code] for code in CODES[key]['invalid']]
+            self.assertTrue(all(
+                error for _, error in ingest.ingest(rows, 0, kind)
+            ))
+
+    def test_unknown_kind(self):
+        with self.assertRaises(ValueError):
+            list(ingest.ingest([], 0, kind='upce'))
+
+    def test_read_rows(self):
+        source = io.StringIO(
+            'sku\tgtin\n' + ''.join(
+                'sku{}\t{}\n'.format(index, code)
+                for index, code in enumerate(CODES['GTIN14']['valid'] * 10)
+            )
+        )
+        reader = ingest.read_rows(source)
+        self.assertEqual(reader.dialect.delimiter, '\t')
+        self.assertEqual(reader.header, ['sku', 'gtin'])
+        self.assertEqual(len(list(reader.rows)), 40)
+        self.assertEqual(ingest.column_index('gtin', reader.header), 1)
+
+    def test_sample_boundary(self):
+        """ Rows cut by the end of the sample are read whole. """
+        lines = ['{},042100005264\n'.format(index) for index in range(50)]
+        with mock.patch.object(ingest, 'SAMPLE_SIZE', 100):
+            reader = ingest.read_rows(
+                io.StringIO(''.join(lines)), delimiter=',', header=False
+            )
+            rows = list(reader.rows)
+        self.assertEqual(len(rows), 50)
+        self.assertEqual(rows[-1], ['49', '042100005264'])
+
+    def test_column_index(self):
+        self.assertEqual(ingest.column_index('2'), 2)
+        with self.assertRaises(ValueError):
+            ingest.column_index('gtin')
+
+
+class IngestCommandTest(SimpleTestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def test_command(self):
+        path = os.path.join(self.directory, 'feed.csv')
+        with open(path, 'w', newline='') as handle:
+            writer = csv.writer(handle)
+            writer.writerow(['sku', 'code'])
+            writer.writerows([
+                ['1', '425261'], ['2', 'junk'], ['3', '00123456000018'],
+            ])
+
+        stdout = io.StringIO()
+        call_command('gtin_ingest', path, column='code', stdout=stdout)
+        self.assertIn('3 rows (2 valid, 1 rejected)', stdout.getvalue())
+
+        with open(os.path.join(self.directory, 'feed.valid.csv')) as handle:
+            self.assertEqual(list(csv.reader(handle)), [
+                ['sku', 'code'], ['1', '00042100005264'],
+                ['3', '00123456000018'],
+            ])
+        with open(os.path.join(self.directory, 'feed.rejects.csv')) as handle:
+            rejects = list(csv.reader(handle))
+        self.assertEqual(rejects[0], ['sku', 'code', 'error'])
+        self.assertEqual(rejects[1][:2], ['2', 'junk'])
+
+    def test_bad_column(self):
+        path = os.path.join(self.directory, 'feed.csv')
+        with open(path, 'w') as handle:
+            handle.write('sku,code\n1,425261\n')
+        with self.assertRaises(CommandError):
+            call_command(
+                'gtin_ingest', path, column='gtin', stdout=io.StringIO()
+            )
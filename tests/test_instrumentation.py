@@ -0,0 +1,75 @@
+from django.core.exceptions import ValidationError
+from django.test import SimpleTestCase
+from gtin_fields import instrumentation, validators
+
+from .product_codes import CODES
+
+
+class InstrumentationTest(SimpleTestCase):
+    """ Test recording the validations. """
+
+    def setUp(self):
+        instrumentation.reset()
+        instrumentation.enable()
+        self.addCleanup(instrumentation.reset)
+        self.addCleanup(instrumentation.disable)
+
+    def validate(self, validator, value):
+        try:
+            validator(value)
+        except ValidationError:
+            pass
+
+    def test_counts(self):
+        for value in CODES['UPCA']['valid']:
+            validators.UPCAValidator(value)
+        for value in ('12', '04210000526X', '042100005265', 12):
+            self.validate(validators.UPCAValidator, value)
+        self.validate(validators.ASINStrictValidator, 'A123456789')
+
+        snapshot = instrumentation.snapshot()
+        self.assertEqual(set(snapshot), {'upca', 'asin_strict'})
+        upca = snapshot['upca']
+        self.assertEqual(upca['calls'], len(CODES['UPCA']['valid']) + 4)
+        self.assertEqual(upca['valid'], len(CODES['UPCA']['valid']))
+        self.assertEqual(upca['invalid'], dict(
+            length=1, characters=1, checksum=1, type=1,
+        ))
+        self.assertEqual(snapshot['asin_strict']['invalid'], dict(
+            characters=1,
+        ))
+
+    def test_latency_histogram(self):
+        validators.UPCAValidator('042100005264')
+        latency = instrumentation.snapshot()['upca']['latency']
+        self.assertEqual(len(latency['counts']), len(latency['bounds']) + 1)
+        self.assertEqual(sum(latency['counts']), 1)
+        self.assertEqual(latency['count'], 1)
+        self.assertGreater(latency['sum'], 0)
+
+    def test_signal(self):
+        received = []
+
+        def receiver(sender, validator, value, reason, seconds, **kwargs):
+            received.append((validator, value, reason))
+
+        instrumentation.validated.connect(receiver)
+        self.addCleanup(instrumentation.validated.disconnect, receiver)
+        self.validate(validators.EAN13Validator, '4006381333932')
+        self.assertEqual(received, [
+            (validators.EAN13Validator, '4006381333932', 'checksum'),
+        ])
+
+    def test_disabled(self):
+        instrumentation.disable()
+        self.assertFalse(instrumentation.is_enabled())
+        validators.UPCAValidator('042100005264')
+        self.assertEqual(instrumentation.snapshot(), {})
+
+    def test_same_class(self):
+        """ Adds up the validators of a class outside validators.KINDS. """
+        for _ in range(2):
+            validators._UPCAValidator()('042100005264')
+        self.assertEqual(
+            instrumentation.snapshot()['_UPCAValidator']['calls'], 2
+        )
@@ -0,0 +1,60 @@
+from unittest import mock
+
+import numpy
+from django.test import SimpleTestCase
+from gtin_fields import isbn
+from stdnum import isbn as stdnum_isbn
+
+from .product_codes import CODES
+
+EDGE_CASES = [
+    '',
+    '080442957X',  # ISBN-10 with an X check digit
+    '080442957x',
+    '0-7653-4827-6',  # separators
+    ' 0765348276 ',
+    '765348276',  # 9 digit SBN
+    '9790765348279',  # 979 prefix (bad checksum)
+    '9791234567896',  # 979 prefix
+    '1234567890128',  # EAN-13 but not Bookland
+    '07653482X6',
+    '٠٧٦٥٣٤٨٢٧٦',  # non-ASCII digits
+    '076534827',
+    None,  # not strings
+    765348276,
+    9780765348272,
+    b'0765348276',
+]
+
+
+class ISBNTest(SimpleTestCase):
+    """ The native checks must agree with stdnum.isbn.is_valid. """
+
+    def get_numbers(self):
+        return (
+            EDGE_CASES + CODES['ISBN']['valid'] + CODES['ISBN']['invalid']
+        )
+
+    def test_is_valid(self):
+        for number in self.get_numbers():
+            self.assertEqual(
+                isbn.is_valid(number), stdnum_isbn.is_valid(number), number
+            )
+
+    def test_is_valid_many(self):
+        numbers = self.get_numbers()
+        valid = isbn.is_valid_many(numbers)
+        self.assertIsInstance(valid, numpy.ndarray)
+        self.assertEqual(
+            valid.tolist(), [stdnum_isbn.is_valid(n) for n in numbers]
+        )
+
+    def test_is_valid_many_without_numpy(self):
+        numbers = self.get_numbers()
+        with mock.patch.object(isbn, 'numpy', None):
+            valid = isbn.is_valid_many(numbers)
+        self.assertEqual(valid, [stdnum_isbn.is_valid(n) for n in numbers])
+
+    def test_check_digit10(self):
+        self.assertEqual(isbn.check_digit10('076534827'), '6')
+        self.assertEqual(isbn.check_digit10('080442957'), 'X')
@@ -0,0 +1,37 @@
+import os
+import subprocess
+import sys
+
+from django.test import SimpleTestCase
+from gtin_fields.lazy import LazyModule
+
+
+class LazyModuleTest(SimpleTestCase):
+    """ Test the deferred imports. """
+
+    def test_attributes(self):
+        lazy_json = LazyModule('json')
+        self.assertTrue(lazy_json)
+        self.assertEqual(lazy_json.dumps([1]), '[1]')
+        self.assertIn('dumps', vars(lazy_json))  # kept after first use
+
+    def test_missing_module(self):
+        missing = LazyModule('gtin_fields_no_such_module', optional=True)
+        self.assertFalse(missing)
+        with self.assertRaises(ImportError):
+            missing.anything
+        with self.assertRaises(ImportError):
+            LazyModule('gtin_fields_no_such_module').anything
+
+    def test_import_fields(self):
+        """ Importing the fields does not import stdnum or numpy. """
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        output = subprocess.run(
+            [sys.executable, '-c', (
+                'import sys, gtin_fields.fields; '
+                'print(sorted({"stdnum", "numpy"} & set(sys.modules)))'
+            )],
+            env=dict(os.environ, PYTHONPATH=root), check=True,
+            stdout=subprocess.PIPE, universal_newlines=True,
+        ).stdout
+        self.assertEqual(output.strip(), '[]')
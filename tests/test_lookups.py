@@ -0,0 +1,167 @@
+""" Test the gtin_equivalent and company_prefix lookups. """
+from django.test import TestCase
+
+from tests.app.models import CatalogItem, IndexedProduct, MockProduct
+
+# an item, two of its packaging levels and an item of another company
+UPCA = '042100005264'
+CASE = '10042100005261'
+PALLET = '30042100005265'
+OTHER = '00614141000005'
+
+# a book (as ISBN-10 and ISBN-13) and a Nigerian one, whose ISBN-10 starts
+# with 978 too
+ISBN10 = '0765348276'
+ISBN13 = '9780765348272'
+NIGERIAN_ISBN10 = '9780761233'
+
+
+class GTINEquivalentTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        IndexedProduct.objects.create(
+            upca=UPCA, gtin14='00' + UPCA, gtin=UPCA, gtin14_int='00' + UPCA
+        )
+        for code in (CASE, PALLET, OTHER):
+            IndexedProduct.objects.create(
+                gtin14=code, gtin=code, gtin14_int=code
+            )
+
+    def test_gtin14(self):
+        for key in ('gtin14', 'gtin', 'gtin14_int'):
+            for code in (UPCA, '425261', CASE, PALLET):
+                self.assertEqual(
+                    set(IndexedProduct.objects.filter(
+                        **{key + '__gtin_equivalent': code}
+                    ).values_list(key, flat=True)),
+                    {'00' + UPCA, CASE, PALLET},
+                    (key, code),
+                )
+
+    def test_upca(self):
+        """ Only the base item fits in a UPC-A column. """
+        for code in (UPCA, CASE):
+            self.assertEqual(
+                list(IndexedProduct.objects.filter(
+                    upca__gtin_equivalent=code
+                ).values_list('upca', flat=True)),
+                [UPCA],
+            )
+
+    def test_invalid(self):
+        self.assertFalse(
+            IndexedProduct.objects.filter(gtin14__gtin_equivalent='abc')
+        )
+        self.assertFalse(
+            MockProduct.objects.filter(asin__gtin_equivalent=UPCA)
+        )
+
+    def test_uses_index(self):
+        plan = IndexedProduct.objects.filter(
+            gtin14__gtin_equivalent=UPCA
+        ).explain()
+        self.assertIn('INDEX app_indexedproduct_gtin14', plan)
+        self.assertNotIn('SCAN', plan.replace('SCAN CONSTANT ROW', ''))
+
+
+class CompanyPrefixTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        GTINEquivalentTest.setUpTestData()
+
+    def test_company_prefix(self):
+        for key in ('gtin14', 'gtin', 'gtin14_int'):
+            self.assertEqual(
+                set(IndexedProduct.objects.filter(
+                    **{key + '__company_prefix': '0042100'}
+                ).values_list(key, flat=True)),
+                {'00' + UPCA, CASE, PALLET},
+            )
+            self.assertEqual(
+                list(IndexedProduct.objects.filter(
+                    **{key + '__company_prefix': '0614141'}
+                ).values_list(key, flat=True)),
+                [OTHER],
+            )
+
+    def test_upca(self):
+        self.assertEqual(
+            IndexedProduct.objects.filter(
+                upca__company_prefix='0042100'
+            ).count(),
+            1,
+        )
+        # UPC-A codes all belong to prefixes starting with zero
+        self.assertFalse(
+            IndexedProduct.objects.filter(upca__company_prefix='614141')
+        )
+
+    def test_bounds(self):
+        field = IndexedProduct._meta.get_field('upca')
+        self.assertEqual(
+            field.company_prefix_ranges('0999'),
+            [('999000000000', None)],
+        )
+        self.assertEqual(field.company_prefix_ranges('0'), [
+            ('000000000000', None)
+        ])
+        self.assertEqual(field.company_prefix_ranges('abc'), [])
+
+    def test_uses_index(self):
+        for key in ('gtin14', 'upca', 'gtin14_int'):
+            plan = IndexedProduct.objects.filter(
+                **{key + '__company_prefix': '0042100'}
+            ).explain()
+            self.assertIn('INDEX app_indexedproduct_' + key, plan)
+            self.assertNotIn('SCAN', plan)
+
+
+class ISBNCompanyPrefixTest(TestCase):
+    """ ISBN columns hold ISBN-10s and ISBN-13s, compared in the same
+    form. """
+
+    @classmethod
+    def setUpTestData(cls):
+        MockProduct.objects.bulk_create([
+            MockProduct(isbn=code) for code in (
+                ISBN10, ISBN13, NIGERIAN_ISBN10
+            )
+        ])
+        CatalogItem.objects.bulk_create([
+            CatalogItem(code='0' + ISBN13), CatalogItem(code='B00005N5PF'),
+        ])
+
+    def prefixed(self, prefix):
+        return sorted(MockProduct.objects.filter(
+            isbn__company_prefix=prefix
+        ).values_list('isbn', flat=True))
+
+    def test_company_prefix(self):
+        for prefix in ('978076', '97807653', ISBN13):
+            self.assertEqual(self.prefixed(prefix), [ISBN10, ISBN13], prefix)
+        self.assertEqual(self.prefixed('978978'), [NIGERIAN_ISBN10])
+        self.assertEqual(
+            self.prefixed('97'), sorted([ISBN10, ISBN13, NIGERIAN_ISBN10])
+        )
+        self.assertEqual(self.prefixed('979'), [])
+        self.assertEqual(self.prefixed(ISBN13[:-1] + '3'), [])
+
+    def test_ranges(self):
+        field = MockProduct._meta.get_field('isbn')
+        self.assertEqual(field.company_prefix_ranges('978076'), [
+            ('9780760000000', '9780770000000'), ('0760000000', '0770000000'),
+        ])
+        self.assertEqual(field.company_prefix_ranges('979'), [
+            ('9790000000000', '9800000000000'),
+        ])
+
+    def test_other_codes(self):
+        """ ASINs in a product code column are not under any prefix. """
+        self.assertEqual(
+            list(CatalogItem.objects.filter(
+                code__company_prefix='9'
+            ).values_list('code', flat=True)),
+            ['0' + ISBN13],
+        )
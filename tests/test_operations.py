@@ -0,0 +1,89 @@
+""" Test the migration helpers. """
+from unittest import mock
+
+from django.apps import apps
+from django.db import connection
+from django.db.migrations.state import ProjectState
+from django.test import TransactionTestCase
+from gtin_fields import fields, operations
+from gtin_fields.operations import convert_to_integer_field
+
+from tests.app.models import LegacyProduct
+
+
+class ConvertToIntegerFieldTest(TransactionTestCase):
+    available_apps = ['tests.app']
+
+    def get_steps(self, operations):
+        """ Returns (operation, state before, state after) for each. """
+        states = [ProjectState.from_apps(apps)]
+        for operation in operations:
+            state = states[-1].clone()
+            operation.state_forwards('app', state)
+            states.append(state)
+        return list(zip(operations, states, states[1:]))
+
+    def column_values(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT gtin14 FROM app_legacyproduct ORDER BY id'
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    def test_convert(self):
+        codes = ['00123456000018', '10123456000015', None]
+        for code in codes:
+            LegacyProduct.objects.create(gtin14=code)
+        steps = self.get_steps(convert_to_integer_field(
+            'app', 'legacyproduct', 'gtin14',
+            fields.GTIN14IntegerField(null=True, db_index=True),
+            batch_size=2,
+        ))
+        new_field = steps[-1][2].apps.get_model(
+            'app', 'legacyproduct'
+        )._meta.get_field('gtin14')
+        self.assertIsInstance(new_field, fields.GTIN14IntegerField)
+
+        with connection.schema_editor(atomic=False) as editor:
+            for operation, old, new in steps:
+                operation.database_forwards('app', editor, old, new)
+        try:
+            self.assertEqual(
+                self.column_values(), [123456000018, 10123456000015, None]
+            )
+        finally:
+            with connection.schema_editor(atomic=False) as editor:
+                for operation, old, new in reversed(steps):
+                    operation.database_backwards('app', editor, new, old)
+        self.assertEqual(self.column_values(), codes)
+
+    def test_not_all_digits(self):
+        """ Fails naming the values that are not all digits, before
+        converting anything. """
+        codes = ['00123456000018', '0012-3456-0000', '', 'n/a', '0012345']
+        for code in codes:
+            LegacyProduct.objects.create(gtin14=code)
+        pks = list(LegacyProduct.objects.values_list('pk', flat=True))
+        steps = self.get_steps(convert_to_integer_field(
+            'app', 'legacyproduct', 'gtin14',
+            fields.GTIN14IntegerField(null=True),
+        ))
+        with connection.schema_editor(atomic=False) as editor:
+            add_field, old, new = steps[0]
+            add_field.database_forwards('app', editor, old, new)
+            try:
+                with mock.patch.object(operations, 'REPORTED_VALUES', 1):
+                    with self.assertRaises(ValueError) as raised:
+                        steps[1][0].database_forwards(
+                            'app', editor, *steps[1][1:]
+                        )
+            finally:
+                add_field.database_backwards('app', editor, new, old)
+        self.assertEqual(
+            str(raised.exception),
+            "Cannot convert app.LegacyProduct.gtin14 to integers, 2 values "
+            "are not all digits: '0012-3456-0000' (pk {}), ...".format(
+                pks[1]
+            ),
+        )
+        self.assertEqual(self.column_values(), codes)
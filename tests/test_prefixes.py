@@ -0,0 +1,123 @@
+from unittest import mock
+
+from django.core.exceptions import ValidationError
+from django.test import SimpleTestCase
+from gtin_fields import fields, gtin, prefixes, validators
+
+
+def with_check_digit(body):
+    return body + gtin.check_digit(body)
+
+
+# (code, prefix, type, region, restricted)
+CASES = [
+    ('4006381333931', '400', 'gs1', 'Germany', False),
+    ('042100005264', '004', 'gs1', 'United States', False),
+    ('10042100005261', '004', 'gs1', 'United States', False),  # GTIN-14
+    ('425261', '004', 'gs1', 'United States', False),  # UPC-E
+    (with_check_digit('21234567890'), '021', 'restricted', None, True),
+    (with_check_digit('51234567890'), '051', 'coupon', 'United States',
+     True),
+    (with_check_digit('200123456789'), '200', 'restricted', None, True),
+    (with_check_digit('981123456789'), '981', 'coupon', None, True),
+    (with_check_digit('990123456789'), '990', 'coupon', None, True),
+    (with_check_digit('980123456789'), '980', 'refund', None, True),
+    ('9780765348272', '978', 'isbn', None, False),
+    (with_check_digit('979012345678'), '9790', 'ismn', None, False),
+    (with_check_digit('140123456789'), '', 'unassigned', None, False),
+    ('73513537', '735', 'gs1', 'Sweden', False),  # GTIN-8
+    (with_check_digit('2012345'), '201', 'restricted', None, True),
+    (with_check_digit('9771234'), '977', 'reserved', None, False),
+]
+
+
+class ClassifyTest(SimpleTestCase):
+
+    def test_classify(self):
+        for code, *expected in CASES:
+            self.assertEqual(
+                prefixes.classify(code), prefixes.Prefix(*expected), code
+            )
+
+    def test_not_a_gtin(self):
+        with self.assertRaises(ValueError):
+            prefixes.classify('12345')
+
+    def test_classify_many(self):
+        codes = [case[0] for case in CASES] + ['12345', None]
+        expected = [prefixes.Prefix(*case[1:]) for case in CASES]
+        self.assertEqual(prefixes.classify_many(codes), expected + [None] * 2)
+        with mock.patch.object(prefixes, 'numpy', None):
+            self.assertEqual(
+                prefixes.classify_many(codes), expected + [None] * 2
+            )
+
+    def test_restricted_many(self):
+        codes = [case[0] for case in CASES] + ['12345']
+        self.assertEqual(
+            prefixes.restricted_many(codes),
+            [case[4] for case in CASES] + [False],
+        )
+
+    def test_intervals_match_trie(self):
+        """ The interval table (classify_many) agrees with the trie
+        (classify) at and around every interval start. """
+        starts, _entries = prefixes._tables().intervals
+        codes = []
+        for start in starts:
+            for head in (start - 1, start):
+                if 10 ** 5 <= head:  # not a GTIN-8
+                    codes.append(with_check_digit(
+                        str(head).zfill(prefixes.MAX_PREFIX_LENGTH) + '00000'
+                    ))
+        self.assertEqual(
+            prefixes.classify_many(codes),
+            [prefixes.classify(code) for code in codes],
+        )
+
+
+class AllowRestrictedTest(SimpleTestCase):
+    """ Validators and fields with allow_restricted=False. """
+    restricted = with_check_digit('21234567890')
+
+    def test_validator(self):
+        validator = validators._UPCAValidator(allow_restricted=False)
+        self.assertIsNone(validators.UPCAValidator.check(self.restricted))
+        self.assertEqual(
+            validator.check(self.restricted), validators.INVALID_PREFIX
+        )
+        with self.assertRaises(ValidationError) as raised:
+            validator(self.restricted)
+        self.assertEqual(
+            raised.exception.messages,
+            ["Invalid UPC-A '{}': Restricted circulation or coupon "
+             "code".format(self.restricted)],
+        )
+        validator('042100005264')
+
+    def test_validate_many(self):
+        validator = validators._UPCAValidator(allow_restricted=False)
+        values = ['042100005264', self.restricted, '042100005265']
+        self.assertEqual(sorted(validator.validate_many(values)), [1, 2])
+        self.assertEqual(
+            validator.validate_many(values)[1].code,
+            validators.INVALID_PREFIX,
+        )
+
+    def test_field(self):
+        field = fields.UPCAField(allow_restricted=False)
+        with self.assertRaises(ValidationError):
+            field.clean(self.restricted, None)
+        self.assertEqual(field.clean('042100005264', None), '042100005264')
+        self.assertIs(
+            field._primary_validator,
+            fields.UPCAField(allow_restricted=False)._primary_validator,
+        )
+        self.assertFalse(field.deconstruct()[3]['allow_restricted'])
+        self.assertNotIn(
+            'allow_restricted', fields.UPCAField().deconstruct()[3]
+        )
+
+    def test_not_a_gtin_field(self):
+        with self.assertRaises(TypeError):
+            fields.ASINField(allow_restricted=False)
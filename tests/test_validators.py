@@ -23,6 +23,164 @@ class ValidatorTestMixin:
         for value in self.codes['valid']:
             self.assertIsNone(self.validator(value))
 
+    def test_validate_many(self):
+        values = self.codes['valid'] + self.codes['invalid'] + [None]
+        errors = self.validator.validate_many(values)
+        self.assertEqual(
+            sorted(errors),
+            list(range(len(self.codes['valid']), len(values))),
+        )
+        for index, error in errors.items():
+            with self.assertRaises(ValidationError) as raised:
+                self.validator(values[index])
+            self.assertEqual(error.messages, raised.exception.messages)
+
+    def test_check(self):
+        for value in self.codes['valid']:
+            self.assertIsNone(self.validator.check(value))
+            self.assertTrue(self.validator.is_valid(value))
+
+        for value in self.codes['invalid'] + [None]:
+            reason = self.validator.check(value)
+            self.assertFalse(self.validator.is_valid(value))
+            with self.assertRaises(ValidationError) as raised:
+                self.validator(value)
+            self.assertEqual(raised.exception.code, reason)
+
+
+class ValidatorReasonTest(SimpleTestCase):
+    """ Check the reasons given for invalid values. """
+
+    def test_reasons(self):
+        cases = (
+            (12, validators.INVALID_TYPE, "Not a string"),
+            ('0421000052', validators.INVALID_LENGTH, "Wrong length"),
+            ('04210000526A', validators.INVALID_CHARACTERS,
+             "Only numbers allowed."),
+            ('042100005265', validators.INVALID_CHECKSUM, "Failed checksum"),
+        )
+        for value, reason, problem in cases:
+            self.assertEqual(validators.UPCAValidator.check(value), reason)
+            with self.assertRaises(ValidationError) as raised:
+                validators.UPCAValidator(value)
+            self.assertEqual(raised.exception.code, reason)
+            self.assertEqual(raised.exception.params['value'], value)
+            self.assertEqual(
+                raised.exception.messages,
+                ["Invalid UPC-A '{}': {}".format(value, problem)],
+            )
+
+    def test_shared_problems(self):
+        """ The descriptions of the problems are built once, not per
+        error. """
+        for value, reason in (('0421', validators.INVALID_LENGTH),
+                              ('04210000526A', validators.INVALID_CHARACTERS)):
+            error = validators.UPCAValidator.error(value)
+            self.assertIs(
+                error.params['problem'],
+                validators.PROBLEMS.get(
+                    reason, validators.UPCAValidator.chartype_message
+                ),
+            )
+
+    def test_error(self):
+        """ error() returns what calling the validator raises, calling
+        validators that validate in __call__ themselves. """
+        validator = validators.UPCAValidator
+        self.assertIsNone(validator.error('042100005264'))
+        self.assertEqual(
+            validator.error('042100005265').messages,
+            ["Invalid UPC-A '042100005265': Failed checksum"],
+        )
+
+        class Validator(type(validator)):
+            def __call__(self, value):
+                super().__call__(value)
+                if value.startswith('0421'):
+                    raise ValidationError('Not on sale', code='sale')
+
+        self.assertEqual(Validator().error('042100005264').code, 'sale')
+        self.assertEqual(Validator().error('0421').code, 'length')
+
+
+class DeprecatedHookTest(SimpleTestCase):
+    """ The hooks validators had before check() still work, with a warning. """
+
+    def test_hooks(self):
+        validator = validators.UPCAValidator
+        cases = (
+            ('validate_type', 12, validators.INVALID_TYPE),
+            ('validate_length', '0421000052', validators.INVALID_LENGTH),
+            ('validate_character_types', '04210000526A',
+             validators.INVALID_CHARACTERS),
+            ('valid_checksum', '042100005265', validators.INVALID_CHECKSUM),
+        )
+        for name, value, reason in cases:
+            with self.assertWarns(DeprecationWarning):
+                getattr(validator, name)('042100005264')
+            with self.assertWarns(DeprecationWarning):
+                with self.assertRaises(ValidationError) as raised:
+                    getattr(validator, name)(value)
+            self.assertEqual(raised.exception.code, reason)
+
+        with self.assertWarns(DeprecationWarning):
+            with self.assertRaises(ValidationError):
+                validators.ASINStrictValidator.strict_valid_char_types(
+                    'b00005n5pf'
+                )
+        with self.assertWarns(DeprecationWarning):
+            self.assertEqual(
+                validator.error_msg('x', 'Broken'), "Invalid UPC-A 'x': Broken"
+            )
+
+    def test_invalid_description(self):
+        with self.assertWarns(DeprecationWarning):
+            with self.assertRaises(ValidationError) as raised:
+                validators.UPCAValidator.invalid('x', 'Not on sale')
+        self.assertIsNone(raised.exception.code)
+        self.assertEqual(
+            raised.exception.messages, ["Invalid UPC-A 'x': Not on sale"]
+        )
+
+    def test_overridden_hook(self):
+        """ Subclasses may not override the hooks validation skips. """
+        for name in validators.DEPRECATED_HOOKS:
+            with self.assertRaises(TypeError):
+                type('Validator', (validators._ASINValidator,), {
+                    name: lambda self, value: None,
+                })
+
+
+class BytesValidatorTest(SimpleTestCase):
+    """ The GS1 validators take bytes-like values too. """
+
+    def test_bytes(self):
+        validator = validators.UPCAValidator
+        for value in (b'042100005264', bytearray(b'042100005264'),
+                      memoryview(b'x042100005264')[1:]):
+            self.assertIsNone(validator.check(value))
+            validator(value)
+        self.assertEqual(
+            validator.check(b'042100005265'), validators.INVALID_CHECKSUM
+        )
+        self.assertEqual(
+            validator.check(b'04210000526A'), validators.INVALID_CHARACTERS
+        )
+        self.assertEqual(
+            validators.ISBNValidator.check(b'9780765348272'),
+            validators.INVALID_TYPE,
+        )
+
+    def test_validate_many(self):
+        values = [b'042100005264', b'042100005265', '042100005264', b'0421']
+        self.assertEqual(
+            sorted(validators.UPCAValidator.validate_many(values)), [1, 3]
+        )
+        self.assertEqual(
+            validators.UPCAValidator.validate_many(values[:2])[1].code,
+            validators.INVALID_CHECKSUM,
+        )
+
 
 class ISBNValidatorTest(SimpleTestCase, ValidatorTestMixin):
     codes = CODES['ISBN']